@@ -11,6 +11,15 @@ from PyQt6.QtWidgets import (QMainWindow, QApplication, QMessageBox,
 from PyQt6.QtGui import QIntValidator
 from PyQt6 import uic
 
+from src.log import get_logger
+
+logger = get_logger("launcher")
+
+
+# Варианты внутреннего разрешения сцены (в порядке пунктов списка)
+RENDER_SCALES = [1.0, 0.75, 0.5]
+RENDER_FILTERS = ["linear", "nearest"]
+
 
 class GameLauncher(QMainWindow):
     """Основной класс лаунчера"""
@@ -146,6 +155,9 @@ class GameLauncher(QMainWindow):
             "asteroid_spawn_rate": 0.3,
             "music_volume": 70,
             "sound_volume": 80,
+            "render_scale": RENDER_SCALES[self.render_scale.currentIndex()],
+            "render_filter": RENDER_FILTERS[self.render_filter.currentIndex()],
+            "hud_native_resolution": self.hud_native.isChecked(),
             "config_version": "1.0",
             "timestamp": "2024-01-01"  # Можно добавить текущее время
         }
@@ -167,18 +179,17 @@ class GameLauncher(QMainWindow):
         try:
             with open(current_config_path, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, indent=4, ensure_ascii=False)
-            print(f"✓ Настройки сохранены в: {current_config_path}")
+            logger.info("Настройки сохранены в: %s", current_config_path)
             return current_config_path
         except Exception as e:
-            print(f"✗ Ошибка сохранения: {e}")
+            logger.error("Ошибка сохранения: %s", e)
             return None
 
     def launch_game(self):
         """
         Основная функция запуска игры
         """
-        print("=" * 50)
-        print("Попытка запуска игры...")
+        logger.info("Попытка запуска игры...")
 
         # Проверяем ввод
         errors = self.validate_inputs()
@@ -190,12 +201,12 @@ class GameLauncher(QMainWindow):
         # Получаем настройки
         settings = self.get_game_settings()
 
-        # Выводим настройки в консоль
-        print("Настройки игры:")
-        print(f"  • Разрешение: {settings['screen_width']}x{settings['screen_height']}")
-        print(f"  • Скорость корабля: {settings['player_speed']}")
-        print(f"  • Скорость врагов: {settings['enemy_speed']}")
-        print(f"  • Скорость лазера: {settings['laser_speed']}")
+        # Записываем настройки в журнал
+        logger.info("Настройки игры: разрешение %sx%s, скорость корабля %s, скорость врагов %s, "
+                    "скорость лазера %s, масштаб сцены %d%%",
+                    settings['screen_width'], settings['screen_height'], settings['player_speed'],
+                    settings['enemy_speed'], settings['laser_speed'],
+                    int(settings['render_scale'] * 100))
 
         # Сохраняем настройки
         try:
@@ -219,7 +230,7 @@ class GameLauncher(QMainWindow):
         """
         Запускает игру на Arcade
         """
-        print("Запуск игры Arcade...")
+        logger.info("Запуск игры Arcade...")
 
         # Импортируем здесь, чтобы не загружать arcade раньше времени
         import subprocess
@@ -238,7 +249,7 @@ class GameLauncher(QMainWindow):
             raise FileNotFoundError(f"Не найден файл игры: {game_path}")
 
         # Запускаем игру в отдельном процессе
-        print(f"Запуск: {sys.executable} {game_path}")
+        logger.info("Запуск: %s %s", sys.executable, game_path)
 
         try:
             subprocess.Popen([
@@ -246,17 +257,17 @@ class GameLauncher(QMainWindow):
                 game_path
             ], cwd=project_root)
 
-            print("✓ Игра успешно запущена!")
+            logger.info("Игра успешно запущена")
 
         except Exception as e:
-            print(f"✗ Ошибка при запуске игры: {e}")
+            logger.error("Ошибка при запуске игры: %s", e)
             raise
 
     def closeEvent(self, event):
         """
         Обработчик закрытия окна
         """
-        print("Лаунчер закрыт")
+        logger.info("Лаунчер закрыт")
         event.accept()
 
 
@@ -12,20 +12,21 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'launcher'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'config'))
 
+from src.log import get_logger
+
+logger = get_logger("main")
+
 
 def main():
-    print("=" * 50)
-    print("   GALACTIC DEFENDER - Космический шутер")
-    print("=" * 50)
+    logger.info("GALACTIC DEFENDER - Космический шутер")
 
     # Проверяем зависимости
     try:
         import arcade
         from PyQt6.QtWidgets import QApplication
-        print("✓ Все зависимости установлены")
+        logger.info("Все зависимости установлены")
     except ImportError as e:
-        print(f"✗ Ошибка: {e}")
-        print("Установите зависимости: pip install -r requirements.txt")
+        logger.error("Ошибка: %s. Установите зависимости: pip install -r requirements.txt", e)
         return
 
     # Запускаем QT-лаунчер
@@ -0,0 +1,205 @@
+"""
+Менеджер ресурсов
+Все текстуры (и звуки) из манифеста читаются и декодируются один раз
+в фоновом потоке при запуске, пока открыто меню. Готовые текстуры
+упаковываются в атлас в главном потоке и раздаются по ключу со счетчиком
+ссылок, так что начало новой игры не обращается к диску.
+"""
+
+import queue
+import threading
+import time
+
+import arcade
+from PIL import Image
+
+from src.log import get_logger
+
+logger = get_logger("assets")
+
+
+# Ключ -> (тип, путь, размер заглушки при отсутствии файла)
+ASSET_MANIFEST = {
+    "player": ("texture", "assets/images/player.png", (50, 60)),
+    "shot": ("sound", "assets/sounds/shot.wav", None),
+    "super_shot": ("sound", "assets/sounds/super_shot.wav", None),
+    "hit": ("sound", "assets/sounds/hit.wav", None),
+    "explosion": ("sound", "assets/sounds/explosion.wav", None),
+    "player_hit": ("sound", "assets/sounds/player_hit.wav", None),
+    "game_over": ("sound", "assets/sounds/game_over.wav", None),
+}
+
+
+class Asset:
+    """Загруженный ресурс и его счетчик ссылок"""
+
+    __slots__ = ("key", "kind", "data", "missing", "refcount", "load_time", "size")
+
+    def __init__(self, key, kind, data, missing, load_time, size):
+        self.key = key
+        self.kind = kind
+        self.data = data
+        self.missing = missing  # Файл не найден, вместо него заглушка
+        self.refcount = 0
+        self.load_time = load_time  # Чтение и декодирование (сек)
+        self.size = size  # Размер в байтах после декодирования
+
+
+class AssetManager:
+    """
+    Кэш ресурсов по ключу.
+    Фоновый поток только читает и декодирует файлы; создание текстур
+    и упаковка в атлас требуют OpenGL и выполняются в poll() из главного потока.
+    """
+
+    def __init__(self, ctx, manifest=ASSET_MANIFEST):
+        """
+        Args:
+            ctx: OpenGL контекст окна (его атлас текстур по умолчанию)
+            manifest: Словарь ключ -> (тип, путь, размер заглушки)
+        """
+        self.ctx = ctx
+        self.manifest = dict(manifest)
+        self.assets = {}
+
+        self._decoded = queue.Queue()  # Результаты фонового потока
+        self._thread = None
+        self._pending = len(self.manifest)  # Еще не принятые из фоновой загрузки
+        self.start_time = 0
+        self.total_time = 0  # От запуска до готовности всех ресурсов (сек)
+
+    def start(self):
+        """Запускает фоновую загрузку всего манифеста"""
+        self.start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._load_all, name="assets", daemon=True)
+        self._thread.start()
+
+    def _load_all(self):
+        """Фоновый поток: чтение и декодирование файлов"""
+        for key in list(self.manifest):
+            self._decoded.put(self._load(key))
+
+    def _load(self, key):
+        """Читает и декодирует один ресурс: (ключ, данные или ошибка, время)"""
+        kind, path, _ = self.manifest[key]
+        load_start = time.perf_counter()
+        try:
+            data = self._decode(kind, path)
+        except (OSError, ValueError) as e:
+            data = e
+        return key, data, time.perf_counter() - load_start
+
+    @staticmethod
+    def _decode(kind, path):
+        if kind == "texture":
+            image = Image.open(path).convert("RGBA")
+            image.load()
+            return image
+        if kind == "sound":
+            # Звук целиком декодируется в память
+            return arcade.load_sound(path, streaming=False)
+        raise ValueError(f"Неизвестный тип ресурса: {kind}")
+
+    @property
+    def ready(self):
+        """Фоновая загрузка манифеста закончена"""
+        return self._pending == 0
+
+    def poll(self):
+        """Главный поток: принимает декодированные ресурсы (вызывать в тике)"""
+        while True:
+            try:
+                key, data, load_time = self._decoded.get_nowait()
+            except queue.Empty:
+                return
+            self._finalize(key, data, load_time)
+            self._pending -= 1
+
+            if self.ready:
+                self.total_time = time.perf_counter() - self.start_time
+                self.log_report()
+
+    def finish(self):
+        """Дожидается окончания фоновой загрузки и принимает все ресурсы"""
+        if self._thread is None:
+            self.start()
+        self._thread.join()
+        self.poll()
+
+    def _finalize(self, key, data, load_time):
+        kind, path, placeholder_size = self.manifest[key]
+        missing = isinstance(data, Exception)
+
+        if kind == "texture":
+            if missing:
+                logger.warning("Текстура %s не найдена (%s), используется заглушка", key, path)
+                texture = arcade.Texture.create_empty(f"placeholder:{key}", placeholder_size)
+            else:
+                texture = arcade.Texture(f"asset:{key}", image=data)
+            # Загружаем в атлас сразу, а не при первой отрисовке
+            self.ctx.default_atlas.add(texture)
+            size = texture.image.width * texture.image.height * 4
+            data = texture
+        else:
+            if missing:
+                logger.warning("Звук %s не найден (%s)", key, path)
+                data = None
+            size = 0
+
+        self.assets[key] = Asset(key, kind, data, missing, load_time, size)
+
+    def acquire(self, key):
+        """
+        Выдает ресурс и увеличивает счетчик ссылок
+
+        Returns:
+            Texture / Sound или None для отсутствующего звука
+        """
+        if key not in self.assets and not self.ready:
+            # Ресурс еще в пути - ждем фоновую загрузку
+            self.finish()
+        if key not in self.assets:
+            # Выгруженный ранее ресурс загружается заново
+            self._finalize(*self._load(key))
+
+        asset = self.assets[key]
+        asset.refcount += 1
+        return asset.data
+
+    def release(self, key):
+        """Уменьшает счетчик ссылок (ресурс остается в кэше)"""
+        asset = self.assets.get(key)
+        if asset and asset.refcount > 0:
+            asset.refcount -= 1
+
+    def is_missing(self, key):
+        """Вместо ресурса выдается заглушка"""
+        asset = self.assets.get(key)
+        return asset is None or asset.missing
+
+    def unload_unused(self):
+        """
+        Выгружает ресурсы без ссылок (в том числе из атласа)
+
+        Returns:
+            Количество выгруженных ресурсов
+        """
+        unused = [key for key, asset in self.assets.items() if asset.refcount == 0]
+        for key in unused:
+            asset = self.assets.pop(key)
+            if asset.kind == "texture":
+                self.ctx.default_atlas.remove(asset.data)
+        return len(unused)
+
+    def get_timings(self):
+        """Время загрузки по ключам (мс)"""
+        return {key: asset.load_time * 1000 for key, asset in self.assets.items()}
+
+    def log_report(self):
+        """Записывает в журнал итог загрузки"""
+        decode_time = sum(asset.load_time for asset in self.assets.values())
+        missing = sum(asset.missing for asset in self.assets.values())
+        size = sum(asset.size for asset in self.assets.values())
+        logger.info("Ресурсы загружены: %d шт. за %.1f мс (декодирование %.1f мс, %.0f КБ, "
+                    "заглушек %d)", len(self.assets), self.total_time * 1000,
+                    decode_time * 1000, size / 1024, missing)
@@ -1,12 +1,12 @@
 import arcade
 import random
-from src.constants import SCREEN_WIDTH
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, BASE_FPS
 
 
 class Asteroid:
-    def __init__(self):
-        self.center_x = random.randint(50, SCREEN_WIDTH - 50)
-        self.center_y = SCREEN_HEIGHT + 50
+    def __init__(self, x=None, y=None):
+        self.center_x = x if x is not None else random.randint(50, SCREEN_WIDTH - 50)
+        self.center_y = y if y is not None else SCREEN_HEIGHT + 50
         self.width = 40
         self.height = 40
         self.speed = random.uniform(1.0, 3.0)
@@ -15,7 +15,7 @@ class Asteroid:
         self.color = (150, 150, 150)
 
     def update(self, delta_time):
-        self.center_y -= self.speed
+        self.center_y -= self.speed * BASE_FPS * delta_time
 
     def draw(self):
         arcade.draw_circle_filled(
@@ -0,0 +1,180 @@
+"""
+Звуковой микшер
+Эффекты заранее декодированы в память (менеджер ресурсов) и играют через
+постоянный пул голосов: у каждого звука свой лимит одновременных копий,
+при нехватке голосов вытесняется самый старый. Игровой код только ставит
+звук в очередь - это неблокирующее добавление, безопасное из потока
+симуляции; очередь разбирается в главном потоке. Музыка идет потоком с диска.
+"""
+
+import time
+from collections import deque
+
+import pyglet
+from pyglet.media.exceptions import MediaException
+
+from src.constants import MUSIC_VOLUME, SOUND_VOLUME, AUDIO_VOICES
+from src.log import get_logger
+
+logger = get_logger("audio")
+
+
+# Звуковые эффекты: ключ ресурса -> (лимит копий, приоритет, громкость)
+# Звук с большим приоритетом может вытеснить звук с меньшим
+SOUND_EFFECTS = {
+    "shot": (4, 1, 0.5),
+    "super_shot": (1, 3, 1.0),
+    "hit": (4, 1, 0.6),
+    "explosion": (6, 2, 0.8),
+    "player_hit": (2, 3, 1.0),
+    "game_over": (1, 4, 1.0),
+}
+
+# Музыкальные треки: ключ -> путь (читаются потоком, не в память)
+MUSIC_TRACKS = {
+    "theme": "assets/music/theme.ogg",
+}
+
+
+class Voice:
+    """Голос пула: плеер pyglet и звук, который он играет"""
+
+    __slots__ = ("player", "key", "priority", "started", "ends_at")
+
+    def __init__(self):
+        self.player = pyglet.media.Player()
+        self.key = None
+        self.priority = 0
+        self.started = 0.0
+        self.ends_at = 0.0
+
+    def is_free(self, now):
+        return self.key is None or now >= self.ends_at
+
+
+class AudioMixer:
+    """Пул голосов для эффектов и отдельный плеер для музыки"""
+
+    def __init__(self, assets, voices=AUDIO_VOICES,
+                 sound_volume=SOUND_VOLUME, music_volume=MUSIC_VOLUME):
+        """
+        Args:
+            assets: Менеджер ресурсов, в котором декодированы звуки
+            voices: Размер пула голосов
+            sound_volume, music_volume: Громкость 0-100 (как в конфиге)
+        """
+        self.assets = assets
+        self.sound_volume = sound_volume / 100
+        self.music_volume = music_volume / 100
+
+        # Выбор аудиодрайвера - при запуске, а не на первом выстреле
+        pyglet.media.get_audio_driver()
+
+        self.voices = [Voice() for _ in range(voices)]
+        self.sources = None  # Ключ -> декодированный источник, после загрузки ресурсов
+        self.requests = deque(maxlen=64)  # Очередь звуков от игрового кода
+
+        self.music_player = pyglet.media.Player()
+        self.music_player.loop = True
+        self.music_player.volume = self.music_volume
+        self.music_key = None
+
+        # Счетчики для отладки
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def play(self, key):
+        """Ставит звук в очередь (не блокирует, можно из любого потока)"""
+        self.requests.append(key)
+
+    def update(self):
+        """Главный поток: запускает звуки из очереди (вызывать каждый тик)"""
+        if self.sources is None:
+            if not self.assets.ready:
+                # Звуки еще декодируются - запросы из меню не копим
+                self.requests.clear()
+                return
+            self.sources = {}
+            for key in SOUND_EFFECTS:
+                sound = self.assets.acquire(key)
+                if sound is not None:
+                    self.sources[key] = sound.source
+
+        now = time.perf_counter()
+        started = {}
+        while self.requests:
+            key = self.requests.popleft()
+            # Копии одного звука за тик сверх лимита не слышны - голоса не трогаем
+            count = started.get(key, 0)
+            if count >= SOUND_EFFECTS[key][0]:
+                continue
+            started[key] = count + 1
+            self._start(key, now)
+
+    def _start(self, key, now):
+        source = self.sources.get(key)
+        if source is None:
+            return  # Файла звука нет
+        limit, priority, gain = SOUND_EFFECTS[key]
+
+        voice = None
+        same = [v for v in self.voices if v.key == key and not v.is_free(now)]
+        if len(same) >= limit:
+            # Лимит копий: перезапускаем самую старую копию этого звука
+            voice = min(same, key=lambda v: v.started)
+        else:
+            voice = next((v for v in self.voices if v.is_free(now)), None)
+        if voice is None:
+            # Все голоса заняты: вытесняем самый старый из менее важных
+            candidates = [v for v in self.voices if v.priority <= priority]
+            if not candidates:
+                self.dropped += 1
+                return
+            voice = min(candidates, key=lambda v: (v.priority, v.started))
+
+        if not voice.is_free(now):
+            self.stolen += 1
+
+        player = voice.player
+        if player.source is not None:
+            player.pause()
+            player.next_source()
+        player.queue(source)
+        player.volume = self.sound_volume * gain
+        player.play()
+
+        voice.key = key
+        voice.priority = priority
+        voice.started = now
+        voice.ends_at = now + (source.duration or 0.0)
+        self.played += 1
+
+    def play_music(self, key):
+        """Запускает музыкальный трек по кругу (потоковое чтение)"""
+        if key == self.music_key:
+            return
+        self.stop_music()
+
+        path = MUSIC_TRACKS[key]
+        try:
+            source = pyglet.media.load(path, streaming=True)
+        except (OSError, EOFError, MediaException):
+            logger.warning("Музыка %s не найдена (%s)", key, path)
+            return
+
+        self.music_player.queue(source)
+        self.music_player.play()
+        self.music_key = key
+
+    def stop_music(self):
+        """Останавливает музыку"""
+        if self.music_player.source is not None:
+            self.music_player.pause()
+            self.music_player.next_source()
+        self.music_key = None
+
+    def active_voices(self):
+        """Количество звучащих голосов"""
+        now = time.perf_counter()
+        return sum(not voice.is_free(now) for voice in self.voices)
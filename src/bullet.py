@@ -2,13 +2,24 @@
 Класс пули/лазера
 """
 
+import itertools
+import math
+
 import arcade
-from src.constants import BULLET_SPEED, SCREEN_HEIGHT
+from src.constants import BULLET_SPEED, SCREEN_WIDTH, SCREEN_HEIGHT, BASE_FPS
+
+# Самонаведение: дальность и раствор поиска цели, скорость поворота
+HOMING_RANGE = 450  # пикс
+HOMING_HALF_ANGLE = 70  # градусы
+HOMING_TURN_RATE = 300  # градусов в секунду
+
+# Идентификаторы пуль (для зрителей)
+_bullet_ids = itertools.count(1)
 
 class Bullet:
     """Класс пули/лазера"""
 
-    def __init__(self, x, y, speed=None, is_super=False):
+    def __init__(self, x, y, speed=None, is_super=False, angle=90.0, homing=False):
         """
         Инициализация пули
 
@@ -17,11 +28,19 @@ class Bullet:
             y: Позиция по Y
             speed: Скорость пули (если None, берется из BULLET_SPEED)
             is_super: Является ли супер-пулей
+            angle: Направление полета (градусы, 90 - вверх)
+            homing: Доворачивает к ближайшей цели впереди
         """
+        self.uid = next(_bullet_ids)
         self.center_x = x
         self.center_y = y
+        self.prev_x = x  # Позиция до последнего тика (для непрерывных столкновений)
+        self.prev_y = y
         self.speed = speed if speed is not None else BULLET_SPEED
         self.is_super = is_super
+        self.angle = angle
+        self.homing = homing
+        self.target = None  # Текущая цель самонаведения
         self.active = True
         self.damage = 3 if is_super else 1  # Супер-пуля наносит больше урона
         self.width = 4 if is_super else 2   # Ширина пули
@@ -41,40 +60,83 @@ class Bullet:
 
     def update(self, delta_time):
         """Обновляет позицию пули"""
-        self.center_y += self.speed
+        self.prev_x = self.center_x
+        self.prev_y = self.center_y
+        if self.angle == 90.0:
+            self.center_y += self.speed * BASE_FPS * delta_time
+        else:
+            step = self.speed * BASE_FPS * delta_time
+            angle = math.radians(self.angle)
+            self.center_x += math.cos(angle) * step
+            self.center_y += math.sin(angle) * step
 
         # Деактивируем если вышла за экран
-        if self.center_y > SCREEN_HEIGHT + 50:
+        if (self.center_y > SCREEN_HEIGHT + 50 or self.center_y < -50 or
+                self.center_x < -50 or self.center_x > SCREEN_WIDTH + 50):
             self.active = False
 
-    def draw(self):
-        """Рисует пулю"""
+    def steer(self, targets, delta_time):
+        """
+        Доворачивает самонаводящуюся пулю к ближайшей цели впереди
+
+        Args:
+            targets: Сетка целей (TargetIndex) текущего тика
+            delta_time: Время тика (сек)
+        """
+        found = targets.cone(self.center_x, self.center_y, self.angle,
+                             HOMING_HALF_ANGLE, HOMING_RANGE)
+        self.target = found[0][0] if found else None
+        if self.target is None:
+            return
+
+        wanted = math.degrees(math.atan2(self.target.center_y - self.center_y,
+                                         self.target.center_x - self.center_x))
+        turn = (wanted - self.angle + 180) % 360 - 180
+        limit = HOMING_TURN_RATE * delta_time
+        self.angle += min(max(turn, -limit), limit)
+
+    def draw(self, glow=True):
+        """
+        Рисует пулю
+
+        Args:
+            glow: Рисовать ли свечение и носок (отключается при низком качестве)
+        """
+        # Пуля рисуется вертикальной и поворачивается по направлению полета
+        tilt = self.angle - 90
+
         # Основной корпус пули
         arcade.draw_rectangle_filled(
             self.center_x, self.center_y,
             self.width, self.height,
-            self.color
+            self.color, tilt
         )
 
+        if not glow:
+            return
+
         # Эффект свечения (особенно для супер-пули)
         arcade.draw_rectangle_filled(
             self.center_x, self.center_y,
             self.width + 2, self.height + 4,
-            self.glow_color
+            self.glow_color, tilt
         )
 
         # Носок пули (ярче)
+        angle = math.radians(self.angle)
+        nose_x = self.center_x + math.cos(angle) * self.height / 2
+        nose_y = self.center_y + math.sin(angle) * self.height / 2
         if self.is_super:
             arcade.draw_rectangle_filled(
-                self.center_x, self.center_y + self.height/2,
+                nose_x, nose_y,
                 self.width - 1, 3,
-                (255, 255, 200)
+                (255, 255, 200), tilt
             )
         else:
             arcade.draw_rectangle_filled(
-                self.center_x, self.center_y + self.height/2,
+                nose_x, nose_y,
                 self.width - 1, 2,
-                (255, 150, 150)
+                (255, 150, 150), tilt
             )
 
     def check_collision(self, enemy):
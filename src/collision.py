@@ -0,0 +1,124 @@
+"""
+Проверки столкновений
+Все проверки работают с массивами NumPy поэлементно (с broadcasting),
+поэтому матрица "пули x цели" проверяется за один вызов. Для быстрых пуль -
+непрерывная (swept) проверка: ищется самое раннее попадание на отрезке
+движения за тик. Враги и пули - прямоугольники (AABB), астероиды - круги.
+"""
+
+import numpy as np
+
+
+def entity_boxes(entities):
+    """Центры и полуразмеры объектов: массивы x, y, half_width, half_height"""
+    count = len(entities)
+    data = np.fromiter(
+        (value for entity in entities
+         for value in (entity.center_x, entity.center_y, entity.width, entity.height)),
+        dtype=np.float64, count=count * 4
+    ).reshape(count, 4)
+    return data[:, 0], data[:, 1], data[:, 2] / 2, data[:, 3] / 2
+
+
+def entity_circles(entities):
+    """Центры и радиусы круглых объектов: массивы x, y, radius"""
+    x, y, half_width, _ = entity_boxes(entities)
+    return x, y, np.floor(half_width)  # Астероид рисуется радиусом width // 2
+
+
+def aabb_vs_aabb(ax, ay, a_half_width, a_half_height, bx, by, b_half_width, b_half_height):
+    """Маска пересечения прямоугольников"""
+    return ((np.abs(ax - bx) < a_half_width + b_half_width) &
+            (np.abs(ay - by) < a_half_height + b_half_height))
+
+
+def circle_vs_aabb(cx, cy, radius, bx, by, half_width, half_height):
+    """Маска пересечения круга и прямоугольника"""
+    # Ближайшая к центру круга точка прямоугольника
+    dx = np.abs(cx - bx) - half_width
+    dy = np.abs(cy - by) - half_height
+    dx = np.maximum(dx, 0.0)
+    dy = np.maximum(dy, 0.0)
+    return dx * dx + dy * dy < radius * radius
+
+
+def sweep_aabb(x0, y0, x1, y1, half_width, half_height, bx, by, b_half_width, b_half_height):
+    """
+    Движущийся прямоугольник из (x0, y0) в (x1, y1) против неподвижных
+    прямоугольников (swept AABB, метод пластин)
+
+    Returns:
+        Массив долей пути t в [0, 1] до первого касания; np.inf - промах
+    """
+    return _ray_vs_box(x0, y0, x1 - x0, y1 - y0,
+                       bx, by, b_half_width + half_width, b_half_height + half_height)
+
+
+def sweep_aabb_circle(x0, y0, x1, y1, half_width, half_height, cx, cy, radius):
+    """
+    Движущийся прямоугольник против неподвижных кругов
+
+    Сумма Минковского прямоугольника и круга - прямоугольник со
+    скругленными углами: два расширенных прямоугольника и четыре круга
+    в углах. Берется самое раннее пересечение луча с любой из частей.
+
+    Returns:
+        Массив долей пути t в [0, 1] до первого касания; np.inf - промах
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+
+    t = np.minimum(
+        _ray_vs_box(x0, y0, dx, dy, cx, cy, half_width + radius, half_height),
+        _ray_vs_box(x0, y0, dx, dy, cx, cy, half_width, half_height + radius)
+    )
+    for corner_x in (-half_width, half_width):
+        for corner_y in (-half_height, half_height):
+            t = np.minimum(t, _ray_vs_circle(x0, y0, dx, dy,
+                                             cx + corner_x, cy + corner_y, radius))
+    return t
+
+
+def _ray_vs_box(x0, y0, dx, dy, bx, by, half_width, half_height):
+    """Первое пересечение отрезка p0 + t*d (t в [0, 1]) с прямоугольником"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_enter = np.zeros(np.broadcast(x0, bx).shape)
+        t_exit = np.ones_like(t_enter)
+        inside = np.ones(t_enter.shape, dtype=bool)
+
+        for start, delta, center, half in ((x0, dx, bx, half_width),
+                                           (y0, dy, by, half_height)):
+            low = center - half
+            high = center + half
+            t_low = (low - start) / delta
+            t_high = (high - start) / delta
+
+            # Без движения по оси отрезок должен лежать внутри пластины
+            still = np.broadcast_to(delta == 0, t_enter.shape)
+            inside &= ~still | ((start > low) & (start < high))
+
+            t_near = np.where(still, -np.inf, np.minimum(t_low, t_high))
+            t_far = np.where(still, np.inf, np.maximum(t_low, t_high))
+            t_enter = np.maximum(t_enter, t_near)
+            t_exit = np.minimum(t_exit, t_far)
+
+    hit = inside & (t_enter <= t_exit)
+    return np.where(hit, t_enter, np.inf)
+
+
+def _ray_vs_circle(x0, y0, dx, dy, cx, cy, radius):
+    """Первое пересечение отрезка p0 + t*d (t в [0, 1]) с кругом"""
+    fx = x0 - cx
+    fy = y0 - cy
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = b * b - 4 * a * c
+        t = (-b - np.sqrt(np.maximum(discriminant, 0.0))) / (2 * a)
+
+    # Начало отрезка уже внутри круга - касание в t = 0
+    start_inside = c <= 0
+    hit = (discriminant >= 0) & (t >= 0) & (t <= 1)
+    return np.where(start_inside, 0.0, np.where(hit, t, np.inf))
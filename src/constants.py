@@ -5,6 +5,10 @@
 import json
 import os
 
+from src.log import get_logger, configure_logging
+
+logger = get_logger("config")
+
 def load_config():
     """Загружает конфигурацию из JSON файла"""
     # Путь к файлу конфигурации
@@ -18,14 +22,14 @@ def load_config():
             try:
                 with open(path, 'r', encoding='utf-8') as f:
                     config = json.load(f)
-                    print(f"✓ Конфиг загружен из: {path}")
+                    logger.info("Конфиг загружен из: %s", path)
                     return config
             except Exception as e:
-                print(f"✗ Ошибка загрузки конфига {path}: {e}")
+                logger.error("Ошибка загрузки конфига %s: %s", path, e)
                 continue
 
     # Конфиг по умолчанию (если файлов нет)
-    print("⚠ Конфиг не найден, используются значения по умолчанию")
+    logger.warning("Конфиг не найден, используются значения по умолчанию")
     return {
         "screen_width": 800,
         "screen_height": 600,
@@ -39,10 +43,20 @@ def load_config():
 # Загружаем конфигурацию
 CONFIG = load_config()
 
+# Журнал: общий уровень, уровни подсистем ({"spectator": "WARNING"}), файл, формат text/json
+LOG_LEVEL = CONFIG.get("log_level", "INFO")
+LOG_LEVELS = CONFIG.get("log_levels", {})
+LOG_FILE = CONFIG.get("log_file")
+LOG_FORMAT = CONFIG.get("log_format", "text")
+LOG_RATE_LIMIT = CONFIG.get("log_rate_limit", 10)  # Сообщений из одного места кода за интервал
+LOG_RATE_INTERVAL = CONFIG.get("log_rate_interval", 5.0)  # Сек
+configure_logging(LOG_LEVEL, LOG_LEVELS, LOG_FILE, LOG_FORMAT, LOG_RATE_LIMIT, LOG_RATE_INTERVAL)
+
 # Извлекаем константы ИЗ КОНФИГА
 SCREEN_WIDTH = CONFIG.get("screen_width", 800)
 SCREEN_HEIGHT = CONFIG.get("screen_height", 600)
 SCREEN_TITLE = "Galactic Defender"
+BASE_FPS = 60  # Скорости в конфиге заданы в пикселях за кадр при 60 FPS
 PLAYER_SPEED = CONFIG.get("player_speed", 5)
 ENEMY_SPEED = CONFIG.get("enemy_speed", 2)
 BULLET_SPEED = CONFIG.get("laser_speed", 7)
@@ -54,6 +68,70 @@ PLAYER_HP = CONFIG.get("player_hp", 5)
 ENEMY_HP = CONFIG.get("enemy_hp", 1)
 ENEMY_SPAWN_RATE = CONFIG.get("enemy_spawn_rate", 1.0)
 ASTEROID_SPAWN_RATE = CONFIG.get("asteroid_spawn_rate", 0.3)
+UPDATE_RATE = CONFIG.get("update_rate", 60)  # Частота игрового тика (Гц)
+TIME_SCALE = CONFIG.get("time_scale", 1.0)  # Множитель скорости игрового времени
+THREADED_SIMULATION = CONFIG.get("threaded_simulation", False)  # Симуляция в отдельном потоке
+COOP_PLAYERS = CONFIG.get("coop_players", 1)  # Игроков за одной клавиатурой (1 или 2)
+KEY_BINDINGS = CONFIG.get("key_bindings")  # Привязки клавиш по игрокам; None - по умолчанию
+WAVES_FILE = CONFIG.get("waves_file", os.path.join("config", "waves.json"))
+ENEMY_FIRE_FILE = CONFIG.get("enemy_fire_file", os.path.join("config", "enemy_fire.json"))
+MOTION_FILE = CONFIG.get("motion_file", os.path.join("config", "motion_paths.json"))
+LEVEL_FILE = CONFIG.get("level_file")  # Сценарный уровень (.json или .lvl); None - бесконечная игра
+LEVEL_LOOKAHEAD = CONFIG.get("level_lookahead", 2.0)  # Окно уровня в очереди появления (сек)
+STATS_DB = CONFIG.get("stats_db", os.path.join("src", "logs.db"))  # База статистики игр
+
+# Лимиты живых объектов по типам
+ENTITY_CAPS = CONFIG.get("entity_caps", {"enemy": 300, "asteroid": 150})
+ENEMY_PROJECTILE_CAPACITY = CONFIG.get("enemy_projectile_capacity", 8192)
+
+# Поиск целей: самонаводящийся супер-выстрел и помощь в прицеливании
+TARGET_CELL_SIZE = CONFIG.get("target_cell_size", 64)  # Ячейка сетки целей (пикс)
+HOMING_SUPER_SHOT = CONFIG.get("homing_super_shot", True)
+AIM_ASSIST = CONFIG.get("aim_assist", False)
+AIM_ASSIST_ANGLE = CONFIG.get("aim_assist_angle", 12)  # Макс. отклонение выстрела (градусы)
+
+# Трансляция игры зрителям по сети
+SPECTATOR_SERVER = CONFIG.get("spectator_server", False)
+SPECTATOR_HOST = CONFIG.get("spectator_host", "127.0.0.1")
+SPECTATOR_PORT = CONFIG.get("spectator_port", 8765)
+SPECTATOR_KEYFRAME_INTERVAL = CONFIG.get("spectator_keyframe_interval", 60)  # Кадров
+
+# Метрики производительности в формате Prometheus
+METRICS_SERVER = CONFIG.get("metrics_server", False)  # HTTP эндпоинт /metrics
+METRICS_HOST = CONFIG.get("metrics_host", "127.0.0.1")
+METRICS_PORT = CONFIG.get("metrics_port", 9108)
+METRICS_FILE = CONFIG.get("metrics_file")  # Файл периодического сброса; None - без файла
+METRICS_DUMP_INTERVAL = CONFIG.get("metrics_dump_interval", 10)  # Сек
+
+# Диагностика утечек памяти между играми (tracemalloc замедляет игру)
+LEAK_CHECK = CONFIG.get("leak_check", False)
+LEAK_TRACE_FRAMES = CONFIG.get("leak_trace_frames", 1)  # Глубина стека выделений
+LEAK_TOP = CONFIG.get("leak_top", 10)  # Мест с наибольшим ростом в отчете
+
+# Выборочный профайлер: F9 или автозапуск на медленном кадре
+PROFILER_AUTO = CONFIG.get("profiler_auto", False)  # Запуск при кадре дольше бюджета
+PROFILER_BUDGET_MS = CONFIG.get("profiler_budget_ms", 50)
+PROFILER_DURATION = CONFIG.get("profiler_duration", 5.0)  # Окно записи (сек)
+PROFILER_INTERVAL_MS = CONFIG.get("profiler_interval_ms", 2)  # Период снятия стеков
+PROFILER_COOLDOWN = CONFIG.get("profiler_cooldown", 60.0)  # Пауза между автозапусками (сек)
+PROFILER_DIR = CONFIG.get("profiler_dir", "profiles")
+
+# Графика: внутреннее разрешение сцены как доля от окна, фильтр растяжения
+RENDER_SCALE = CONFIG.get("render_scale", 1.0)
+RENDER_FILTER = CONFIG.get("render_filter", "linear")  # linear или nearest
+HUD_NATIVE_RESOLUTION = CONFIG.get("hud_native_resolution", True)
+QUALITY_GOVERNOR = CONFIG.get("quality_governor", True)  # Автоснижение качества
+TARGET_FPS = CONFIG.get("target_fps", 60)
+IDLE_FPS = CONFIG.get("idle_fps", 5)  # Частота кадров в меню без изменений
+
+# Эффекты
+PARTICLE_CAPACITY = CONFIG.get("particle_capacity", 20000)
+STAR_DENSITY = CONFIG.get("star_density", 300)  # Звезд на мегапиксель
+
+# Звук: громкость 0-100
+MUSIC_VOLUME = CONFIG.get("music_volume", 70)
+SOUND_VOLUME = CONFIG.get("sound_volume", 80)
+AUDIO_VOICES = CONFIG.get("audio_voices", 16)  # Одновременно звучащих эффектов
 
 # Цвета (не настраиваются через конфиг)
 WHITE = (255, 255, 255)
@@ -66,16 +144,9 @@ PURPLE = (180, 50, 230)
 ORANGE = (255, 150, 50)
 
 # Дополнительная информация о конфиге для отладки
-def print_config_info():
-    """Выводит информацию о загруженном конфиге"""
-    print("\n" + "="*50)
-    print("ТЕКУЩАЯ КОНФИГУРАЦИЯ ИГРЫ:")
-    print("="*50)
-    print(f"Разрешение: {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
-    print(f"Скорость корабля: {PLAYER_SPEED}")
-    print(f"Скорость врагов: {ENEMY_SPEED}")
-    print(f"Скорость лазера: {BULLET_SPEED}")
-    print(f"Жизни игрока: {PLAYER_LIVES}")
-    print(f"HP игрока: {PLAYER_HP}")
-    print(f"Сложность: {DIFFICULTY}")
-    print("="*50 + "\n")
\ No newline at end of file
+def log_config_info():
+    """Записывает в журнал основные параметры загруженного конфига"""
+    logger.info("Конфигурация: разрешение %sx%s, скорость корабля %s, скорость врагов %s, "
+                "скорость лазера %s, жизни %s, HP %s, сложность %s",
+                SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SPEED, ENEMY_SPEED, BULLET_SPEED,
+                PLAYER_LIVES, PLAYER_HP, DIFFICULTY)
\ No newline at end of file
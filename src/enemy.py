@@ -1,12 +1,12 @@
 import arcade
 import random
-from src.constants import SCREEN_WIDTH, ENEMY_SPEED
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, BASE_FPS, ENEMY_SPEED
 
 
 class Enemy:
-    def __init__(self):
-        self.center_x = random.randint(50, SCREEN_WIDTH - 50)
-        self.center_y = SCREEN_HEIGHT + 50
+    def __init__(self, x=None, y=None):
+        self.center_x = x if x is not None else random.randint(50, SCREEN_WIDTH - 50)
+        self.center_y = y if y is not None else SCREEN_HEIGHT + 50
         self.width = 30
         self.height = 30
         self.speed = ENEMY_SPEED
@@ -14,8 +14,19 @@ class Enemy:
         self.is_alive = True
         self.color = (255, 50, 150)
 
+        # Стрельба (узор назначает EnemyFire при первом тике)
+        self.fire_pattern = None
+        self.next_fire_time = 0.0
+        self.fire_angle = 0.0  # Текущий угол спирали (рад)
+
+        # Траектория (назначает MotionPaths при создании)
+        self.path = None
+        self.origin_x = self.center_x
+        self.origin_y = self.center_y
+        self.spawn_time = 0.0
+
     def update(self, delta_time):
-        self.center_y -= self.speed
+        self.center_y -= self.speed * BASE_FPS * delta_time
 
     def draw(self):
         arcade.draw_rectangle_filled(
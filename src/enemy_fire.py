@@ -0,0 +1,293 @@
+"""
+Стрельба врагов
+Снаряды врагов лежат в заранее выделенных массивах NumPy (живые - в начале
+массивов, без дыр), двигаются и удаляются векторными операциями и рисуются
+одним вызовом на GPU. Узоры стрельбы (прицельный, веер, спираль, кольцо)
+задаются в JSON файле.
+"""
+
+import json
+import os
+
+import numpy as np
+from arcade.gl import BufferDescription
+
+from src.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, BASE_FPS,
+                           ENEMY_FIRE_FILE, ENEMY_PROJECTILE_CAPACITY)
+from src.collision import circle_vs_aabb
+from src.log import get_logger
+
+logger = get_logger("enemy_fire")
+
+
+VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+uniform float u_scale;
+
+in vec4 in_state;  // x, y, радиус, не используется
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = proj.matrix * vec4(in_state.xy, 0.0, 1.0);
+    gl_PointSize = in_state.z * 2.0 * u_scale;
+    v_color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+out vec4 out_color;
+
+void main() {
+    vec2 d = gl_PointCoord - vec2(0.5);
+    float r2 = dot(d, d);
+    if (r2 > 0.25) {
+        discard;
+    }
+    // Светлая сердцевина, чтобы снаряд читался на любом фоне
+    out_color = mix(vec4(1.0), v_color, smoothstep(0.0, 0.12, r2));
+}
+"""
+
+# Узоры на случай отсутствия файла
+DEFAULT_FIRE_DATA = {
+    "patterns": {
+        "aimed": {"shape": "aimed", "count": 1, "spread": 0, "speed": 4.0, "interval": 2.0,
+                  "radius": 4, "color": [255, 140, 60, 255]},
+    },
+    "weights": {"none": 1, "aimed": 1},
+}
+
+# Запас за краями экрана, после которого снаряд удаляется
+PROJECTILE_MARGIN = 20
+
+
+class EnemyFire:
+    """Узоры стрельбы врагов и хранилище их снарядов"""
+
+    def __init__(self, ctx, capacity=ENEMY_PROJECTILE_CAPACITY, path=ENEMY_FIRE_FILE):
+        """
+        Args:
+            ctx: OpenGL контекст окна
+            capacity: Максимальное количество живых снарядов
+            path: JSON файл с узорами стрельбы
+        """
+        self.ctx = ctx
+        self.capacity = capacity
+        self.count = 0  # Живые снаряды - индексы [0, count)
+        self.dropped = 0  # Не выпущены из-за заполненного хранилища
+        self.tested = 0  # Снарядов на точной проверке в последнем collide_player
+
+        # x, y, радиус, резерв - в том же виде уходят на GPU
+        self.state = np.zeros((capacity, 4), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+
+        data = load_fire_patterns(path)
+        self.patterns = data["patterns"]
+        weights = data.get("weights", {})
+        self.pattern_names = [name for name in weights if name == "none" or name in self.patterns]
+        self.pattern_weights = np.array([weights[name] for name in self.pattern_names], dtype=float)
+        self.pattern_weights /= self.pattern_weights.sum()
+        self.max_radius = max(pattern["radius"] for pattern in self.patterns.values())
+        self._rng = np.random.default_rng()
+
+        self.state_buffer = ctx.buffer(reserve=self.state.nbytes, usage="stream")
+        self.color_buffer = ctx.buffer(reserve=self.color.nbytes, usage="stream")
+        self.geometry = ctx.geometry([
+            BufferDescription(self.state_buffer, "4f", ["in_state"]),
+            BufferDescription(self.color_buffer, "4f1", ["in_color"], normalized=["in_color"]),
+        ])
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["u_scale"] = 1.0
+
+    def clear(self):
+        """Удаляет все снаряды"""
+        self.count = 0
+        self.dropped = 0
+
+    def update(self, now, delta_time, enemies, players):
+        """
+        Выстрелы врагов, движение снарядов и удаление улетевших за экран
+
+        Args:
+            now: Игровое время (сек)
+            delta_time: Шаг тика (сек)
+            enemies: Живые враги
+            players: Живые игроки - цели прицельных выстрелов
+        """
+        self.fire(now, enemies, players)
+
+        n = self.count
+        if not n:
+            return
+        self.state[:n, 0:2] += self.velocity[:n] * delta_time
+
+        x = self.state[:n, 0]
+        y = self.state[:n, 1]
+        outside = ((x < -PROJECTILE_MARGIN) | (x > SCREEN_WIDTH + PROJECTILE_MARGIN) |
+                   (y < -PROJECTILE_MARGIN) | (y > SCREEN_HEIGHT + PROJECTILE_MARGIN))
+        if outside.any():
+            self.remove(np.flatnonzero(outside))
+
+    def fire(self, now, enemies, players):
+        """Выпускает снаряды всех врагов, у которых подошло время выстрела"""
+        shots = []
+        for enemy in enemies:
+            if enemy.fire_pattern is None:
+                # Узор выбирается один раз, первый выстрел - со случайной задержкой
+                enemy.fire_pattern = str(self._rng.choice(self.pattern_names, p=self.pattern_weights))
+                if enemy.fire_pattern != "none":
+                    interval = self.patterns[enemy.fire_pattern]["interval"]
+                    enemy.next_fire_time = now + self._rng.uniform(0, interval)
+
+            # Стреляют только видимые враги
+            if (enemy.fire_pattern == "none" or now < enemy.next_fire_time or
+                    enemy.center_y > SCREEN_HEIGHT):
+                continue
+
+            pattern = self.patterns[enemy.fire_pattern]
+            enemy.next_fire_time = now + pattern["interval"]
+            x = enemy.center_x
+            y = enemy.center_y - enemy.height / 2
+            # Прицельный выстрел - в ближайшего игрока
+            target = min(players, key=lambda p: (p.center_x - x) ** 2 + (p.center_y - y) ** 2,
+                         default=None)
+            shots.append((x, y, self.pattern_angles(pattern, enemy, x, y, target), pattern))
+
+        if shots:
+            self.spawn(
+                np.concatenate([np.full(len(angles), x) for x, _, angles, _ in shots]),
+                np.concatenate([np.full(len(angles), y) for _, y, angles, _ in shots]),
+                np.concatenate([angles for _, _, angles, _ in shots]),
+                np.concatenate([np.full(len(angles), p["speed"] * BASE_FPS)
+                                for _, _, angles, p in shots]),
+                np.concatenate([np.full(len(angles), p["radius"]) for _, _, angles, p in shots]),
+                np.concatenate([np.tile(p["color"], (len(angles), 1)) for _, _, angles, p in shots]),
+            )
+
+    @staticmethod
+    def pattern_angles(pattern, enemy, x, y, player):
+        """Направления снарядов одного залпа (радианы)"""
+        count = pattern["count"]
+        shape = pattern["shape"]
+
+        if shape == "aimed":
+            # В игрока (или вниз, если игрока нет), веером на spread градусов
+            base = np.arctan2(player.center_y - y, player.center_x - x) if player else -np.pi / 2
+            spread = np.radians(pattern.get("spread", 0))
+            offsets = np.linspace(-spread / 2, spread / 2, count) if count > 1 else np.zeros(1)
+            return base + offsets
+
+        # Равномерно по кругу; спираль поворачивается на turn градусов за залп
+        offsets = np.arange(count) * (2 * np.pi / count)
+        if shape == "spiral":
+            enemy.fire_angle += np.radians(pattern.get("turn", 10))
+            return enemy.fire_angle + offsets
+        return -np.pi / 2 + offsets
+
+    def spawn(self, x, y, angle, speed, radius, color):
+        """Добавляет снаряды в конец живой части массивов"""
+        count = min(len(x), self.capacity - self.count)
+        self.dropped += len(x) - count
+        if count <= 0:
+            return
+
+        index = slice(self.count, self.count + count)
+        self.state[index, 0] = x[:count]
+        self.state[index, 1] = y[:count]
+        self.state[index, 2] = radius[:count]
+        self.velocity[index, 0] = np.cos(angle[:count]) * speed[:count]
+        self.velocity[index, 1] = np.sin(angle[:count]) * speed[:count]
+        self.color[index] = color[:count]
+        self.count += count
+
+    def remove(self, indices):
+        """Удаляет снаряды, сдвигая оставшиеся к началу массивов"""
+        n = self.count
+        keep = np.ones(n, dtype=bool)
+        keep[indices] = False
+        remaining = int(keep.sum())
+        self.state[:remaining] = self.state[:n][keep]
+        self.velocity[:remaining] = self.velocity[:n][keep]
+        self.color[:remaining] = self.color[:n][keep]
+        self.count = remaining
+
+    def collide_player(self, x, y, half_width, half_height):
+        """
+        Снаряды, попавшие в прямоугольник игрока, удаляются
+
+        Returns:
+            Количество попаданий
+        """
+        n = self.count
+        self.tested = 0
+        if not n:
+            return 0
+
+        # Дешевая проверка: прямоугольник игрока, расширенный на самый большой радиус
+        px = self.state[:n, 0]
+        py = self.state[:n, 1]
+        reach = self.max_radius
+        near = np.flatnonzero((np.abs(py - y) < half_height + reach) &
+                              (np.abs(px - x) < half_width + reach))
+        self.tested = int(near.size)
+        if not near.size:
+            return 0
+
+        # Точная проверка только для близких
+        hit = circle_vs_aabb(px[near], py[near], self.state[near, 2],
+                             x, y, half_width, half_height)
+        hits = near[hit]
+        if hits.size:
+            self.remove(hits)
+        return int(hits.size)
+
+    def snapshot(self, copy=True):
+        """
+        Живые снаряды для отрисовки: (состояние, цвета)
+
+        Args:
+            copy: Копировать массивы (для отрисовки из другого потока);
+                False - представления, действительные до следующего тика
+        """
+        n = self.count
+        if not copy:
+            return self.state[:n], self.color[:n]
+        return self.state[:n].copy(), self.color[:n].copy()
+
+    def draw(self, snapshot, scale=1.0):
+        """Рисует все снаряды одним вызовом"""
+        state, color = snapshot
+        if not len(state):
+            return
+
+        self.state_buffer.write(state)
+        self.color_buffer.write(color)
+        self.program["u_scale"] = scale
+        with self.ctx.enabled(self.ctx.PROGRAM_POINT_SIZE):
+            self.geometry.render(self.program, mode=self.ctx.POINTS, vertices=len(state))
+
+
+def load_fire_patterns(path):
+    """Загружает узоры стрельбы из JSON файла"""
+    if not os.path.exists(path):
+        return DEFAULT_FIRE_DATA
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        logger.info("Узоры стрельбы загружены из: %s (%d)", path, len(data['patterns']))
+        return data
+    except Exception as e:
+        logger.error("Ошибка загрузки узоров стрельбы %s: %s", path, e)
+        return DEFAULT_FIRE_DATA
@@ -4,48 +4,170 @@
 """
 
 import arcade
+import copy
+import threading
 import time
+import numpy as np
 import sqlite3
+from collections import deque
 from datetime import datetime
 from src.constants import *
 from src.player import Player
-from src.enemy import Enemy
-from src.asteroid import Asteroid
+from src.spawner import SpawnScheduler
+from src.levels import load_level
+from src.targeting import TargetIndex
+from src.collision import (entity_boxes, entity_circles, aabb_vs_aabb, circle_vs_aabb,
+                             sweep_aabb, sweep_aabb_circle)
+from src.particles import ParticleSystem
+from src.enemy_fire import EnemyFire
+from src.starfield import Starfield
+from src.input_state import InputState, SOLO_BINDINGS, COOP_BINDINGS, resolve_bindings
+from src.game_clock import GameClock
+from src.lifecycle import EntityManager, process_memory
+from src.render_target import RenderTarget
+from src.quality import QualityGovernor, QUALITY_LEVELS
+from src.overlays import HudOverlay, PlayerOverlay
+from src.assets import AssetManager
+from src.audio import AudioMixer
+from src.simulation import RenderSnapshot, SnapshotBuffer, SimulationThread
+from src.spectator import SpectatorServer
+from src.metrics import Metrics, MetricsExporter
+from src.log import get_logger, bind_context
+from src.leaks import LeakDetector
+from src.profiler import SamplingProfiler
+
+logger = get_logger("game")
+
 
 class GameWindow(arcade.Window):
     """
     Главное окно игры. Управляет всеми состояниями и логикой.
     """
 
-    def __init__(self):
-        """Инициализация игры с настройками из конфига"""
+    def __init__(self, clock=None, stats_db=STATS_DB):
+        """
+        Инициализация игры с настройками из конфига
+
+        Args:
+            clock: Игровые часы; для запуска без окна передаются часы
+                   в ручном режиме (GameClock(manual=True))
+            stats_db: Файл базы статистики игр (SQLite)
+        """
         super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+        self.stats_db = stats_db
+
+        # Единые игровые часы для игрока, появления врагов и статистики
+        self.clock = clock if clock is not None else GameClock()
+
+        # Частота игрового тика; столкновения пуль непрерывные,
+        # поэтому ее можно снижать без пролета пуль сквозь цели
+        self.set_update_rate(1 / UPDATE_RATE)
+
+        # Диагностика утечек: снимки памяти на каждой смене состояния
+        self.leaks = LeakDetector() if LEAK_CHECK else None
 
         # Состояния игры
         self.game_state = "MENU"  # MENU, PLAYING, GAME_OVER
         self.last_game_stats = None  # Статистика последней игры
 
-        # Игровые объекты
-        self.player = None
-        self.enemies = arcade.SpriteList()
-        self.asteroids = arcade.SpriteList()
-        self.bullets = arcade.SpriteList()
+        # Текстуры декодируются в фоне, пока открыто меню
+        self.assets = AssetManager(self.ctx)
+        self.assets.start()
+
+        # Звук: игровой код только ставит эффекты в очередь микшера
+        self.audio = AudioMixer(self.assets)
+        self.audio.play_music("theme")
+
+        # Игровые объекты: все игроки живут в одной симуляции
+        self.players = []
+        self.bindings = []  # Клавиши по игрокам (коды arcade.key)
+        self.entities = EntityManager()  # Владелец врагов и астероидов
+        self.enemies = self.entities["enemy"]  # Списки меняются только на месте
+        self.asteroids = self.entities["asteroid"]
+        self.targets = TargetIndex()  # Поиск целей для наведения выстрелов
 
         # Статистика текущей игры
         self.score = 0
         self.enemies_killed = 0
         self.asteroids_destroyed = 0
-        self.start_time = 0
         self.game_time = 0
         self.total_game_time = 0
 
-        # Таймеры
-        self.enemy_spawn_timer = 0
-        self.asteroid_spawn_timer = 0
-
-        # UI элементы меню
-        self.play_button = None
-        self.last_game_button = None
+        # Планировщик появления врагов и астероидов (из уровня, если он задан)
+        self.spawner = SpawnScheduler(level=load_level(LEVEL_FILE) if LEVEL_FILE else None)
+
+        # Эффекты взрывов и попаданий
+        self.particles = ParticleSystem(self.ctx)
+        self.hud = HudOverlay(self.ctx)
+        self.ship_overlays = {}  # Номер игрока -> PlayerOverlay, общие для всех игр
+
+        # Снаряды врагов - массивы, а не объекты
+        self.enemy_fire = EnemyFire(self.ctx)
+        self.starfield = Starfield(self.ctx, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Внутреннее разрешение сцены (растягивается на окно)
+        self.render_scale = 1.0
+        self.scene_target = None
+        self.set_render_scale(RENDER_SCALE)
+
+        # Автоматическое снижение качества при нехватке времени кадра
+        self.quality = QualityGovernor() if QUALITY_GOVERNOR else None
+        self.update_time = 0  # Длительность последнего игрового тика (сек)
+        self.draw_time = 0  # Длительность последней отрисовки (сек)
+        self.bullet_glow = True
+        self.player_overlays = True
+        self.apply_quality()
+
+        # Ввод опрашивается в игровом тике
+        self.input = InputState()
+        self.frame_rate = 0  # Длительность последнего кадра (сек)
+        self.last_flip_time = 0
+        self.frame_times = deque(maxlen=120)  # Для разброса времени кадра
+
+        # Отрисовка берет состояние только из опубликованных снимков;
+        # при THREADED_SIMULATION симуляция тикает в своем потоке
+        self.snapshots = SnapshotBuffer()
+        self.simulation = None
+        self.tick = 0
+
+        # Трансляция снимков зрителям по сети
+        self.spectators = None
+        if SPECTATOR_SERVER:
+            self.spectators = SpectatorServer()
+            self.spectators.start()
+
+        # Метрики производительности; экспорт - только если включен в конфиге
+        self.metrics = Metrics()
+        self.metrics_exporter = None
+        if METRICS_SERVER or METRICS_FILE:
+            self.metrics_exporter = MetricsExporter(
+                self.metrics, port=METRICS_PORT if METRICS_SERVER else None)
+            self.metrics_exporter.start()
+
+        # Профайлер по F9 или по медленному кадру; без записи потоков не держит
+        self.profiler = SamplingProfiler()
+        self.profiler_budget = PROFILER_BUDGET_MS / 1000
+
+        # Тик и счет в каждой записи журнала (считываются только при записи)
+        bind_context(lambda: {"tick": self.tick, "score": self.score})
+
+        # Отладочная информация (F3)
+        self.show_debug = False
+        self.debug_lines = []
+        self.debug_update_time = 0
+
+        # UI элементы меню: положение кнопок (x, y, ширина, высота)
+        self.play_button = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, 200, 60)
+        self.last_game_button = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, 300, 60)
+        self.menu_button = (SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.3, 250, 60)
+
+        # Статичные экраны (меню, конец игры) рисуются в текстуру только
+        # при изменениях, а в остальных кадрах она просто выводится
+        self.static_target = RenderTarget(self.ctx, (SCREEN_WIDTH, SCREEN_HEIGHT), "nearest")
+        self.static_dirty = True
+        self.static_state = None
+        self.static_drawn = 0.0  # Когда статичный экран последний раз выводился
+        self.skip_frame = False  # Кадр пропущен: нечего показывать заново
 
         # Загружаем статистику последней игры
         self.load_last_game_stats()
@@ -53,39 +175,68 @@ class GameWindow(arcade.Window):
         # Настраиваем игру
         arcade.set_background_color(arcade.color.BLACK)
 
-        print("✓ Игра инициализирована")
+        # В меню тик и отрисовка идут с пониженной частотой
+        self.set_idle(True)
+
+        logger.info("Игра инициализирована")
+        if self.leaks is not None:
+            self.leaks.transition(self.game_state)
 
     def setup(self):
         """Настройка новой игры"""
-        # Создаем игрока
-        self.player = Player()
+        # Поток прошлой игры не должен трогать новые объекты
+        self.stop_simulation()
+
+        # Запускаем игровое время с нуля
+        self.clock.reset()
+
+        # Создаем игроков; текстуры уже в кэше ресурсов
+        for player in self.players:
+            player.release_textures()
+        count = max(1, COOP_PLAYERS)
+        self.players = [Player(self.clock, self.assets, self.targets, slot=i,
+                               start_x=SCREEN_WIDTH * (i + 1) // (count + 1))
+                        for i in range(count)]
+        self.bindings = resolve_bindings(KEY_BINDINGS or (SOLO_BINDINGS if count == 1 else COOP_BINDINGS))
 
         # Очищаем списки объектов
-        self.enemies = arcade.SpriteList()
-        self.asteroids = arcade.SpriteList()
-        self.bullets = arcade.SpriteList()
+        self.entities.clear()
+        self.targets.rebuild((), ())
 
         # Сброс статистики
         self.score = 0
         self.enemies_killed = 0
         self.asteroids_destroyed = 0
-        self.start_time = time.time()
         self.game_time = 0
         self.total_game_time = 0
 
-        # Сброс таймеров
-        self.enemy_spawn_timer = 0
-        self.asteroid_spawn_timer = 0
+        # Сброс очереди появления и эффектов
+        self.spawner.reset()
+        self.enemy_fire.clear()
+        self.particles.clear()
+        self.input.reset()
+        # Интервал первого кадра включал бы время в меню
+        self.last_flip_time = 0
+
+        # Первый снимок - чтобы было что рисовать до первого тика
+        self.tick = 0
+        self.snapshots.clear()
+        self.publish_snapshot()
 
         # Устанавливаем состояние игры
-        self.game_state = "PLAYING"
+        self.set_game_state("PLAYING")
+        self.set_idle(False)
 
-        print("✓ Новая игра начата")
+        if THREADED_SIMULATION:
+            self.simulation = SimulationThread(self.simulation_step)
+            self.simulation.start()
+
+        logger.info("Новая игра начата")
 
     def load_last_game_stats(self):
         """Загружает статистику последней игры из базы данных"""
         try:
-            conn = sqlite3.connect("src/logs.db")
+            conn = sqlite3.connect(self.stats_db)
             cursor = conn.cursor()
 
             # Создаем таблицу если её нет
@@ -97,31 +248,54 @@ class GameWindow(arcade.Window):
                     enemies_killed INTEGER,
                     asteroids_destroyed INTEGER,
                     game_time REAL,
-                    total_time REAL
+                    total_time REAL,
+                    player INTEGER DEFAULT 1,
+                    players INTEGER DEFAULT 1,
+                    game_id INTEGER
                 )
             """)
 
-            # Получаем последнюю запись
+            # Старая таблица: строка на игру, без номера игрока и игры
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(game_logs)")}
+            for column in ("player", "players"):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE game_logs ADD COLUMN {column} INTEGER DEFAULT 1")
+            if "game_id" not in columns:
+                cursor.execute("ALTER TABLE game_logs ADD COLUMN game_id INTEGER")
+                # Старые строки одной игры можно узнать только по времени записи
+                cursor.execute("""
+                    UPDATE game_logs SET game_id = (
+                        SELECT MIN(id) FROM game_logs AS same WHERE same.timestamp = game_logs.timestamp
+                    )
+                """)
+            conn.commit()
+
+            # Последняя игра: по строке на игрока с одним номером игры
             cursor.execute("""
-                SELECT * FROM game_logs 
-                ORDER BY timestamp DESC 
-                LIMIT 1
+                SELECT id, timestamp, score, enemies_killed, asteroids_destroyed,
+                       game_time, total_time, player
+                FROM game_logs
+                WHERE game_id = (SELECT MAX(game_id) FROM game_logs)
+                ORDER BY player
             """)
 
-            result = cursor.fetchone()
-            if result:
+            rows = cursor.fetchall()
+            if rows:
+                result = rows[0]
                 self.last_game_stats = {
                     "id": result[0],
                     "timestamp": result[1],
-                    "score": result[2],
-                    "enemies_killed": result[3],
-                    "asteroids_destroyed": result[4],
+                    "score": sum(row[2] for row in rows),
+                    "enemies_killed": sum(row[3] for row in rows),
+                    "asteroids_destroyed": sum(row[4] for row in rows),
                     "game_time": result[5],
-                    "total_time": result[6]
+                    "total_time": result[6],
+                    "player_scores": [row[2] for row in rows]
                 }
-                print(f"✓ Загружена статистика последней игры: {self.last_game_stats['score']} очков")
+                logger.info("Загружена статистика последней игры: %d очков",
+                            self.last_game_stats['score'])
             else:
-                print("⚠ Нет записей о предыдущих играх")
+                logger.warning("Нет записей о предыдущих играх")
                 self.last_game_stats = {
                     "score": 0,
                     "enemies_killed": 0,
@@ -131,7 +305,7 @@ class GameWindow(arcade.Window):
 
             conn.close()
         except Exception as e:
-            print(f"✗ Ошибка загрузки статистики: {e}")
+            logger.error("Ошибка загрузки статистики: %s", e)
             self.last_game_stats = {
                 "score": 0,
                 "enemies_killed": 0,
@@ -139,43 +313,105 @@ class GameWindow(arcade.Window):
                 "timestamp": "Ошибка загрузки"
             }
 
+        # Статистика на экране меню изменилась
+        self.request_redraw()
+
     def save_game_stats(self):
         """Сохраняет статистику текущей игры в базу данных"""
         try:
-            conn = sqlite3.connect("src/logs.db")
+            write_start = time.perf_counter()
+            conn = sqlite3.connect(self.stats_db)
             cursor = conn.cursor()
 
-            # Вставляем новую запись
-            cursor.execute("""
+            # По записи на игрока с общим номером игры (время записи - с точностью до секунды)
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cursor.execute("SELECT COALESCE(MAX(game_id), 0) + 1 FROM game_logs")
+            game_id, = cursor.fetchone()
+            cursor.executemany("""
                 INSERT INTO game_logs 
-                (timestamp, score, enemies_killed, asteroids_destroyed, game_time, total_time)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                self.score,
-                self.enemies_killed,
-                self.asteroids_destroyed,
+                (timestamp, score, enemies_killed, asteroids_destroyed, game_time, total_time,
+                 player, players, game_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                timestamp,
+                player.score,
+                player.enemies_killed,
+                player.asteroids_destroyed,
                 self.game_time,
-                self.total_game_time
-            ))
+                self.total_game_time,
+                player.slot + 1,
+                len(self.players),
+                game_id
+            ) for player in self.players])
 
             conn.commit()
             conn.close()
+            self.metrics.db_write_seconds.observe(time.perf_counter() - write_start)
 
-            print(f"✓ Статистика сохранена: {self.score} очков, {self.enemies_killed} врагов")
+            logger.info("Статистика сохранена: %d очков, %d врагов", self.score, self.enemies_killed)
         except Exception as e:
-            print(f"✗ Ошибка сохранения статистики: {e}")
+            logger.error("Ошибка сохранения статистики: %s", e)
 
     def on_draw(self):
         """Отрисовка игры в зависимости от состояния"""
+        draw_start = time.perf_counter()
+
+        # Цикл pyglet вызывает отрисовку с полной частотой; неизменный
+        # статичный экран показываем заново только с частотой IDLE_FPS
+        self.skip_frame = (self.game_state != "PLAYING" and not self.static_dirty and
+                           self.static_state == self.game_state and
+                           draw_start - self.static_drawn < 1 / IDLE_FPS)
+        if self.skip_frame:
+            return
+
         arcade.start_render()
 
-        if self.game_state == "MENU":
-            self.draw_menu()
-        elif self.game_state == "PLAYING":
+        if self.game_state == "PLAYING":
             self.draw_game()
-        elif self.game_state == "GAME_OVER":
-            self.draw_game_over()
+        else:
+            self.draw_static_screen()
+
+        self.draw_time = time.perf_counter() - draw_start
+
+    def draw_static_screen(self):
+        """Выводит меню или экран конца игры, перерисовывая их только при изменениях"""
+        if self.static_dirty or self.static_state != self.game_state:
+            with self.static_target.activate():
+                self.static_target.clear()
+                if self.game_state == "MENU":
+                    self.draw_menu()
+                elif self.game_state == "GAME_OVER":
+                    self.draw_game_over()
+
+            self.static_dirty = False
+            self.static_state = self.game_state
+
+        self.static_target.draw()
+        self.static_drawn = time.perf_counter()
+
+    def request_redraw(self):
+        """Помечает статичный экран для перерисовки в ближайшем кадре"""
+        self.static_dirty = True
+
+    def set_idle(self, idle):
+        """Переключает частоту игрового тика между игрой и статичными экранами"""
+        self.set_update_rate(1 / (IDLE_FPS if idle else UPDATE_RATE))
+        if idle:
+            self.request_redraw()
+
+    def on_resize(self, width, height):
+        """Изменение размера окна"""
+        super().on_resize(width, height)
+        self.request_redraw()
+
+    def apply_quality(self):
+        """Применяет настройки текущего уровня качества"""
+        settings = self.quality.settings if self.quality else QUALITY_LEVELS[0]
+
+        self.bullet_glow = settings["bullet_glow"]
+        self.player_overlays = settings["player_overlays"]
+        self.particles.emission_scale = settings["particle_scale"]
+        self.set_render_scale(min(RENDER_SCALE, settings["render_scale"]))
 
     def draw_menu(self):
         """Отрисовка главного меню"""
@@ -197,10 +433,7 @@ class GameWindow(arcade.Window):
         )
 
         # Кнопка "Играть"
-        play_x = SCREEN_WIDTH // 2
-        play_y = SCREEN_HEIGHT // 2 + 50
-        play_width = 200
-        play_height = 60
+        play_x, play_y, play_width, play_height = self.play_button
 
         arcade.draw_rectangle_filled(
             play_x, play_y,
@@ -219,13 +452,9 @@ class GameWindow(arcade.Window):
             anchor_x="center", anchor_y="center",
             bold=True
         )
-        self.play_button = (play_x, play_y, play_width, play_height)
 
         # Кнопка "Предыдущая игра"
-        last_x = SCREEN_WIDTH // 2
-        last_y = SCREEN_HEIGHT // 2 - 50
-        last_width = 300
-        last_height = 60
+        last_x, last_y, last_width, last_height = self.last_game_button
 
         arcade.draw_rectangle_filled(
             last_x, last_y,
@@ -243,7 +472,6 @@ class GameWindow(arcade.Window):
             arcade.color.WHITE, 24,
             anchor_x="center", anchor_y="center"
         )
-        self.last_game_button = (last_x, last_y, last_width, last_height)
 
         # Информация о последней игре
         if self.last_game_stats:
@@ -256,8 +484,12 @@ class GameWindow(arcade.Window):
                 anchor_x="center", anchor_y="center"
             )
 
+            scores = self.last_game_stats.get("player_scores", [])
+            per_player = ""
+            if len(scores) > 1:
+                per_player = " (" + " / ".join(f"P{i + 1}: {score}" for i, score in enumerate(scores)) + ")"
             arcade.draw_text(
-                f"Очки: {self.last_game_stats['score']}",
+                f"Очки: {self.last_game_stats['score']}{per_player}",
                 SCREEN_WIDTH // 2, info_y - 30,
                 arcade.color.WHITE, 18,
                 anchor_x="center", anchor_y="center"
@@ -278,31 +510,97 @@ class GameWindow(arcade.Window):
                     anchor_x="center", anchor_y="center"
                 )
 
+    def set_render_scale(self, scale):
+        """
+        Задает внутреннее разрешение сцены как долю от размера окна.
+        При scale < 1 сцена рисуется во внеэкранную текстуру.
+        """
+        scale = min(max(scale, 0.25), 1.0)
+        if scale == self.render_scale and (self.scene_target is not None) == (scale < 1.0):
+            return
+
+        self.render_scale = scale
+        if scale < 1.0:
+            size = (max(1, int(SCREEN_WIDTH * scale)), max(1, int(SCREEN_HEIGHT * scale)))
+            self.scene_target = RenderTarget(self.ctx, size, RENDER_FILTER)
+        else:
+            self.scene_target = None
+
     def draw_game(self):
-        """Отрисовка игрового процесса"""
+        """Отрисовка игрового процесса из последнего снимка состояния"""
+        snapshot = self.snapshots.front
+        if snapshot is None:
+            return
+
+        if self.scene_target is None:
+            self.draw_scene(snapshot)
+            self.draw_hud(snapshot)
+            return
+
+        # Сцена рисуется в уменьшенную текстуру и растягивается на окно
+        with self.scene_target.activate():
+            self.scene_target.clear()
+            self.draw_scene(snapshot)
+            if not HUD_NATIVE_RESOLUTION:
+                self.draw_hud(snapshot)
+        self.scene_target.draw()
+
+        # Интерфейс остается четким в родном разрешении окна
+        if HUD_NATIVE_RESOLUTION:
+            self.draw_hud(snapshot)
+
+    def ship_overlay(self, slot):
+        """Индикаторы игрока по номеру: шейдер и буферы создаются один раз на окно"""
+        overlay = self.ship_overlays.get(slot)
+        if overlay is None:
+            overlay = self.ship_overlays[slot] = PlayerOverlay(self.ctx)
+        return overlay
+
+    def draw_scene(self, snapshot):
+        """Рисует игровую сцену: фон, объекты и эффекты"""
         # Рисуем фон (звездное небо)
-        self.draw_background()
+        self.draw_background(snapshot.game_time)
+
+        # Рисуем игровые объекты (выбывших игроков не рисуем)
+        for state in snapshot.players:
+            if state.hp > 0 and state.slot < len(self.players):
+                self.players[state.slot].draw(self.ship_overlay(state.slot),
+                                              self.player_overlays, state)
 
-        # Рисуем игровые объекты
-        if self.player:
-            self.player.draw()
+        for enemy in snapshot.enemies:
+            enemy.draw()
+        for asteroid in snapshot.asteroids:
+            asteroid.draw()
 
-        self.enemies.draw()
-        self.asteroids.draw()
+        # Рисуем пули игрока и снаряды врагов
+        for bullet in snapshot.bullets:
+            bullet.draw(self.bullet_glow)
+        self.enemy_fire.draw(snapshot.projectiles, self.render_scale)
 
-        # Рисуем пули игрока
-        for bullet in self.player.bullets:
-            bullet.draw()
+        # Эффекты
+        self.particles.draw(self.render_scale, snapshot.particles)
 
-        # Рисуем интерфейс внизу
-        self.draw_game_ui()
+    def draw_hud(self, snapshot):
+        """Рисует интерфейс поверх сцены"""
+        # Панель внизу и статистика вверху - постоянные пакеты геометрии и подписей
+        fps = 1 / self.frame_rate if self.frame_rate > 0 else 0
+        self.hud.draw(snapshot, fps, self.input.get_latency_info()["average_ms"])
 
-        # Рисуем статистику вверху
-        self.draw_game_stats()
+        if self.show_debug:
+            self.draw_debug_info(snapshot)
+
+        if snapshot.paused:
+            arcade.draw_text(
+                "ПАУЗА",
+                SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2,
+                arcade.color.WHITE, 48,
+                anchor_x="center", anchor_y="center",
+                bold=True
+            )
 
-    def draw_background(self):
+    def draw_background(self, game_time):
         """Рисует звездный фон"""
-        # Здесь можно добавить звезды, но пока просто градиент
+        # Градиент неба
         arcade.draw_lrtb_rectangle_filled(
             0, SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_HEIGHT * 0.7,
             (10, 10, 40)  # Темно-синий сверху
@@ -312,150 +610,99 @@ class GameWindow(arcade.Window):
             (20, 20, 50)  # Более светлый снизу
         )
 
-    def draw_game_ui(self):
-        """Рисует игровой интерфейс внизу экрана"""
-        ui_height = 80
-        ui_y = ui_height // 2
-
-        # Фон интерфейса
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH // 2, ui_y,
-            SCREEN_WIDTH, ui_height,
-            (30, 30, 60, 200)
-        )
-
-        if self.player:
-            # 1. HP игрока
-            hp_x = 100
-            hp_text = f"HP: {self.player.hp}/{self.player.max_hp}"
-            arcade.draw_text(
-                hp_text, hp_x, ui_y,
-                arcade.color.WHITE, 20,
-                anchor_x="center", anchor_y="center"
-            )
-
-            # Полоска HP
-            hp_bar_width = 150
-            hp_bar_height = 15
-            hp_percent = self.player.hp / self.player.max_hp
-
-            arcade.draw_rectangle_filled(
-                hp_x, ui_y - 25,
-                hp_bar_width, hp_bar_height,
-                (50, 50, 50)
-            )
-
-            hp_color = (
-                int(255 * (1 - hp_percent)),  # Красный при малом HP
-                int(255 * hp_percent),       # Зеленый при полном HP
-                50
-            )
-
-            arcade.draw_rectangle_filled(
-                hp_x - hp_bar_width//2 + (hp_bar_width * hp_percent)//2,
-                ui_y - 25,
-                hp_bar_width * hp_percent, hp_bar_height,
-                hp_color
-            )
-
-            # 2. Уровень перегрева
-            heat_x = SCREEN_WIDTH // 4
-            heat_text = f"Перегрев: {int(self.player.heat)}%"
-            arcade.draw_text(
-                heat_text, heat_x, ui_y,
-                arcade.color.WHITE, 20,
-                anchor_x="center", anchor_y="center"
-            )
-
-            # Полоска перегрева
-            heat_bar_width = 150
-            heat_bar_height = 15
-
-            arcade.draw_rectangle_filled(
-                heat_x, ui_y - 25,
-                heat_bar_width, heat_bar_height,
-                (50, 50, 50)
+        # Звезды прокручиваются в шейдере по игровому времени
+        self.starfield.draw(game_time, self.render_scale)
+
+    def draw_debug_info(self, snapshot):
+        """Рисует отладочную информацию: количество объектов и память"""
+        # Пересчитываем не чаще двух раз в секунду
+        now = time.perf_counter()
+        if now - self.debug_update_time > 0.5:
+            self.debug_update_time = now
+            self.debug_lines = list(snapshot.debug or ()) + self.get_debug_lines()
+
+        y = SCREEN_HEIGHT - 130
+        for line in self.debug_lines:
+            arcade.draw_text(line, 20, y, arcade.color.LIGHT_GREEN, 12)
+            y -= 18
+
+    def get_simulation_debug_lines(self):
+        """Строки отладки о состоянии симуляции (вызывается в ее потоке)"""
+        counts = self.entities.counts()
+        memory = self.entities.memory_usage()
+
+        lines = []
+        for kind, count in counts.items():
+            cap = self.entities.caps.get(kind, "-")
+            lines.append(
+                f"{kind}: {count}/{cap}  "
+                f"создано {self.entities.created[kind]}, "
+                f"удалено {self.entities.destroyed[kind] + self.entities.culled[kind]}, "
+                f"{memory[kind] / 1024:.1f} КБ"
             )
 
-            heat_color = (
-                255,  # Красный
-                int(255 * (1 - self.player.heat / 100)),  # Меньше зеленого при нагреве
-                50
+        if self.players:
+            lines.append(f"bullet: {sum(len(player.bullets) for player in self.players)}")
+        lines.append(f"enemy projectiles: {self.enemy_fire.count}/{self.enemy_fire.capacity}"
+                     f" (пропущено {self.enemy_fire.dropped})")
+        lines.append(f"particles: {self.particles.live_count}/{self.particles.capacity}")
+        level = self.spawner.level
+        if level is not None:
+            lines.append(f"Уровень: {level.name}, {level.cursor}/{len(level)} появлений, "
+                         f"в очереди {len(self.spawner)}")
+        lines.append(f"Поиск целей: {len(self.targets)} в сетке, {self.targets.queries} запросов, "
+                     f"просмотрено {self.targets.candidates}")
+
+        if self.simulation is not None:
+            lines.append(f"Симуляция: отдельный поток, тик "
+                         f"{self.simulation.average_tick_time() * 1000:.1f} мс")
+        else:
+            lines.append(f"Симуляция: в цикле окна, тик {self.update_time * 1000:.1f} мс")
+        return lines
+
+    def get_debug_lines(self):
+        """Собирает строки отладочной информации главного потока"""
+        lines = []
+
+        if self.quality:
+            lines.append(
+                f"Качество: {self.quality.settings['name']} "
+                f"({self.quality.average_frame_time() * 1000:.1f} мс, "
+                f"бюджет {self.quality.budget * 1000:.1f} мс)"
             )
+        lines.append(f"Масштаб сцены: {int(self.render_scale * 100)}%")
 
-            arcade.draw_rectangle_filled(
-                heat_x - heat_bar_width//2 + (heat_bar_width * self.player.heat / 100)//2,
-                ui_y - 25,
-                heat_bar_width * self.player.heat / 100, heat_bar_height,
-                heat_color
-            )
+        if self.frame_times:
+            frame_times = np.array(self.frame_times) * 1000
+            lines.append(f"Кадр: {frame_times.mean():.1f} ± {frame_times.std():.2f} мс")
 
-            # 3. Время игры
-            time_x = SCREEN_WIDTH // 2 + 100
-            time_text = f"Время: {self.game_time:.1f}с"
-            arcade.draw_text(
-                time_text, time_x, ui_y,
-                arcade.color.WHITE, 20,
-                anchor_x="center", anchor_y="center"
-            )
-
-            # 4. Время до супер выстрела
-            super_x = SCREEN_WIDTH - 150
-            if self.player.super_shot_ready:
-                super_text = "СУПЕР ГОТОВ!"
-                super_color = arcade.color.GREEN
-            else:
-                super_text = f"Супер: {int(self.player.super_shot_charge)}%"
-                super_color = arcade.color.YELLOW
-
-            arcade.draw_text(
-                super_text, super_x, ui_y,
-                super_color, 20,
-                anchor_x="center", anchor_y="center"
-            )
+        lines.append(f"Звук: голосов {self.audio.active_voices()}/{len(self.audio.voices)}, "
+                     f"вытеснено {self.audio.stolen}, пропущено {self.audio.dropped}")
 
-            # Круговая шкала для супер выстрела
-            if not self.player.super_shot_ready:
-                radius = 15
-                arcade.draw_circle_outline(
-                    super_x, ui_y - 25,
-                    radius, arcade.color.YELLOW, 2
-                )
-                arcade.draw_arc_filled(
-                    super_x, ui_y - 25, radius,
-                    (100, 200, 255),
-                    0, 360 * (self.player.super_shot_charge / 100)
-                )
+        if self.spectators is not None:
+            stats = self.spectators.stats()
+            lines.append(f"Зрители: {stats['spectators']}, {stats['bytes_per_spectator']:.0f} Б/кадр "
+                         f"на зрителя, сервер {stats['tick_ms']:.2f} мс/кадр, "
+                         f"пропущено {stats['skipped']}")
 
-    def draw_game_stats(self):
-        """Рисует статистику вверху экрана"""
-        # Счет
-        arcade.draw_text(
-            f"СЧЕТ: {self.score}",
-            20, SCREEN_HEIGHT - 30,
-            arcade.color.WHITE, 24
-        )
+        if self.profiler.running:
+            lines.append(f"Профайлер: запись, {self.profiler.samples} снятий")
+        elif self.profiler.last_path:
+            lines.append(f"Профайлер: {self.profiler.last_path}")
 
-        # Убито врагов
-        arcade.draw_text(
-            f"ВРАГОВ: {self.enemies_killed}",
-            20, SCREEN_HEIGHT - 60,
-            arcade.color.LIGHT_GRAY, 18
-        )
+        exporter = self.metrics_exporter
+        if exporter is not None and exporter.port is not None:
+            lines.append(f"Метрики: http://{exporter.host}:{exporter.port}/metrics, "
+                         f"тиков {self.metrics.ticks.values.get(None, 0)}")
 
-        # Уничтожено астероидов
-        arcade.draw_text(
-            f"АСТЕРОИДОВ: {self.asteroids_destroyed}",
-            20, SCREEN_HEIGHT - 90,
-            arcade.color.LIGHT_GRAY, 18
-        )
+        timings = self.assets.get_timings()
+        lines.append(f"Ресурсы: {len(timings)} шт., загрузка {self.assets.total_time * 1000:.1f} мс, "
+                     f"декодирование {sum(timings.values()):.1f} мс")
 
-        # FPS (для отладки)
-        arcade.draw_text(
-            f"FPS: {int(1/self.frame_rate if self.frame_rate > 0 else 0)}",
-            SCREEN_WIDTH - 100, SCREEN_HEIGHT - 30,
-            arcade.color.GRAY, 16
-        )
+        rss = process_memory()
+        if rss is not None:
+            lines.append(f"Память процесса: {rss / 1024 / 1024:.1f} МБ")
+        return lines
 
     def draw_game_over(self):
         """Отрисовка экрана окончания игры"""
@@ -507,10 +754,7 @@ class GameWindow(arcade.Window):
         )
 
         # Кнопка "В меню"
-        menu_x = SCREEN_WIDTH // 2
-        menu_y = SCREEN_HEIGHT * 0.3
-        menu_width = 250
-        menu_height = 60
+        menu_x, menu_y, menu_width, menu_height = self.menu_button
 
         arcade.draw_rectangle_filled(
             menu_x, menu_y,
@@ -528,126 +772,398 @@ class GameWindow(arcade.Window):
             arcade.color.WHITE, 24,
             anchor_x="center", anchor_y="center"
         )
-        self.menu_button = (menu_x, menu_y, menu_width, menu_height)
 
     def on_update(self, delta_time):
         """Обновление игровой логики"""
-        if self.game_state == "PLAYING":
+        # Запускаем звуки, поставленные в очередь с прошлого тика
+        self.audio.update()
+
+        if self.game_state != "PLAYING":
+            # Принимаем ресурсы, декодированные в фоне
+            if not self.assets.ready:
+                self.assets.poll()
+            return
+
+        if self.simulation is not None:
+            # Симуляция идет в своем потоке; здесь только завершение игры
+            if self.simulation.game_over:
+                self.stop_simulation()
+                self.end_game()
+            return
+
+        update_start = time.perf_counter()
+        self.simulation_step(delta_time)
+        self.update_time = time.perf_counter() - update_start
+
+    def simulation_step(self, delta_time):
+        """Один тик симуляции и публикация снимка для отрисовки"""
+        step_start = time.perf_counter()
+
+        # Шаг игрового времени: с учетом паузы и масштаба
+        delta_time = self.clock.update(delta_time)
+        if not self.clock.paused:
             self.update_game(delta_time)
 
+        self.publish_snapshot()
+        self.metrics.ticks.inc()
+        self.metrics.update_seconds.observe(time.perf_counter() - step_start)
+
+    def publish_snapshot(self):
+        """Публикует снимок отрисовываемого состояния"""
+        self.tick += 1
+        front = self.snapshots.front
+        if (self.clock.paused and front is not None and front.paused and
+                (front.debug is not None) == self.show_debug):
+            # На паузе ничего не меняется - снимок прошлого тика остается в силе
+            if self.spectators is not None:
+                self.spectators.publish(front)
+            return
+
+        # Копии нужны, только если снимок читает другой поток, пока симуляция
+        # меняет оригиналы; в цикле окна отрисовка идет сразу после тика
+        shared = THREADED_SIMULATION or self.spectators is not None
+        players = self.players
+        bullets = (bullet for player in players for bullet in player.bullets)
+        if shared:
+            enemies = tuple(copy.copy(enemy) for enemy in self.enemies)
+            asteroids = tuple(copy.copy(asteroid) for asteroid in self.asteroids)
+            bullets = tuple(copy.copy(bullet) for bullet in bullets)
+        else:
+            enemies = self.enemies
+            asteroids = self.asteroids
+            bullets = tuple(bullets)
+
+        debug = None
+        if self.show_debug:
+            # Считаются в потоке симуляции, обновляются дважды в секунду
+            debug = front.debug if front is not None else None
+            if debug is None or self.tick % max(1, UPDATE_RATE // 2) == 0:
+                debug = tuple(self.get_simulation_debug_lines())
+
+        snapshot = RenderSnapshot(
+            tick=self.tick,
+            game_time=self.game_time,
+            paused=self.clock.paused,
+            score=self.score,
+            enemies_killed=self.enemies_killed,
+            asteroids_destroyed=self.asteroids_destroyed,
+            players=tuple(player.get_render_state() for player in players),
+            enemies=enemies,
+            asteroids=asteroids,
+            bullets=bullets,
+            projectiles=self.enemy_fire.snapshot(copy=shared),
+            particles=self.particles.snapshot(copy=shared),
+            debug=debug,
+        )
+        self.snapshots.publish(snapshot)
+        if self.spectators is not None:
+            self.spectators.publish(snapshot)
+
+    def stop_simulation(self):
+        """Останавливает поток симуляции и дожидается конца тика"""
+        if self.simulation is None:
+            return
+        self.simulation.stop()
+        self.simulation.join()
+        self.simulation = None
+
     def update_game(self, delta_time):
         """Обновление игрового процесса"""
         # Обновляем время игры
-        self.game_time = time.time() - self.start_time
+        self.game_time = self.clock.time
         self.total_game_time = self.game_time
 
-        # Обновляем игрока
-        if self.player:
-            self.player.update(delta_time)
+        # Применяем ввод, накопленный с прошлого тика
+        self.handle_input(delta_time)
 
-            # Проверяем смерть игрока
-            if not self.player.is_alive:
-                self.end_game()
-                return
-
-        # Генерация врагов
-        self.enemy_spawn_timer += delta_time
-        if self.enemy_spawn_timer >= 1.0 / ENEMY_SPAWN_RATE:
-            enemy = Enemy()
-            self.enemies.append(enemy)
-            self.enemy_spawn_timer = 0
-
-        # Генерация астероидов
-        self.asteroid_spawn_timer += delta_time
-        if self.asteroid_spawn_timer >= 1.0 / ASTEROID_SPAWN_RATE:
-            asteroid = Asteroid()
-            self.asteroids.append(asteroid)
-            self.asteroid_spawn_timer = 0
-
-        # Обновление врагов и астероидов
-        self.enemies.update()
-        self.asteroids.update()
-
-        # Удаление объектов вышедших за экран
-        for enemy in self.enemies:
-            if enemy.bottom > SCREEN_HEIGHT + 50:
-                enemy.remove_from_sprite_lists()
-
-        for asteroid in self.asteroids:
-            if asteroid.bottom > SCREEN_HEIGHT + 50:
-                asteroid.remove_from_sprite_lists()
+        # Обновляем игроков; игра идет, пока жив хоть один
+        players = self.living_players()
+        for player in players:
+            player.update(delta_time)
+        if not players:
+            self.end_game()
+            return
+
+        # Генерация врагов и астероидов: все события, наступившие к этому тику
+        self.spawner.update(self.game_time, self.entities)
+
+        # Обновление врагов и астероидов и удаление вышедших за границы мира
+        self.entities.update(delta_time, self.game_time)
+
+        # Сетка целей на этот тик и самонаведение пуль по ней
+        self.targets.rebuild(self.enemies, self.asteroids)
+        for player in self.players:
+            player.steer_bullets(delta_time)
+
+        # Выстрелы врагов и движение их снарядов
+        self.enemy_fire.update(self.game_time, delta_time, self.enemies, players)
+
+        self.particles.update(delta_time)
 
         # Проверка коллизий
         self.check_collisions()
 
+        for kind, count in self.entities.counts().items():
+            self.metrics.entities.set(count, kind)
+        self.metrics.entities.set(sum(len(player.bullets) for player in self.players), "bullet")
+        self.metrics.entities.set(self.enemy_fire.count, "enemy_projectile")
+        self.metrics.entities.set(self.particles.live_count, "particle")
+
+    def living_players(self):
+        """Игроки, которые еще в игре"""
+        return [player for player in self.players if player.is_alive]
+
     def check_collisions(self):
         """Проверка всех столкновений в игре"""
-        if not self.player:
+        if not self.living_players():
             return
 
-        # 1. Столкновения пуль с врагами
-        for bullet in self.player.bullets[:]:
-            # С врагами
-            hit_list = arcade.check_for_collision_with_list(bullet, self.enemies)
-            for enemy in hit_list:
-                bullet.remove_from_sprite_lists()
-                enemy.remove_from_sprite_lists()
+        # 1. Столкновения пуль с врагами и астероидами
+        self.check_bullet_collisions()
+
+        # 2-3. Столкновения игрока с врагами и астероидами
+        self.check_player_collisions()
+
+    def check_bullet_collisions(self):
+        """
+        Пули против врагов (прямоугольники) и астероидов (круги).
+        Вся матрица "пули x цели" проверяется пакетно по пути пули за тик,
+        каждая пуля поражает самую раннюю цель на своем пути.
+        Пули всех игроков идут одним пакетом; очки получает владелец пули.
+        """
+        owners = [(player, bullet) for player in self.players for bullet in player.bullets
+                  if bullet.active]
+        bullets = [bullet for _, bullet in owners]
+        targets = [("enemy", enemy) for enemy in self.enemies]
+        targets += [("asteroid", asteroid) for asteroid in self.asteroids]
+        if not bullets or not targets:
+            return
+        self.metrics.collision_pairs.inc(len(bullets) * len(targets), "bullet")
+
+        # Пути пуль - столбцы (B, 1), цели - строки (1, N)
+        path = np.array([(bullet.prev_x, bullet.prev_y, bullet.center_x, bullet.center_y,
+                          bullet.width / 2, bullet.height / 2) for bullet in bullets])
+        x0, y0, x1, y1, half_width, half_height = (column[:, None] for column in path.T)
+
+        hit_times = []
+        if self.enemies:
+            ex, ey, e_half_width, e_half_height = entity_boxes(self.enemies)
+            hit_times.append(sweep_aabb(x0, y0, x1, y1, half_width, half_height,
+                                        ex, ey, e_half_width, e_half_height))
+        if self.asteroids:
+            ax, ay, a_radius = entity_circles(self.asteroids)
+            hit_times.append(sweep_aabb_circle(x0, y0, x1, y1, half_width, half_height,
+                                               ax, ay, a_radius))
+        hit_times = np.concatenate(hit_times, axis=1)
+
+        for i in np.flatnonzero(np.isfinite(hit_times).any(axis=1)):
+            j = int(np.argmin(hit_times[i]))
+            if not np.isfinite(hit_times[i, j]):
+                continue  # Все цели этой пули уже уничтожены другими пулями
+
+            owner, bullet = owners[i]
+            kind, target = targets[j]
+            damage = bullet.on_hit()
+
+            if kind == "enemy":
+                self.entities.destroy("enemy", target)
+                self.particles.emit("enemy_kill", target.center_x, target.center_y)
+                self.audio.play("explosion")
                 self.score += 10
                 self.enemies_killed += 1
-
-            # С астероидами
-            hit_list = arcade.check_for_collision_with_list(bullet, self.asteroids)
-            for asteroid in hit_list:
-                bullet.remove_from_sprite_lists()
-                asteroid.take_damage(1)
-                if asteroid.hp <= 0:
-                    asteroid.remove_from_sprite_lists()
+                owner.score += 10
+                owner.enemies_killed += 1
+                hit_times[:, j] = np.inf
+            else:
+                target.take_damage(damage)
+                if target.hp <= 0:
+                    self.entities.destroy("asteroid", target)
+                    self.particles.emit("asteroid_destroyed", target.center_x, target.center_y)
+                    self.audio.play("explosion")
                     self.score += 20
                     self.asteroids_destroyed += 1
-
-        # 2. Столкновения игрока с врагами
-        hit_list = arcade.check_for_collision_with_list(self.player, self.enemies)
-        for enemy in hit_list:
-            enemy.remove_from_sprite_lists()
-            if self.player.take_damage(1):
-                # Игрок умер
-                self.end_game()
-                return
-
-        # 3. Столкновения игрока с астероидами
-        hit_list = arcade.check_for_collision_with_list(self.player, self.asteroids)
-        for asteroid in hit_list:
-            asteroid.remove_from_sprite_lists()
-            if self.player.take_damage(2):  # Астероид наносит больше урона
-                self.end_game()
-                return
+                    owner.score += 20
+                    owner.asteroids_destroyed += 1
+                    hit_times[:, j] = np.inf
+                else:
+                    self.particles.emit("asteroid_hit", bullet.center_x, bullet.center_y)
+                    self.audio.play("hit")
+
+    def check_player_collisions(self):
+        """
+        Игроки против врагов (AABB), астероидов (круг против AABB) и снарядов врагов.
+        Все игроки проверяются одним пакетом: игроки - столбцы (P, 1), цели - строки (1, N).
+        """
+        players = self.living_players()
+        boxes = np.array([(player.center_x, player.center_y, player.width / 2, player.height / 2)
+                          for player in players])
+        px, py, p_half_width, p_half_height = (column[:, None] for column in boxes.T)
+        self.metrics.collision_pairs.inc(len(players) * (len(self.enemies) + len(self.asteroids)),
+                                         "player")
+
+        hits = []
+        if self.enemies:
+            mask = aabb_vs_aabb(px, py, p_half_width, p_half_height, *entity_boxes(self.enemies))
+            hits += [(players[p], "enemy", self.enemies[i], 1) for p, i in zip(*np.nonzero(mask))]
+        if self.asteroids:
+            ax, ay, a_radius = entity_circles(self.asteroids)
+            mask = circle_vs_aabb(ax, ay, a_radius, px, py, p_half_width, p_half_height)
+            # Астероид наносит больше урона
+            hits += [(players[p], "asteroid", self.asteroids[i], 2) for p, i in zip(*np.nonzero(mask))]
+
+        destroyed = set()  # Объект, задевший двух игроков, уничтожается один раз
+        for player, kind, target, damage in hits:
+            if id(target) in destroyed or not player.is_alive:
+                continue
+            destroyed.add(id(target))
+            self.entities.destroy(kind, target)
+            self.particles.emit("player_hit", player.center_x, player.center_y)
+            self.audio.play("player_hit")
+            player.take_damage(damage)
+
+        # Снаряды врагов: все попавшие за тик снаряды - одно попадание
+        for player in players:
+            if not player.is_alive:
+                continue
+            hit = self.enemy_fire.collide_player(
+                player.center_x, player.center_y, player.width / 2, player.height / 2)
+            # Пары - только снаряды, дошедшие до точной проверки
+            self.metrics.collision_pairs.inc(self.enemy_fire.tested, "projectile")
+            if hit:
+                self.particles.emit("player_hit", player.center_x, player.center_y)
+                self.audio.play("player_hit")
+                player.take_damage(1)
+
+        # Игра заканчивается, когда выбыли все игроки
+        if not self.living_players():
+            self.end_game()
+
+    def handle_input(self, delta_time):
+        """Опрашивает состояние клавиш и управляет кораблями по привязкам игроков"""
+        self.input.sample()
+
+        for player, keys in zip(self.players, self.bindings):
+            if not player.is_alive:
+                continue
+
+            # Плавное движение, пока клавиша удерживается
+            direction = 0
+            if self.input.is_held(*keys.get("left", ())):
+                direction -= 1
+            if self.input.is_held(*keys.get("right", ())):
+                direction += 1
+            if direction:
+                player.move(direction, delta_time)
+
+            # Автоогонь при удержании (частоту ограничивает КД выстрела)
+            if self.input.is_held(*keys.get("shoot", ())) or self.input.was_pressed(*keys.get("shoot", ())):
+                if player.shoot():
+                    self.metrics.bullets_fired.inc(label="normal")
+                    self.audio.play("shot")
+
+            if self.input.was_pressed(*keys.get("super", ())):
+                bullet = player.super_shoot()
+                if bullet:
+                    self.metrics.bullets_fired.inc(label="super")
+                    self.particles.emit("super_shot", bullet.center_x, bullet.center_y)
+                    self.audio.play("super_shot")
 
     def end_game(self):
         """Завершает текущую игру"""
-        self.game_state = "GAME_OVER"
+        if self.simulation is not None and threading.current_thread() is self.simulation:
+            # Смена состояния, частоты цикла и запись в базу - в главном потоке
+            self.simulation.stop(game_over=True)
+            return
+
+        self.audio.play("game_over")
+        self.set_idle(True)
         self.save_game_stats()
-        print(f"✗ Игра окончена. Счет: {self.score}")
+        self.set_game_state("GAME_OVER")
+        logger.info("Игра окончена. Счет: %d", self.score)
+
+    def return_to_menu(self):
+        """Возврат из экрана конца игры в меню"""
+        self.set_game_state("MENU")
+        self.load_last_game_stats()
+
+    def start_profiler(self, reason):
+        """Запускает запись профиля главного потока и потока симуляции"""
+        threads = {threading.main_thread().ident: "main"}
+        if self.simulation is not None:
+            threads[self.simulation.ident] = "simulation"
+        self.profiler.start(threads, self.tick, reason)
+
+    def set_game_state(self, state):
+        """Меняет состояние игры (в режиме диагностики - с замером памяти)"""
+        self.game_state = state
+        if self.leaks is not None:
+            self.leaks.transition(state)
+
+    def on_close(self):
+        """Закрытие окна: останавливаем фоновые потоки"""
+        self.stop_simulation()
+        if self.spectators is not None:
+            self.spectators.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        self.profiler.stop()
+        if self.spawner.level is not None:
+            self.spawner.level.close()
+        super().on_close()
 
     def on_key_press(self, key, modifiers):
-        """Обработка нажатия клавиш"""
-        if self.game_state == "PLAYING" and self.player:
-            if key == arcade.key.LEFT or key == arcade.key.A:
-                self.player.move_left()
-            elif key == arcade.key.RIGHT or key == arcade.key.D:
-                self.player.move_right()
-            elif key == arcade.key.SPACE:
-                self.player.shoot()
-            elif key == arcade.key.LSHIFT or key == arcade.key.RSHIFT:
-                self.player.super_shoot()
+        """Обработка нажатия клавиш: только запись, обработка в игровом тике"""
+        if self.game_state != "PLAYING":
+            self.request_redraw()
+
+        if key == arcade.key.F3:
+            self.show_debug = not self.show_debug
+            return
+
+        if key == arcade.key.F9:
+            self.start_profiler("hotkey")
+            return
+
+        # Пауза работает и тогда, когда игровой тик остановлен
+        if self.game_state == "PLAYING" and key in (arcade.key.P, arcade.key.ESCAPE):
+            self.clock.toggle_pause()
+            return
+
+        self.input.on_key_press(key)
 
     def on_key_release(self, key, modifiers):
         """Обработка отпускания клавиш"""
-        if self.game_state == "PLAYING" and self.player:
-            if key == arcade.key.LEFT or key == arcade.key.A:
-                # Можно добавить логику плавного движения если нужно
-                pass
-            elif key == arcade.key.RIGHT or key == arcade.key.D:
-                pass
+        self.input.on_key_release(key)
+
+    def flip(self):
+        """Показывает кадр и замеряет время кадра и задержку ввода"""
+        if self.skip_frame:
+            return
+        super().flip()
+
+        now = time.perf_counter()
+        if self.last_flip_time:
+            self.frame_rate = now - self.last_flip_time
+        self.last_flip_time = now
+        if self.game_state == "PLAYING":
+            self.frame_times.append(self.frame_rate)
+            self.metrics.frame_seconds.observe(self.frame_rate)
+
+            # Рывок: записываем следующие секунды, пока он, вероятно, повторяется
+            if (PROFILER_AUTO and self.frame_rate > self.profiler_budget
+                    and not self.clock.paused and self.profiler.ready()):
+                self.start_profiler("frame")
+
+        self.input.frame_presented(now)
+
+        if self.quality and self.game_state == "PLAYING" and not self.clock.paused:
+            # Запас виден по собственной работе кадра (интервал упирается
+            # в вертикальную синхронизацию), а реальные рывки - по интервалу
+            frame_cost = self.update_time + self.draw_time
+            if self.frame_rate > self.quality.budget * self.quality.downgrade_margin:
+                frame_cost = max(frame_cost, self.frame_rate)
+            if self.quality.record(frame_cost, self.frame_rate):
+                self.apply_quality()
 
     def on_mouse_press(self, x, y, button, modifiers):
         """Обработка нажатия мыши"""
@@ -670,9 +1186,12 @@ class GameWindow(arcade.Window):
 
             elif self.game_state == "GAME_OVER":
                 # Проверка клика по кнопке "В меню"
-                if hasattr(self, 'menu_button'):
+                if self.menu_button:
                     bx, by, bw, bh = self.menu_button
                     if (bx - bw/2 <= x <= bx + bw/2 and
                         by - bh/2 <= y <= by + bh/2):
-                        self.game_state = "MENU"
-                        self.load_last_game_stats()
\ No newline at end of file
+                        self.return_to_menu()
+
+            # Нажатие могло изменить статичный экран
+            if self.game_state != "PLAYING":
+                self.request_redraw()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Игровые часы
+Единый источник игрового времени: монотонный, с паузой, масштабом времени
+и ручным шагом для запуска без окна (быстрее реального времени)
+"""
+
+import time
+
+from src.constants import TIME_SCALE
+
+
+class GameClock:
+    """
+    Игровые часы.
+    В обычном режиме время берется из time.monotonic(), в ручном режиме
+    продвигается только вызовами step().
+    """
+
+    def __init__(self, time_scale=TIME_SCALE, manual=False, source=time.monotonic):
+        """
+        Args:
+            time_scale: Множитель скорости игрового времени
+            manual: Ручной режим - время идет только через step()
+            source: Функция монотонного реального времени
+        """
+        self.time_scale = time_scale
+        self.manual = manual
+        self.source = source
+
+        self.time = 0.0  # Игровое время с начала игры (сек)
+        self.paused = False
+        self._last = source()
+
+    def reset(self):
+        """Обнуляет игровое время (начало новой игры)"""
+        self.time = 0.0
+        self.paused = False
+        self._last = self.source()
+
+    def update(self, delta_time=None):
+        """
+        Продвигает часы на один тик
+
+        Args:
+            delta_time: Шаг для ручного режима (в обычном режиме игнорируется)
+
+        Returns:
+            Игровой шаг времени с учетом паузы и масштаба
+        """
+        if self.manual:
+            return self.step(delta_time or 0.0)
+
+        now = self.source()
+        real_delta = now - self._last
+        self._last = now
+        return self.step(real_delta)
+
+    def step(self, real_delta):
+        """Продвигает игровое время на real_delta реальных секунд"""
+        if self.paused:
+            return 0.0
+
+        delta = real_delta * self.time_scale
+        self.time += delta
+        return delta
+
+    def pause(self):
+        """Ставит игру на паузу"""
+        self.paused = True
+
+    def resume(self):
+        """Снимает паузу; время паузы не засчитывается"""
+        self.paused = False
+        self._last = self.source()
+
+    def toggle_pause(self):
+        """Переключает паузу"""
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
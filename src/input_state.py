@@ -0,0 +1,138 @@
+"""
+Состояние ввода, опрашиваемое в игровом тике
+Обработчики событий окна только записывают нажатия с отметкой времени,
+а симуляция применяет их в начале своего тика
+"""
+
+import time
+from collections import deque
+
+import arcade
+
+from src.log import get_logger
+
+logger = get_logger("input")
+
+
+# Привязки клавиш: действие -> имена клавиш из arcade.key
+SOLO_BINDINGS = [
+    {"left": ["LEFT", "A"], "right": ["RIGHT", "D"], "shoot": ["SPACE"], "super": ["LSHIFT", "RSHIFT"]},
+]
+COOP_BINDINGS = [
+    {"left": ["A"], "right": ["D"], "shoot": ["SPACE"], "super": ["LSHIFT"]},
+    {"left": ["LEFT"], "right": ["RIGHT"], "shoot": ["ENTER"], "super": ["RSHIFT"]},
+]
+
+
+def resolve_bindings(bindings):
+    """
+    Переводит имена клавиш в коды arcade
+
+    Args:
+        bindings: Список словарей действие -> имена клавиш (по игроку на словарь)
+
+    Returns:
+        Список словарей действие -> кортеж кодов клавиш
+    """
+    resolved = []
+    for player_bindings in bindings:
+        actions = {}
+        for action, names in player_bindings.items():
+            codes = []
+            for name in names:
+                code = getattr(arcade.key, name.upper(), None)
+                if code is None:
+                    logger.warning("Неизвестная клавиша %s для действия %s", name, action)
+                else:
+                    codes.append(code)
+            actions[action] = tuple(codes)
+        resolved.append(actions)
+    return resolved
+
+
+class InputState:
+    """
+    Трекер клавиатуры: удерживаемые клавиши, нажатия и отпускания
+    за последний тик и задержка от нажатия до показа кадра
+    """
+
+    def __init__(self, latency_samples=120):
+        self.held = set()  # Клавиши, удерживаемые на момент тика
+        self.pressed = set()  # Нажатые с прошлого тика
+        self.released = set()  # Отпущенные с прошлого тика
+
+        # События от окна: (время, клавиша, нажата ли). Без ограничения длины:
+        # потерянное отпускание оставило бы клавишу зажатой
+        self._events = deque()
+
+        # Время событий, уже обработанных симуляцией, но еще не показанных;
+        # пишет поток симуляции, забирает поток отрисовки (append/popleft атомарны)
+        self._awaiting_display = deque()
+        self.latencies = deque(maxlen=latency_samples)  # Задержки (сек)
+
+    def on_key_press(self, key):
+        """Записывает нажатие клавиши (вызывается из обработчика окна)"""
+        self._events.append((time.perf_counter(), key, True))
+
+    def on_key_release(self, key):
+        """Записывает отпускание клавиши (вызывается из обработчика окна)"""
+        self._events.append((time.perf_counter(), key, False))
+
+    def sample(self):
+        """Применяет накопленные события; вызывается в начале игрового тика"""
+        self.pressed.clear()
+        self.released.clear()
+
+        while self._events:
+            timestamp, key, is_pressed = self._events.popleft()
+            if is_pressed:
+                self.held.add(key)
+                self.pressed.add(key)
+            else:
+                self.held.discard(key)
+                self.released.add(key)
+            self._awaiting_display.append(timestamp)
+
+    def reset(self):
+        """Сбрасывает события; удерживаемые клавиши берутся из еще не примененных событий"""
+        # События копятся и вне игры (меню, конец игры): отпускание клавиши,
+        # зажатой в прошлой игре, не должно потеряться
+        while self._events:
+            _, key, is_pressed = self._events.popleft()
+            if is_pressed:
+                self.held.add(key)
+            else:
+                self.held.discard(key)
+        self.pressed.clear()
+        self.released.clear()
+        self._awaiting_display.clear()
+
+    def is_held(self, *keys):
+        """Удерживается ли хотя бы одна из клавиш"""
+        return any(key in self.held for key in keys)
+
+    def was_pressed(self, *keys):
+        """Была ли нажата хотя бы одна из клавиш с прошлого тика"""
+        return any(key in self.pressed for key in keys)
+
+    def frame_presented(self, timestamp=None):
+        """Отмечает показ кадра: события, обработанные до него, стали видны"""
+        if not self._awaiting_display:
+            return
+
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        awaiting = self._awaiting_display
+        while awaiting:
+            self.latencies.append(timestamp - awaiting.popleft())
+
+    def get_latency_info(self):
+        """Возвращает задержку ввода для отладки (мс)"""
+        if not self.latencies:
+            return {"average_ms": 0.0, "max_ms": 0.0, "samples": 0}
+
+        return {
+            "average_ms": sum(self.latencies) / len(self.latencies) * 1000,
+            "max_ms": max(self.latencies) * 1000,
+            "samples": len(self.latencies)
+        }
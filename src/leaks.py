@@ -0,0 +1,207 @@
+"""
+Поиск утечек памяти между играми
+В режиме диагностики при каждой смене состояния игры (MENU, PLAYING,
+GAME_OVER) снимается снимок tracemalloc и считаются живые объекты игровых
+классов. Снимок сравнивается с тем же состоянием прошлой игры: если память
+растет от игры к игре, в журнал попадают места с наибольшим ростом.
+Проверка без окна: python -m src.leaks [--games 8] [--threshold-kb 512]
+(код выхода 1 - рост памяти больше порога)
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter, namedtuple
+
+from src.constants import LEAK_TRACE_FRAMES, LEAK_TOP
+from src.log import get_logger
+
+logger = get_logger("leaks")
+
+# Классы, живые объекты которых считаются в каждой точке: имя в отчете -> полное имя класса
+# (полное, потому что у pyglet тоже есть Player - голоса звука)
+TRACKED_CLASSES = {
+    "Player": "src.player.Player",
+    "Bullet": "src.bullet.Bullet",
+    "Enemy": "src.enemy.Enemy",
+    "Asteroid": "src.asteroid.Asteroid",
+    "Texture": "arcade.texture.Texture",
+    "SpriteList": "arcade.sprite_list.sprite_list.SpriteList",
+}
+
+# Память самого tracemalloc и загрузчика модулей не относится к игре
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Точка замера: номер игры, снимок, отслеживаемая память (байты), живые объекты по классам
+Checkpoint = namedtuple("Checkpoint", ["game", "snapshot", "traced", "objects"])
+
+
+class LeakDetector:
+    """Снимки памяти на сменах состояния и сравнение соседних игр"""
+
+    def __init__(self, frames=LEAK_TRACE_FRAMES, top=LEAK_TOP):
+        """
+        Args:
+            frames: Глубина стека, запоминаемого для каждого выделения
+            top: Сколько мест с наибольшим ростом выводить
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.top = top
+        self.games = 0
+        self.checkpoints = {}  # Состояние -> последняя точка замера
+        self.history = []  # (состояние, Checkpoint без снимка) по порядку
+
+    def transition(self, state):
+        """
+        Замер при смене состояния игры
+
+        Returns:
+            Рост отслеживаемой памяти с того же состояния прошлой игры (байты) или None
+        """
+        if state == "PLAYING":
+            self.games += 1
+
+        # Считаем только то, что живо: мусор с циклами собираем до снимка
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        checkpoint = Checkpoint(self.games, snapshot, traced, live_objects())
+
+        previous = self.checkpoints.get(state)
+        self.checkpoints[state] = checkpoint
+        self.history.append((state, checkpoint._replace(snapshot=None)))
+        if previous is None:
+            logger.info("Память (%s, игра %d): %.1f КБ, объекты %s", state, self.games,
+                        traced / 1024, format_objects(checkpoint.objects))
+            return None
+
+        growth = traced - previous.traced
+        # Места роста - в том же сообщении, чтобы отчет не упирался в ограничение частоты
+        sites = self.growing_sites(previous.snapshot, snapshot) if growth > 0 else []
+        logger.info("Память (%s, игра %d): %.1f КБ, %+.1f КБ с игры %d, объекты %s%s",
+                    state, self.games, traced / 1024, growth / 1024, previous.game,
+                    format_objects(checkpoint.objects, previous.objects),
+                    "".join(f"\n  {line}" for line in sites))
+        return growth
+
+    def growing_sites(self, old, new):
+        """Строки отчета о местах с наибольшим ростом памяти"""
+        stats = [stat for stat in new.compare_to(old, "lineno") if stat.size_diff > 0]
+        lines = []
+        for stat in stats[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size_diff / 1024:+.1f} КБ ({stat.count_diff:+d} блоков) "
+                         f"{frame.filename}:{frame.lineno}")
+        return lines
+
+    def growth(self, state="MENU", skip=1):
+        """
+        Рост памяти в состоянии state от игры skip до последней (байты)
+
+        Args:
+            skip: Сколько первых игр считать прогревом (кэши, ленивые импорты)
+        """
+        points = [checkpoint for name, checkpoint in self.history
+                  if name == state and checkpoint.game >= skip]
+        if len(points) < 2:
+            return 0
+        return points[-1].traced - points[0].traced
+
+    def stop(self):
+        """Останавливает трассировку"""
+        self.checkpoints.clear()
+        tracemalloc.stop()
+
+
+def live_objects(classes=TRACKED_CLASSES):
+    """Количество живых объектов отслеживаемых классов"""
+    counts = Counter(type(obj) for obj in gc.get_objects())
+    by_name = Counter()
+    for cls, count in counts.items():
+        by_name[f"{cls.__module__}.{cls.__qualname__}"] += count
+    return {name: by_name.get(qualified, 0) for name, qualified in classes.items()}
+
+
+def format_objects(objects, previous=None):
+    parts = []
+    for name, count in objects.items():
+        if previous is not None and count != previous.get(name, 0):
+            parts.append(f"{name} {count} ({count - previous.get(name, 0):+d})")
+        else:
+            parts.append(f"{name} {count}")
+    return ", ".join(parts)
+
+
+def run_games(games, ticks, warmup, threshold):
+    """
+    Играет games игр без окна и проверяет рост памяти
+
+    Каждая игра - ticks тиков с зажатым огнем, затем конец игры и выход
+    в меню, как у игрока. Статистика игр пишется во временную базу, которая
+    удаляется после проверки, - настоящая статистика не меняется.
+
+    Returns:
+        True, если рост памяти в меню после прогрева не больше threshold (байты)
+    """
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    import arcade
+    from src.game import GameWindow
+    from src.game_clock import GameClock
+
+    with tempfile.TemporaryDirectory(prefix="galactic_leaks_") as directory:
+        # Трассировка до создания окна, чтобы видеть все его выделения
+        detector = LeakDetector()
+        window = GameWindow(clock=GameClock(manual=True),
+                            stats_db=os.path.join(directory, "stats.db"))
+        window.leaks = detector
+        detector.transition(window.game_state)
+
+        for _ in range(games):
+            window.setup()
+            window.on_key_press(arcade.key.SPACE, 0)
+            for _ in range(ticks):
+                if window.game_state != "PLAYING":
+                    break
+                window.on_update(1 / 60)
+                window.on_draw()
+                window.flip()
+            if window.game_state == "PLAYING":
+                window.end_game()
+            window.on_key_release(arcade.key.SPACE, 0)
+            window.return_to_menu()
+
+        growth = detector.growth("MENU", skip=warmup)
+        window.close()
+        detector.stop()
+
+    passed = growth <= threshold
+    report = logger.info if passed else logger.error
+    report("Рост памяти в меню за игры %d-%d: %+.1f КБ (порог %.1f КБ) - %s",
+           warmup, games, growth / 1024, threshold / 1024,
+           "норма" if passed else "УТЕЧКА")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка утечек памяти между играми")
+    parser.add_argument("--games", type=int, default=8, help="Сколько игр сыграть")
+    parser.add_argument("--ticks", type=int, default=600, help="Тиков в одной игре")
+    parser.add_argument("--warmup", type=int, default=2, help="Игр на прогрев до замера")
+    parser.add_argument("--threshold-kb", type=float, default=512.0,
+                        help="Допустимый рост памяти после прогрева (КБ)")
+    args = parser.parse_args()
+    passed = run_games(args.games, args.ticks, args.warmup, args.threshold_kb * 1024)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Сценарные уровни
+Уровень описывается в JSON (потоки и волны в формате waves.json) и
+компилируется в двоичный файл: все появления развернуты в записи
+фиксированного размера, отсортированные по времени и разбитые на куски
+с индексом времени начала каждого куска. Загрузчик отображает файл в
+память (mmap) и передает планировщику только записи ближайшего окна
+времени, поэтому часовой уровень открывается мгновенно, а память не
+зависит от его длины.
+Компиляция: python -m src.levels config/levels/demo.json [-o demo.lvl]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import time
+
+import numpy as np
+
+from src.constants import SCREEN_WIDTH
+from src.spawner import SPAWN_MARGIN, SpawnEvent, formation_positions
+from src.log import get_logger
+
+logger = get_logger("levels")
+
+# Заголовок: сигнатура, версия, длина метаданных, записей в куске, всего записей, длительность
+HEADER = struct.Struct("<4sHxxIIQd")
+MAGIC = b"GDLV"
+VERSION = 1
+
+# Запись появления одного объекта; y = NaN - стандартная высота появления
+RECORD = np.dtype([("time", "<f4"), ("kind", "u1"), ("path", "u1"), ("reserved", "<u2"),
+                   ("x", "<f4"), ("y", "<f4")])
+KINDS = ["enemy", "asteroid"]
+
+CHUNK_RECORDS = 4096  # Записей в куске (64 КБ)
+ALIGNMENT = 16  # Выравнивание индекса и записей в файле
+
+
+class LevelStream:
+    """Скомпилированный уровень, отображенный в память"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Двоичный файл уровня (.lvl)
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, meta_size, chunk_records, count, duration = \
+                HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Не файл уровня или неподдерживаемая версия: {path}")
+        except Exception:
+            self._file.close()
+            raise
+
+        meta = json.loads(bytes(self._map[HEADER.size:HEADER.size + meta_size]).decode("utf-8"))
+        self.name = meta.get("name", os.path.basename(path))
+        self.kinds = meta["kinds"]
+        self.paths = meta["paths"]
+        self.duration = duration
+        self.chunk_records = chunk_records
+
+        # Индекс кусков и записи - представления поверх mmap без копирования
+        chunk_count = -(-count // chunk_records)
+        index_offset = _align(HEADER.size + meta_size)
+        self.data_offset = _align(index_offset + chunk_count * 8)
+        self.chunk_times = np.frombuffer(self._map, dtype="<f8", count=chunk_count,
+                                         offset=index_offset)
+        self.records = np.frombuffer(self._map, dtype=RECORD, count=count,
+                                     offset=self.data_offset)
+
+        self.cursor = 0  # Первая еще не переданная запись
+        self._released = 0  # Куски, страницы которых уже отпущены
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def finished(self):
+        """Все записи переданы планировщику"""
+        return self.cursor >= len(self.records)
+
+    def rewind(self):
+        """Возвращает уровень к началу (новая игра)"""
+        self.cursor = 0
+        self._released = 0
+
+    def find(self, t):
+        """
+        Индекс первой записи со временем больше t
+
+        Поиск по индексу кусков, затем внутри одного куска - читаются
+        только страницы этого куска.
+        """
+        chunk = int(np.searchsorted(self.chunk_times, t, side="right")) - 1
+        if chunk < 0:
+            return 0
+        start = chunk * self.chunk_records
+        end = min(start + self.chunk_records, len(self.records))
+        return start + int(np.searchsorted(self.records["time"][start:end], t, side="right"))
+
+    def feed(self, scheduler, until, start_time=0.0):
+        """
+        Планирует записи уровня до момента until
+
+        Args:
+            scheduler: SpawnScheduler, в очередь которого добавляются события
+            until: Время уровня (сек), до которого передаются записи
+            start_time: Игровое время начала уровня
+
+        Returns:
+            Количество запланированных записей
+        """
+        end = self.find(until)
+        if end <= self.cursor:
+            return 0
+
+        block = self.records[self.cursor:end]
+        for t, kind, path, x, y in zip(block["time"].tolist(), block["kind"].tolist(),
+                                       block["path"].tolist(), block["x"].tolist(),
+                                       block["y"].tolist()):
+            scheduler.schedule(SpawnEvent(start_time + t, self.kinds[kind], formation="point",
+                                          x=x, y=None if y != y else y, path=self.paths[path]))
+
+        self.cursor = end
+        self._release()
+        return len(block)
+
+    def _release(self):
+        """Отпускает страницы пройденных кусков, чтобы они не копились в памяти процесса"""
+        passed = self.cursor // self.chunk_records
+        if passed <= self._released or not hasattr(self._map, "madvise"):
+            return
+        start = self.data_offset + self._released * self.chunk_records * RECORD.itemsize
+        end = self.data_offset + passed * self.chunk_records * RECORD.itemsize
+        start -= start % mmap.PAGESIZE
+        end -= end % mmap.PAGESIZE
+        if end > start:
+            self._map.madvise(mmap.MADV_DONTNEED, start, end - start)
+        self._released = passed
+
+    def close(self):
+        """Закрывает отображение файла"""
+        # Представления numpy держат буфер mmap - освобождаем их до закрытия
+        self.records = self.chunk_times = None
+        self._map.close()
+        self._file.close()
+
+
+def compile_level(description, seed=None):
+    """
+    Разворачивает описание уровня в записи появления
+
+    Args:
+        description: Словарь из JSON: name, seed, duration, enemy_rate,
+            asteroid_rate, waves (как в waves.json; repeat -1 - до конца уровня)
+        seed: Зерно случайных позиций (по умолчанию - из описания)
+
+    Returns:
+        (метаданные, записи RECORD по возрастанию времени, длительность)
+    """
+    duration = float(description["duration"])
+    seed = description.get("seed", 0) if seed is None else seed
+    rng = np.random.default_rng(seed)
+    paths = {}
+
+    def path_index(name):
+        if name not in paths:
+            if len(paths) > np.iinfo(RECORD["path"]).max:
+                raise ValueError("Слишком много траекторий в уровне")
+            paths[name] = len(paths)
+        return paths[name]
+
+    parts = []
+
+    # Постоянные потоки: время и позиции сразу массивами
+    for kind, key, path in (("enemy", "enemy_rate", "random"),
+                            ("asteroid", "asteroid_rate", "straight")):
+        rate = description.get(key, 0.0)
+        if rate <= 0:
+            continue
+        times = np.arange(1.0 / rate, duration, 1.0 / rate)
+        part = np.zeros(len(times), dtype=RECORD)
+        part["time"] = times
+        part["kind"] = KINDS.index(kind)
+        part["path"] = path_index(path)
+        part["x"] = rng.integers(SPAWN_MARGIN, SCREEN_WIDTH - SPAWN_MARGIN, len(times),
+                                 endpoint=True)
+        part["y"] = np.nan
+        parts.append(part)
+
+    # Волны: формации считает тот же код, что и в игре, с зерном уровня
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        for wave in description.get("waves", []):
+            kind = wave.get("kind", "enemy")
+            path = path_index(wave.get("path", "straight"))
+            interval = wave.get("interval", 0.0)
+            repeat = wave.get("repeat", 0)
+            if interval <= 0:
+                repeat = 0
+            elif repeat < 0:
+                repeat = int((duration - wave.get("time", 0.0)) / interval)
+
+            rows = []
+            for i in range(repeat + 1):
+                t = wave.get("time", 0.0) + i * interval
+                if t >= duration:
+                    break
+                for x, y in formation_positions(wave.get("formation", "random"),
+                                                wave.get("count", 1), wave.get("x"),
+                                                wave.get("spacing", 40)):
+                    rows.append((t, KINDS.index(kind), path, 0, x, np.nan if y is None else y))
+            parts.append(np.array(rows, dtype=RECORD))
+    finally:
+        random.setstate(state)
+
+    records = np.concatenate(parts) if parts else np.zeros(0, dtype=RECORD)
+    records = records[np.argsort(records["time"], kind="stable")]
+
+    meta = {
+        "name": description.get("name", ""),
+        "kinds": KINDS,
+        "paths": sorted(paths, key=paths.get),
+    }
+    return meta, records, duration
+
+
+def write_level(path, meta, records, duration, chunk_records=CHUNK_RECORDS):
+    """Записывает скомпилированный уровень в двоичный файл"""
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    chunk_times = records["time"][::chunk_records].astype("<f8")
+
+    index_offset = _align(HEADER.size + len(meta_bytes))
+    data_offset = _align(index_offset + chunk_times.nbytes)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(meta_bytes), chunk_records, len(records),
+                            duration))
+        f.write(meta_bytes)
+        f.write(bytes(index_offset - f.tell()))
+        f.write(chunk_times.tobytes())
+        f.write(bytes(data_offset - f.tell()))
+        f.write(records.astype(RECORD, copy=False).tobytes())
+
+
+def compile_file(source, output=None):
+    """
+    Компилирует JSON описание уровня в файл .lvl
+
+    Returns:
+        Путь к скомпилированному файлу
+    """
+    output = output or os.path.splitext(source)[0] + ".lvl"
+    started = time.perf_counter()
+    with open(source, 'r', encoding='utf-8') as f:
+        description = json.load(f)
+
+    meta, records, duration = compile_level(description)
+    write_level(output, meta, records, duration)
+    logger.info("Уровень скомпилирован: %s (%d появлений, %.0f КБ, %.0f мс)",
+                output, len(records), os.path.getsize(output) / 1024,
+                (time.perf_counter() - started) * 1000)
+    return output
+
+
+def load_level(path):
+    """
+    Открывает уровень; JSON описание сначала компилируется рядом с исходником,
+    если скомпилированного файла нет или он старше описания
+
+    Returns:
+        LevelStream или None при ошибке
+    """
+    try:
+        if path.endswith(".json"):
+            compiled = os.path.splitext(path)[0] + ".lvl"
+            if (not os.path.exists(compiled) or
+                    os.path.getmtime(compiled) < os.path.getmtime(path)):
+                compile_file(path, compiled)
+            path = compiled
+
+        level = LevelStream(path)
+        logger.info("Уровень загружен: %s (%d появлений, %.0f сек)",
+                    level.name, len(level), level.duration)
+        return level
+    except Exception as e:
+        logger.error("Ошибка загрузки уровня %s: %s", path, e)
+        return None
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Компилятор уровней Galactic Defender")
+    parser.add_argument("source", help="JSON описание уровня")
+    parser.add_argument("-o", "--output", help="Файл .lvl (по умолчанию рядом с исходником)")
+    args = parser.parse_args()
+    compile_file(args.source, args.output)
+
+
+if __name__ == "__main__":
+    main()
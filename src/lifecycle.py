@@ -0,0 +1,196 @@
+"""
+Менеджер жизненного цикла игровых объектов
+Создает и удаляет врагов и астероидов, ограничивает их количество,
+удаляет объекты за границами мира и считает занимаемую память
+"""
+
+import itertools
+import sys
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, ENTITY_CAPS
+from src.enemy import Enemy
+from src.asteroid import Asteroid
+from src.motion import MotionPaths
+
+
+# Классы объектов по типу
+ENTITY_CLASSES = {
+    "enemy": Enemy,
+    "asteroid": Asteroid,
+}
+
+# Запас за краями экрана, после которого объект удаляется
+WORLD_MARGIN = 100
+
+
+class EntityManager:
+    """
+    Владелец всех врагов и астероидов.
+    Контейнеры не пересоздаются: удаление меняет списки на месте,
+    поэтому на них можно держать ссылки.
+    """
+
+    def __init__(self, caps=ENTITY_CAPS, motion=None):
+        """
+        Args:
+            caps: Словарь тип -> максимальное количество живых объектов
+            motion: Траектории врагов (MotionPaths); None - загрузить из файла
+        """
+        self.caps = dict(caps)
+        self.containers = {kind: [] for kind in ENTITY_CLASSES}
+        self.motion = motion if motion is not None else MotionPaths()
+        self._ids = itertools.count(1)  # Идентификаторы объектов (для зрителей)
+
+        # Границы мира: сверху оставляем место для формаций над экраном
+        self.bounds = (
+            -WORLD_MARGIN, SCREEN_WIDTH + WORLD_MARGIN,
+            -WORLD_MARGIN, SCREEN_HEIGHT * 2 + WORLD_MARGIN
+        )
+
+        # Счетчики за игру
+        self.created = dict.fromkeys(self.containers, 0)
+        self.destroyed = dict.fromkeys(self.containers, 0)
+        self.culled = dict.fromkeys(self.containers, 0)
+        self.rejected = dict.fromkeys(self.containers, 0)  # Не созданы из-за лимита
+
+    def __getitem__(self, kind):
+        return self.containers[kind]
+
+    def clear(self):
+        """Удаляет все объекты и обнуляет счетчики (новая игра)"""
+        for kind, container in self.containers.items():
+            container.clear()
+            self.created[kind] = 0
+            self.destroyed[kind] = 0
+            self.culled[kind] = 0
+            self.rejected[kind] = 0
+        self.motion.invalidate()
+
+    def room(self, kind):
+        """Сколько еще объектов типа можно создать до лимита"""
+        cap = self.caps.get(kind)
+        if cap is None:
+            return sys.maxsize
+        return max(0, cap - len(self.containers[kind]))
+
+    def create(self, kind, positions, now=0.0, path="straight"):
+        """
+        Создает пачку объектов и добавляет их в контейнер одной операцией
+
+        Args:
+            kind: Тип объекта
+            positions: Список пар (x, y); None - позиция по умолчанию
+            now: Игровое время появления (сек)
+            path: Траектория врагов пачки ("random" - случайная для каждого)
+
+        Returns:
+            Количество созданных объектов
+        """
+        room = self.room(kind)
+        if len(positions) > room:
+            self.rejected[kind] += len(positions) - room
+            positions = positions[:room]
+
+        entity_class = ENTITY_CLASSES[kind]
+        entities = [entity_class(x, y) for x, y in positions]
+        for entity in entities:
+            entity.uid = next(self._ids)
+        if kind == "enemy":
+            self.motion.assign(entities, path, now)
+        self.containers[kind].extend(entities)
+        self.created[kind] += len(positions)
+        return len(positions)
+
+    def destroy(self, kind, entity):
+        """Удаляет уничтоженный объект"""
+        container = self.containers[kind]
+        index = container.index(entity)
+        del container[index]
+        self.destroyed[kind] += 1
+        if kind == "enemy":
+            # Параметры траекторий сжимаются той же маской, без повторного сбора
+            self.motion.remove(index)
+
+    def update(self, delta_time, now=0.0):
+        """
+        Обновляет все объекты и за тот же проход удаляет вышедшие за границы
+
+        Args:
+            delta_time: Шаг тика (сек)
+            now: Игровое время (сек) - по нему враги идут по траекториям
+        """
+        left, right, bottom, top = self.bounds
+
+        for kind, container in self.containers.items():
+            if kind == "enemy":
+                self.update_enemies(container, now)
+                continue
+
+            alive = []
+            for entity in container:
+                entity.update(delta_time)
+                half_width = entity.width / 2
+                half_height = entity.height / 2
+                if (entity.center_y + half_height >= bottom and
+                        entity.center_y - half_height <= top and
+                        entity.center_x + half_width >= left and
+                        entity.center_x - half_width <= right):
+                    alive.append(entity)
+
+            self.culled[kind] += len(container) - len(alive)
+            container[:] = alive
+
+    def update_enemies(self, container, now):
+        """Враги движутся по таблицам траекторий и отсекаются векторно"""
+        if not container:
+            return
+        left, right, bottom, top = self.bounds
+
+        positions = self.motion.update(container, now)
+        half_size = self.motion.half_size
+        low = positions - half_size
+        high = positions + half_size
+        inside = ((high[:, 1] >= bottom) & (low[:, 1] <= top) &
+                  (high[:, 0] >= left) & (low[:, 0] <= right))
+        if inside.all():
+            return
+
+        self.culled["enemy"] += int(len(container) - inside.sum())
+        container[:] = [entity for entity, keep in zip(container, inside.tolist()) if keep]
+        self.motion.keep(inside)
+
+    def counts(self):
+        """Количество живых объектов по типам"""
+        return {kind: len(container) for kind, container in self.containers.items()}
+
+    def memory_usage(self):
+        """Оценка памяти, занятой объектами, по типам (байты)"""
+        usage = {}
+        for kind, container in self.containers.items():
+            size = sys.getsizeof(container)
+            if container:
+                # Объекты одного типа одинаковы - меряем первый
+                sample = container[0]
+                size += len(container) * (sys.getsizeof(sample) + sys.getsizeof(sample.__dict__))
+            usage[kind] = size
+        return usage
+
+
+def process_memory():
+    """Резидентная память процесса (байты) или None, если неизвестна"""
+    try:
+        # Linux: текущий RSS в страницах
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        import resource
+        return pages * resource.getpagesize()
+    except (OSError, ImportError, ValueError, IndexError):
+        pass
+
+    try:
+        # Другие Unix-системы: только пиковое значение
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
@@ -0,0 +1,183 @@
+"""
+Журнал игры и лаунчера
+Сообщения не пишутся в поток вывода из игрового потока: QueueHandler кладет
+запись в очередь без блокировки, а QueueListener в фоновом потоке
+форматирует ее и пишет в stdout (и в файл, если задан). К каждой записи
+добавляются поля сессии, тика и счета. Частые сообщения из одного места
+кода ограничиваются по частоте, чтобы предупреждение в каждом кадре не
+забило медленный журнал.
+Модуль зависит только от стандартной библиотеки: его использует и лаунчер.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import uuid
+
+ROOT = "galactic"
+SESSION_ID = uuid.uuid4().hex[:8]  # Идентификатор процесса игры в журнале
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(session)s t=%(tick)s s=%(score)s] %(message)s"
+
+# Не больше RATE_LIMIT сообщений из одного места кода за RATE_INTERVAL секунд
+RATE_LIMIT = 10
+RATE_INTERVAL = 5.0
+
+
+class ContextFilter(logging.Filter):
+    """Добавляет к записи поля сессии и текущего состояния игры"""
+
+    def __init__(self):
+        super().__init__()
+        self.providers = []  # Функции, возвращающие словарь полей (вызываются при записи)
+
+    def filter(self, record):
+        record.session = SESSION_ID
+        record.tick = "-"
+        record.score = "-"
+        for provider in self.providers:
+            for key, value in provider().items():
+                setattr(record, key, value)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Ограничивает частоту сообщений из одного места кода"""
+
+    def __init__(self, limit=RATE_LIMIT, interval=RATE_INTERVAL):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._windows = {}  # (файл, строка) -> [начало окна, сообщений, подавлено]
+
+    def filter(self, record):
+        if self.limit <= 0:
+            return True
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} (подавлено похожих: {suppressed})"
+            return True
+        if window[1] < self.limit:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "session": record.session,
+            "tick": record.tick,
+            "score": record.score,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _create():
+    """Очередь, обработчик-производитель и фоновый слушатель с выводом в stdout"""
+    root = logging.getLogger(ROOT)
+    root.setLevel(logging.INFO)
+    root.propagate = False
+
+    handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    handler.addFilter(_context)
+    handler.addFilter(_rate_limit)
+    root.addHandler(handler)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+    listener = logging.handlers.QueueListener(handler.queue, console, respect_handler_level=True)
+    listener.start()
+    # Слушатель дописывает очередь при выходе
+    atexit.register(listener.stop)
+    return listener
+
+
+_context = ContextFilter()
+_rate_limit = RateLimitFilter()
+_listener = _create()
+
+
+def get_logger(name):
+    """Журнал подсистемы (уровень можно задать в конфиге по этому имени)"""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def bind_context(provider):
+    """
+    Добавляет поля к каждой записи
+
+    Args:
+        provider: Функция без аргументов, возвращающая словарь полей;
+            вызывается только при записи сообщения, поэтому тику ничего не стоит
+    """
+    _context.providers.append(provider)
+
+
+def configure_logging(level="INFO", levels=None, path=None, fmt="text",
+                      rate_limit=RATE_LIMIT, rate_interval=RATE_INTERVAL):
+    """
+    Настраивает журнал по конфигу
+
+    Args:
+        level: Общий уровень ("DEBUG", "INFO", "WARNING", "ERROR")
+        levels: Уровни подсистем, например {"spectator": "WARNING"}
+        path: Файл журнала (дописывается); None - только stdout
+        fmt: "text" или "json"
+        rate_limit, rate_interval: Сообщений из одного места кода за интервал (0 - без ограничения)
+    """
+    global _listener
+
+    # Опечатка в уровне не должна останавливать игру и лаунчер при импорте конфига
+    try:
+        logging.getLogger(ROOT).setLevel(str(level).upper())
+    except (ValueError, TypeError):
+        logging.getLogger(ROOT).setLevel(logging.INFO)
+        get_logger("log").warning("Неизвестный уровень журнала %r, используется INFO", level)
+    for name, name_level in (levels or {}).items():
+        try:
+            get_logger(name).setLevel(str(name_level).upper())
+        except (ValueError, TypeError):
+            get_logger(name).setLevel(logging.INFO)
+            get_logger("log").warning("Неизвестный уровень журнала %r для %s, используется INFO",
+                                      name_level, name)
+
+    _rate_limit.limit = rate_limit
+    _rate_limit.interval = rate_interval
+
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if path:
+        try:
+            handlers.append(logging.FileHandler(path, encoding="utf-8"))
+        except OSError as e:
+            get_logger("log").error("Не удалось открыть файл журнала %s: %s", path, e)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Новый слушатель забирает ту же очередь после того, как старый ее дописал
+    queue_handler = logging.getLogger(ROOT).handlers[0]
+    atexit.unregister(_listener.stop)
+    _listener.stop()
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -4,17 +4,18 @@
 
 import arcade
 from src.game import GameWindow
-from src.constants import print_config_info
+from src.constants import log_config_info
+from src.log import get_logger
+
+logger = get_logger("main")
 
 
 def main():
     """Главная функция запуска игры"""
-    print("=" * 50)
-    print("   GALACTIC DEFENDER - Космический шутер")
-    print("=" * 50)
+    logger.info("GALACTIC DEFENDER - Космический шутер")
 
-    # Выводим информацию о конфиге
-    print_config_info()
+    # Записываем информацию о конфиге
+    log_config_info()
 
     try:
         # Создаем и запускаем игру
@@ -22,9 +23,7 @@ def main():
         window.setup()
         arcade.run()
     except Exception as e:
-        print(f"✗ Ошибка запуска игры: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Ошибка запуска игры: %s", e)
 
 
 if __name__ == "__main__":
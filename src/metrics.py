@@ -0,0 +1,238 @@
+"""
+Метрики производительности
+Счетчики и гистограммы обновляются в игровом потоке обычными операциями
+над числами и списками, без блокировок: каждую метрику пишет один поток,
+а читатель под GIL берет копию списка или словаря целиком. Фоновый поток
+отдает метрики в текстовом формате Prometheus по HTTP (только localhost)
+и периодически сохраняет их в файл.
+"""
+
+import bisect
+import gc
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.constants import METRICS_HOST, METRICS_PORT, METRICS_FILE, METRICS_DUMP_INTERVAL
+from src.log import get_logger
+
+logger = get_logger("metrics")
+
+
+# Границы корзин гистограмм (сек)
+FRAME_BUCKETS = (0.004, 0.008, 0.0125, 0.0167, 0.025, 0.0333, 0.05, 0.1, 0.25)
+UPDATE_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.0167, 0.0333, 0.1)
+DB_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+GC_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1)
+
+
+class Metric:
+    """Счетчик или показатель; значения по значению метки (None - без метки)"""
+
+    def __init__(self, name, help_text, kind="counter", label=None):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label = label
+        self.values = {}
+
+    def inc(self, amount=1, label=None):
+        self.values[label] = self.values.get(label, 0) + amount
+
+    def set(self, value, label=None):
+        self.values[label] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for label, value in sorted(self.values.copy().items(), key=lambda item: str(item[0])):
+            suffix = f'{{{self.label}="{label}"}}' if label is not None else ""
+            lines.append(f"{self.name}{suffix} {value}")
+        return lines
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, bounds):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Последняя корзина - больше всех границ
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        # Поля читаются без блокировки - сумма может отстать от корзин на одно значение
+        counts = list(self.counts)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        total = 0
+        for bound, count in zip(self.bounds, counts):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        total += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {total}")
+        return lines
+
+
+class Metrics:
+    """Набор метрик игры"""
+
+    def __init__(self):
+        self._metrics = []
+
+        self.frame_seconds = self.histogram(
+            "gd_frame_seconds", "Интервал между показанными кадрами", FRAME_BUCKETS)
+        self.update_seconds = self.histogram(
+            "gd_update_seconds", "Длительность игрового тика", UPDATE_BUCKETS)
+        self.db_write_seconds = self.histogram(
+            "gd_db_write_seconds", "Запись статистики игры в базу", DB_BUCKETS)
+        self.gc_pause_seconds = self.histogram(
+            "gd_gc_pause_seconds", "Паузы сборщика мусора", GC_BUCKETS)
+
+        self.entities = self.gauge("gd_entities", "Живых объектов по типам", label="kind")
+        self.ticks = self.counter("gd_ticks_total", "Игровых тиков")
+        self.bullets_fired = self.counter("gd_bullets_fired_total", "Выстрелов игроков",
+                                          label="type")
+        self.collision_pairs = self.counter("gd_collision_pairs_total",
+                                            "Проверенных пар столкновений", label="check")
+        self.gc_collections = self.counter("gd_gc_collections_total",
+                                           "Сборок мусора по поколениям", label="generation")
+
+        self._gc_start = 0.0
+
+    def counter(self, name, help_text, label=None):
+        return self._add(Metric(name, help_text, "counter", label))
+
+    def gauge(self, name, help_text, label=None):
+        return self._add(Metric(name, help_text, "gauge", label))
+
+    def histogram(self, name, help_text, bounds):
+        return self._add(Histogram(name, help_text, bounds))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def track_gc(self, enabled=True):
+        """Подключает (или отключает) замер пауз сборщика мусора"""
+        if enabled and self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        elif not enabled and self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        # Сборки идут по одной, поэтому запись из любого потока не пересекается
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            self.gc_pause_seconds.observe(time.perf_counter() - self._gc_start)
+            self.gc_collections.inc(label=info["generation"])
+
+
+class MetricsExporter:
+    """HTTP эндпоинт /metrics и периодический сброс метрик в файл в фоновом потоке"""
+
+    def __init__(self, metrics, host=METRICS_HOST, port=METRICS_PORT,
+                 path=METRICS_FILE, interval=METRICS_DUMP_INTERVAL):
+        """
+        Args:
+            metrics: Набор метрик (Metrics)
+            host, port: Адрес HTTP эндпоинта; port=None - без HTTP
+            path: Файл для периодического сброса; None - без файла
+            interval: Период сброса в файл (сек)
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self._server = None
+        self._threads = []
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Запускает HTTP сервер и/или сброс в файл"""
+        self.metrics.track_gc()
+
+        if self.port is not None:
+            try:
+                self._server = HTTPServer((self.host, self.port), self._handler())
+                self.port = self._server.server_address[1]
+                self._spawn(self._server.serve_forever, "metrics-http")
+                logger.info("Метрики: http://%s:%d/metrics", self.host, self.port)
+            except OSError as e:
+                self._server = None
+                logger.error("Сервер метрик не запущен: %s", e)
+
+        if self.path:
+            self._spawn(self._dump_loop, "metrics-dump")
+            logger.info("Метрики сохраняются в %s каждые %s сек", self.path, self.interval)
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Опрос раз в несколько секунд не должен засорять вывод
+
+        return Handler
+
+    def _dump_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        """Сохраняет метрики в файл (через временный, чтобы читатель не увидел половину)"""
+        try:
+            temp = self.path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(self.metrics.render())
+            os.replace(temp, self.path)
+        except OSError as e:
+            logger.error("Ошибка сохранения метрик %s: %s", self.path, e)
+
+    def stop(self):
+        """Останавливает потоки; последний сброс в файл - при выходе"""
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        if self.path:
+            self.dump()
+        self.metrics.track_gc(False)
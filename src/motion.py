@@ -0,0 +1,275 @@
+"""
+Траектории движения врагов
+Траектории (прямая, синусоида, пикирование, кривые Безье) задаются в JSON
+файле и один раз при загрузке дискретизируются в таблицы смещений от точки
+появления. Позиция каждого врага за тик - векторная выборка из таблицы по
+времени жизни плюс точка появления. Формация - это группа с общей
+траекторией и временем появления, поэтому корабли держат свои места
+относительно ведущего без отдельного расчета.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from src.constants import BASE_FPS, ENEMY_SPEED, MOTION_FILE
+from src.log import get_logger
+
+logger = get_logger("motion")
+
+
+# Траектории на случай отсутствия файла (скорости - пиксели за кадр при 60 FPS)
+DEFAULT_MOTION_DATA = {
+    "sample_rate": 60,
+    "paths": {},
+    "weights": {"straight": 1},
+}
+
+# Подробность дискретизации кривой Безье для пересчета по длине дуги
+BEZIER_STEPS = 256
+
+
+class MotionPaths:
+    """Таблицы траекторий и векторное движение врагов по ним"""
+
+    def __init__(self, path=MOTION_FILE):
+        """
+        Args:
+            path: JSON файл с траекториями
+        """
+        data = load_motion_paths(path)
+        self.rate = data.get("sample_rate", 60)  # Отсчетов таблицы в секунду
+
+        # Прямая вниз со скоростью из конфига есть всегда
+        paths = {"straight": {"type": "linear", "velocity": [0, -ENEMY_SPEED]}}
+        paths.update(data["paths"])
+        self.names = list(paths)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        # Все таблицы подряд в одном массиве: путь i - отсчеты [starts[i], starts[i] + lengths[i])
+        tables = [sample_path(spec, self.rate) for spec in paths.values()]
+        self.samples = np.concatenate([samples for samples, _ in tables]).astype(np.float32)
+        self.lengths = np.array([len(samples) for samples, _ in tables])
+        self.starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1]))
+        self.durations = (self.lengths - 1) / self.rate
+        # После конца таблицы враг летит дальше с конечной скоростью (пикс/сек)
+        self.exit_velocity = np.array([velocity for _, velocity in tables], dtype=np.float32)
+
+        weights = data.get("weights", {})
+        self.random_names = [name for name in weights if name in self.index]
+        self.random_weights = np.array([weights[name] for name in self.random_names], dtype=float)
+        if not self.random_names:
+            self.random_names, self.random_weights = ["straight"], np.ones(1)
+        self.random_weights /= self.random_weights.sum()
+        self._rng = np.random.default_rng()
+
+        # Параметры живых врагов в порядке контейнера; None - контейнер изменился
+        self._path = None
+        self._origin = None
+        self._spawn_time = None
+        self.half_size = None  # Половины ширины и высоты для отсечения по границам
+
+    def assign(self, entities, path, now):
+        """
+        Назначает новым врагам траекторию
+
+        Args:
+            entities: Только что созданные враги
+            path: Имя траектории или "random" - своя случайная для каждого
+            now: Игровое время появления (сек)
+        """
+        if path == "random":
+            names = self._rng.choice(len(self.random_names), size=len(entities), p=self.random_weights)
+            indices = [self.index[self.random_names[i]] for i in names]
+        else:
+            if path not in self.index:
+                logger.warning("Неизвестная траектория %s, используется прямая", path)
+                path = "straight"
+            indices = [self.index[path]] * len(entities)
+
+        for entity, index in zip(entities, indices):
+            entity.path = index
+            entity.origin_x = entity.center_x
+            entity.origin_y = entity.center_y
+            entity.spawn_time = now
+
+        # Новые враги добавляются в конец контейнера - дописываем их параметры
+        if self._path is not None:
+            path, origin, spawn_time, half_size = self._gather(entities)
+            self._path = np.concatenate((self._path, path))
+            self._origin = np.concatenate((self._origin, origin))
+            self._spawn_time = np.concatenate((self._spawn_time, spawn_time))
+            self.half_size = np.concatenate((self.half_size, half_size))
+
+    def invalidate(self):
+        """Состав контейнера изменился - параметры будут собраны заново"""
+        self._path = None
+
+    def keep(self, mask):
+        """Оставляет параметры только выживших (контейнер сжат той же маской)"""
+        if self._path is None:
+            return
+        self._path = self._path[mask]
+        self._origin = self._origin[mask]
+        self._spawn_time = self._spawn_time[mask]
+        self.half_size = self.half_size[mask]
+
+    def remove(self, index):
+        """Удаляет параметры врага с номером index в контейнере"""
+        if self._path is None:
+            return
+        mask = np.ones(len(self._path), dtype=bool)
+        mask[index] = False
+        self.keep(mask)
+
+    def _gather(self, entities):
+        """Параметры врагов: (траектории, точки появления, время появления, полуразмеры)"""
+        n = len(entities)
+        path = np.fromiter((e.path for e in entities), dtype=np.intp, count=n)
+        spawn_time = np.fromiter((e.spawn_time for e in entities), dtype=float, count=n)
+        origin = np.empty((n, 2), dtype=np.float32)
+        origin[:, 0] = np.fromiter((e.origin_x for e in entities), dtype=float, count=n)
+        origin[:, 1] = np.fromiter((e.origin_y for e in entities), dtype=float, count=n)
+        half_size = np.empty((n, 2), dtype=np.float32)
+        half_size[:, 0] = np.fromiter((e.width for e in entities), dtype=float, count=n) / 2
+        half_size[:, 1] = np.fromiter((e.height for e in entities), dtype=float, count=n) / 2
+        return path, origin, spawn_time, half_size
+
+    def offsets(self, path, elapsed):
+        """
+        Смещения от точки появления по таблицам (с линейной интерполяцией)
+
+        Args:
+            path: Индексы траекторий
+            elapsed: Время с момента появления (сек)
+
+        Returns:
+            Массив (n, 2)
+        """
+        last = self.lengths[path] - 1
+        position = np.clip(elapsed * self.rate, 0, last)
+        i = np.minimum(position.astype(np.intp), np.maximum(last - 1, 0))
+        frac = (position - i)[:, None]
+
+        first = self.starts[path] + i
+        second = np.minimum(first + 1, self.starts[path] + last)
+        result = self.samples[first] * (1 - frac) + self.samples[second] * frac
+
+        overflow = np.maximum(elapsed - self.durations[path], 0)
+        result += self.exit_velocity[path] * overflow[:, None]
+        return result
+
+    def update(self, entities, now):
+        """
+        Переставляет всех врагов на их траекториях
+
+        Args:
+            entities: Контейнер живых врагов
+            now: Игровое время (сек)
+
+        Returns:
+            Массив позиций (n, 2) в порядке контейнера
+        """
+        if self._path is None or len(self._path) != len(entities):
+            self._path, self._origin, self._spawn_time, self.half_size = self._gather(entities)
+
+        positions = self._origin + self.offsets(self._path, now - self._spawn_time)
+        for entity, (x, y) in zip(entities, positions.tolist()):
+            entity.center_x = x
+            entity.center_y = y
+        return positions
+
+
+def sample_path(spec, rate):
+    """
+    Дискретизирует траекторию в таблицу смещений
+
+    Args:
+        spec: Описание траектории из JSON
+        rate: Отсчетов в секунду
+
+    Returns:
+        (массив смещений (n, 2), конечная скорость (пикс/сек))
+    """
+    kind = spec["type"]
+
+    if kind == "linear":
+        # Таблица из двух отсчетов, дальше - конечная скорость
+        velocity = np.array(spec["velocity"], dtype=float) * BASE_FPS
+        return np.array([[0.0, 0.0], velocity / rate]), velocity
+
+    duration = spec.get("duration", 20.0)
+    t = np.arange(int(duration * rate) + 1) / rate
+
+    if kind == "sine":
+        # Волна по X при равномерном спуске
+        phase = 2 * np.pi * t / spec["period"]
+        x = spec["amplitude"] * np.sin(phase)
+        y = -spec["speed"] * BASE_FPS * t
+        samples = np.column_stack((x, y))
+        exit_velocity = np.array([0.0, y[-1] - y[-2]]) * rate
+
+    elif kind == "dive":
+        # Спуск с переменной скоростью: ключи (время, скорость), между ними - линейно
+        keys = np.array(spec["speeds"], dtype=float)
+        speed = np.interp(t, keys[:, 0], keys[:, 1]) * BASE_FPS
+        y = -np.concatenate(([0.0], np.cumsum((speed[1:] + speed[:-1]) / 2) / rate))
+        x = np.zeros_like(y)
+        if "drift" in spec:
+            x = np.interp(t, keys[:, 0], np.array(spec["drift"], dtype=float))
+        samples = np.column_stack((x, y))
+        exit_velocity = (samples[-1] - samples[-2]) * rate
+
+    elif kind == "bezier":
+        # Цепочка кубических кривых, пройденная с постоянной скоростью
+        points = np.array(spec["points"], dtype=float)
+        curve = bezier_chain(points)
+        length = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(curve, axis=0).T))))
+        distance = np.minimum(t * spec["speed"] * BASE_FPS, length[-1])
+        samples = np.column_stack((np.interp(distance, length, curve[:, 0]),
+                                   np.interp(distance, length, curve[:, 1])))
+        # Обрезаем неподвижный хвост после конца кривой
+        end = int(np.searchsorted(distance, length[-1])) + 1
+        samples = samples[:max(end, 2)]
+        # Дальше - по касательной в конце кривой с той же скоростью
+        tangent = curve[-1] - curve[-2]
+        exit_velocity = tangent / np.hypot(*tangent) * spec["speed"] * BASE_FPS
+
+    else:
+        raise ValueError(f"Неизвестный тип траектории: {kind}")
+
+    if "exit_velocity" in spec:
+        exit_velocity = np.array(spec["exit_velocity"], dtype=float) * BASE_FPS
+    return samples, exit_velocity
+
+
+def bezier_chain(points, steps=BEZIER_STEPS):
+    """Точки цепочки кубических кривых Безье (3n + 1 контрольная точка)"""
+    segments = (len(points) - 1) // 3
+    if segments < 1 or len(points) != segments * 3 + 1:
+        raise ValueError("Для кривой Безье нужно 3n + 1 контрольных точек")
+
+    t = np.linspace(0, 1, steps)[:, None]
+    curve = []
+    for k in range(segments):
+        p0, p1, p2, p3 = points[k * 3:k * 3 + 4]
+        segment = ((1 - t) ** 3 * p0 + 3 * (1 - t) ** 2 * t * p1 +
+                   3 * (1 - t) * t ** 2 * p2 + t ** 3 * p3)
+        curve.append(segment if k == 0 else segment[1:])
+    return np.concatenate(curve)
+
+
+def load_motion_paths(path):
+    """Загружает траектории из JSON файла"""
+    if not os.path.exists(path):
+        return DEFAULT_MOTION_DATA
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        logger.info("Траектории загружены из: %s (%d)", path, len(data['paths']))
+        return data
+    except Exception as e:
+        logger.error("Ошибка загрузки траекторий %s: %s", path, e)
+        return DEFAULT_MOTION_DATA
@@ -0,0 +1,444 @@
+"""
+Индикаторы игрока и панели интерфейса в постоянных пакетах геометрии
+Фигуры лежат в одном вершинном буфере и перестраиваются на месте только
+при изменении HP, перегрева или заряда; каждый кадр весь пакет рисуется
+одним вызовом. Подписи - постоянные метки pyglet в общем пакете.
+"""
+
+import arcade
+import numpy as np
+import pyglet
+from arcade.gl import BufferDescription
+from pyglet.math import Mat4
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+uniform vec2 u_offset;  // Сдвиг всего пакета (позиция корабля)
+
+in vec2 in_vert;
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = proj.matrix * vec4(in_vert + u_offset, 0.0, 1.0);
+    v_color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+out vec4 out_color;
+
+void main() {
+    out_color = v_color;
+}
+"""
+
+FONT_NAME = ("calibri", "arial")  # Как у arcade.draw_text
+CIRCLE_SEGMENTS = 32
+
+
+class ShapeBatch:
+    """
+    Набор фигур из треугольников с постоянными местами в буфере.
+    add_* резервирует место под фигуру, set_* переписывает ее вершины,
+    draw() загружает измененные данные и рисует все одним вызовом.
+    """
+
+    def __init__(self, ctx, capacity=1024):
+        """
+        Args:
+            ctx: OpenGL контекст окна
+            capacity: Максимальное количество вершин
+        """
+        self.ctx = ctx
+        self.capacity = capacity
+        self.used = 0
+        self.dirty = True
+
+        self.vertices = np.zeros((capacity, 2), dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)
+
+        self.vertex_buffer = ctx.buffer(data=self.vertices, usage="dynamic")
+        self.color_buffer = ctx.buffer(data=self.colors, usage="dynamic")
+        self.geometry = ctx.geometry([
+            BufferDescription(self.vertex_buffer, "2f", ["in_vert"]),
+            BufferDescription(self.color_buffer, "4f1", ["in_color"], normalized=["in_color"]),
+        ])
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["u_offset"] = (0.0, 0.0)
+
+    def allocate(self, count):
+        """Резервирует count вершин и возвращает их срез"""
+        if self.used + count > self.capacity:
+            raise ValueError(f"Пакет фигур переполнен: нужно {self.used + count}, "
+                             f"емкость {self.capacity}")
+        slot = slice(self.used, self.used + count)
+        self.used += count
+        return slot
+
+    def add_rect(self):
+        return self.allocate(6)
+
+    def add_arc(self, segments=CIRCLE_SEGMENTS):
+        return self.allocate(segments * 3)
+
+    def add_ring(self, segments=CIRCLE_SEGMENTS):
+        return self.allocate(segments * 6)
+
+    def add_polygon(self, corners):
+        return self.allocate((corners - 2) * 3)
+
+    def add_outline(self, corners):
+        return self.allocate(corners * 6)
+
+    def set_rect(self, slot, center_x, center_y, width, height, color):
+        """Прямоугольник по центру и размерам"""
+        left, right = center_x - width / 2, center_x + width / 2
+        bottom, top = center_y - height / 2, center_y + height / 2
+        self._write(slot, _quads(np.array([[left, bottom]]), np.array([[right, bottom]]),
+                                 np.array([[right, top]]), np.array([[left, top]])), color)
+
+    def set_arc(self, slot, center_x, center_y, radius, start_angle, end_angle, color):
+        """Сектор круга; углы в градусах против часовой стрелки от оси X"""
+        edge = _circle_points(center_x, center_y, radius, start_angle, end_angle,
+                              (slot.stop - slot.start) // 3)
+        triangles = np.empty((len(edge) - 1, 3, 2), dtype=np.float32)
+        triangles[:, 0] = (center_x, center_y)
+        triangles[:, 1] = edge[:-1]
+        triangles[:, 2] = edge[1:]
+        self._write(slot, triangles, color)
+
+    def set_ring(self, slot, center_x, center_y, radius, thickness, color):
+        """Контур круга заданной толщины"""
+        segments = (slot.stop - slot.start) // 6
+        inner = _circle_points(center_x, center_y, radius - thickness / 2, 0, 360, segments)
+        outer = _circle_points(center_x, center_y, radius + thickness / 2, 0, 360, segments)
+        self._write(slot, _quads(inner[:-1], inner[1:], outer[1:], outer[:-1]), color)
+
+    def set_polygon(self, slot, points, color):
+        """Выпуклый многоугольник (веер треугольников)"""
+        points = np.asarray(points, dtype=np.float32)
+        triangles = np.empty((len(points) - 2, 3, 2), dtype=np.float32)
+        triangles[:, 0] = points[0]
+        triangles[:, 1] = points[1:-1]
+        triangles[:, 2] = points[2:]
+        self._write(slot, triangles, color)
+
+    def set_outline(self, slot, points, thickness, color):
+        """Замкнутый контур многоугольника: по прямоугольнику на ребро"""
+        start = np.asarray(points, dtype=np.float32)
+        end = np.roll(start, -1, axis=0)
+        direction = end - start
+        normal = np.column_stack((-direction[:, 1], direction[:, 0]))
+        normal *= (thickness / 2) / np.linalg.norm(normal, axis=1, keepdims=True)
+        self._write(slot, _quads(start - normal, end - normal, end + normal, start + normal), color)
+
+    def hide(self, slot):
+        """Скрывает фигуру (вырожденные треугольники)"""
+        self.vertices[slot] = 0
+        self.dirty = True
+
+    def _write(self, slot, vertices, color):
+        self.vertices[slot] = np.reshape(vertices, (-1, 2))
+        self.colors[slot] = color if len(color) == 4 else (*color, 255)
+        self.dirty = True
+
+    def draw(self, offset=(0.0, 0.0)):
+        """Рисует все фигуры одним вызовом со сдвигом offset"""
+        if self.dirty:
+            self.vertex_buffer.write(self.vertices)
+            self.color_buffer.write(self.colors)
+            self.dirty = False
+
+        self.program["u_offset"] = offset
+        self.geometry.render(self.program, mode=self.ctx.TRIANGLES, vertices=self.used)
+
+
+def _circle_points(center_x, center_y, radius, start_angle, end_angle, segments):
+    """segments + 1 точек дуги окружности"""
+    angles = np.radians(np.linspace(start_angle, end_angle, segments + 1))
+    return np.column_stack((center_x + radius * np.cos(angles),
+                            center_y + radius * np.sin(angles)))
+
+
+def _quads(a, b, c, d):
+    """Четырехугольники a-b-c-d как пары треугольников"""
+    return np.stack((a, b, c, a, c, d), axis=1)
+
+
+def make_label(batch, x, y, color, font_size, anchor_x="left", anchor_y="baseline"):
+    """Постоянная подпись в пакете; цвет RGB или RGBA"""
+    return pyglet.text.Label(
+        "", x=x, y=y, font_name=FONT_NAME, font_size=font_size,
+        color=color if len(color) == 4 else (*color, 255),
+        anchor_x=anchor_x, anchor_y=anchor_y, batch=batch
+    )
+
+
+def set_label(label, text, color=None):
+    """Меняет подпись только при изменении (перестройка текста дорогая)"""
+    if label.text != text:
+        label.text = text
+    if color is not None:
+        color = color if len(color) == 4 else (*color, 255)
+        if label.color != color:
+            label.color = color
+
+
+def draw_labels(ctx, batch, offset=(0.0, 0.0)):
+    """Рисует пакет подписей pyglet одним вызовом со сдвигом offset"""
+    with ctx.pyglet_rendering():
+        if offset != (0.0, 0.0):
+            ctx.window.view = Mat4.from_translation((offset[0], offset[1], 0))
+        batch.draw()
+
+
+# Цвета кораблей без текстуры по номеру игрока
+PLAYER_COLORS = ((100, 150, 255), (100, 255, 150))
+
+
+class PlayerOverlay:
+    """Корабль без текстуры и индикаторы над ним в координатах корабля"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.shapes = ShapeBatch(ctx)
+
+        # Порядок резервирования - порядок отрисовки
+        self.body = self.shapes.add_polygon(3)
+        self.outline = self.shapes.add_outline(3)
+        self.hit = self.shapes.add_arc()
+        self.heat_bar = self.shapes.add_rect()
+        self.heat_fill = self.shapes.add_rect()
+        self.super_ring = self.shapes.add_ring()
+        self.super_fill = self.shapes.add_arc()
+        self.health_bar = self.shapes.add_rect()
+        self.health_fill = self.shapes.add_rect()
+
+        self.labels = pyglet.graphics.Batch()
+        self.heat_label = make_label(self.labels, 0, -55, (255, 50, 50), 10, anchor_x="center")
+        self.super_label = make_label(self.labels, 0, -60, (255, 255, 255), 10,
+                                      anchor_x="center", anchor_y="center")
+        self.health_label = make_label(self.labels, 0, 55, (255, 255, 255), 10, anchor_x="center")
+
+        self._key = None  # Значения, по которым построена геометрия
+
+    def draw(self, state, body=True, overlays=True):
+        """
+        Args:
+            state: Снимок состояния игрока (PlayerState)
+            body: Рисовать ли треугольный корабль (нет текстуры)
+            overlays: Рисовать ли индикаторы над кораблем
+        """
+        hit_alpha = int(150 * (state.hit_flash_timer / 0.3)) if state.hit_flash_timer > 0 else 0
+        key = (body, overlays, state.slot, state.hp, state.max_hp, int(state.heat), state.overheated,
+               state.super_shot_ready, int(state.super_shot_charge), hit_alpha)
+        if key != self._key:
+            self._key = key
+            self.rebuild(state, body, overlays, hit_alpha)
+
+        offset = (state.center_x, state.center_y)
+        self.shapes.draw(offset)
+        if overlays:
+            draw_labels(self.ctx, self.labels, offset)
+
+    def rebuild(self, state, body, overlays, hit_alpha):
+        """Перестраивает вершины и подписи под новые значения"""
+        shapes = self.shapes
+
+        if body:
+            # Треугольник носом вверх, цвет зависит от перегрева
+            points = ((0, 30), (-25, -20), (25, -20))
+            if state.overheated:
+                color = (255, 100, 100)  # Красный при перегреве
+            elif state.heat > 50:
+                color = (255, 200, 100)  # Оранжевый при нагреве
+            else:
+                color = PLAYER_COLORS[state.slot % len(PLAYER_COLORS)]  # Цвет игрока
+            shapes.set_polygon(self.body, points, color)
+            shapes.set_outline(self.outline, points, 2, (255, 255, 255))
+        else:
+            shapes.hide(self.body)
+            shapes.hide(self.outline)
+
+        # Эффект мигания при получении урона
+        if hit_alpha > 0:
+            shapes.set_arc(self.hit, 0, 0, 40, 0, 360, (255, 50, 50, hit_alpha))
+        else:
+            shapes.hide(self.hit)
+
+        if not overlays:
+            for slot in (self.heat_bar, self.heat_fill, self.super_ring, self.super_fill,
+                         self.health_bar, self.health_fill):
+                shapes.hide(slot)
+            return
+
+        # Индикатор перегрева
+        bar_width, bar_height = 60, 6
+        x, y = -bar_width // 2, -40
+        if state.heat > 0:
+            fill_width = bar_width * (state.heat / 100)
+            shapes.set_rect(self.heat_bar, x + bar_width // 2, y, bar_width, bar_height, (50, 50, 50))
+            shapes.set_rect(self.heat_fill, x + fill_width // 2, y, fill_width, bar_height,
+                            (255, int(255 * (1 - state.heat / 100)), 50))
+        else:
+            shapes.hide(self.heat_bar)
+            shapes.hide(self.heat_fill)
+        set_label(self.heat_label, "ПЕРЕГРЕВ!" if state.heat > 0 and state.overheated else "")
+
+        # Индикатор супер-выстрела
+        radius = 20
+        y = -60
+        shapes.set_ring(self.super_ring, 0, y, radius, 2, (100, 100, 100))
+        if state.super_shot_ready:
+            shapes.set_arc(self.super_fill, 0, y, radius - 2, 0, 360, (50, 255, 100))
+            set_label(self.super_label, "S", (0, 0, 0))
+            self.super_label.font_size = 12
+        else:
+            shapes.set_arc(self.super_fill, 0, y, radius - 2,
+                           0, 360 * (state.super_shot_charge / 100), (50, 200, 255))
+            set_label(self.super_label, f"{int(state.super_shot_charge)}%", (255, 255, 255))
+            self.super_label.font_size = 10
+
+        # Полоска здоровья
+        bar_width, bar_height = 60, 8
+        x, y = -bar_width // 2, 45
+        health = state.hp / state.max_hp
+        health_width = bar_width * health
+        shapes.set_rect(self.health_bar, x + bar_width // 2, y, bar_width, bar_height, (50, 50, 50))
+        shapes.set_rect(self.health_fill, x + health_width // 2, y, health_width, bar_height,
+                        (int(255 * (1 - health)), int(255 * health), 50))
+        set_label(self.health_label, f"HP: {state.hp}/{state.max_hp}")
+
+
+class HudOverlay:
+    """Нижняя панель (HP, перегрев, время, супер-выстрел) и статистика вверху"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.shapes = ShapeBatch(ctx)
+
+        self.ui_height = 80
+        self.ui_y = self.ui_height // 2
+        self.hp_x = 100
+        self.heat_x = SCREEN_WIDTH // 4
+        self.time_x = SCREEN_WIDTH // 2 + 100
+        self.super_x = SCREEN_WIDTH - 150
+
+        # Фон панели не меняется
+        self.panel = self.shapes.add_rect()
+        self.shapes.set_rect(self.panel, SCREEN_WIDTH // 2, self.ui_y,
+                             SCREEN_WIDTH, self.ui_height, (30, 30, 60, 200))
+        self.hp_bar = self.shapes.add_rect()
+        self.hp_fill = self.shapes.add_rect()
+        self.heat_bar = self.shapes.add_rect()
+        self.heat_fill = self.shapes.add_rect()
+        self.super_ring = self.shapes.add_ring()
+        self.super_fill = self.shapes.add_arc()
+
+        self.labels = pyglet.graphics.Batch()
+        white, gray, light_gray = arcade.color.WHITE, arcade.color.GRAY, arcade.color.LIGHT_GRAY
+        ui_y = self.ui_y
+        self.hp_label = make_label(self.labels, self.hp_x, ui_y, white, 20, "center", "center")
+        self.heat_label = make_label(self.labels, self.heat_x, ui_y, white, 20, "center", "center")
+        self.time_label = make_label(self.labels, self.time_x, ui_y, white, 20, "center", "center")
+        self.super_label = make_label(self.labels, self.super_x, ui_y, white, 20, "center", "center")
+        self.score_label = make_label(self.labels, 20, SCREEN_HEIGHT - 30, white, 24)
+        self.kills_label = make_label(self.labels, 20, SCREEN_HEIGHT - 60, light_gray, 18)
+        self.asteroids_label = make_label(self.labels, 20, SCREEN_HEIGHT - 90, light_gray, 18)
+        self.fps_label = make_label(self.labels, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 30, gray, 16)
+        self.latency_label = make_label(self.labels, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 50, gray, 12)
+        self.coop_label = make_label(self.labels, 20, SCREEN_HEIGHT - 115, light_gray, 14)
+
+        self._key = None
+
+    def draw(self, snapshot, fps, latency_ms):
+        """
+        Args:
+            snapshot: Снимок состояния игры (RenderSnapshot)
+            fps: Текущая частота кадров
+            latency_ms: Средняя задержка ввода (мс)
+        """
+        # Нижняя панель - первого живого игрока, остальные видны над кораблями
+        player = next((state for state in snapshot.players if state.hp > 0), None)
+        if player:
+            key = (player.hp, player.max_hp, int(player.heat),
+                   player.super_shot_ready, int(player.super_shot_charge))
+        else:
+            key = None
+        if key != self._key:
+            self._key = key
+            self.rebuild(player)
+
+        if player:
+            set_label(self.time_label, f"Время: {snapshot.game_time:.1f}с")
+        set_label(self.score_label, f"СЧЕТ: {snapshot.score}")
+        set_label(self.kills_label, f"ВРАГОВ: {snapshot.enemies_killed}")
+        set_label(self.asteroids_label, f"АСТЕРОИДОВ: {snapshot.asteroids_destroyed}")
+        set_label(self.fps_label, f"FPS: {int(fps)}")
+        set_label(self.latency_label, f"Ввод: {latency_ms:.0f} мс")
+        if len(snapshot.players) > 1:
+            set_label(self.coop_label, "   ".join(
+                f"P{state.slot + 1}: {state.score}" for state in snapshot.players))
+        else:
+            set_label(self.coop_label, "")
+
+        self.shapes.draw()
+        draw_labels(self.ctx, self.labels)
+
+    def rebuild(self, player):
+        """Перестраивает полоски и подписи под новые значения"""
+        shapes = self.shapes
+        bars = (self.hp_bar, self.hp_fill, self.heat_bar, self.heat_fill,
+                self.super_ring, self.super_fill)
+        if not player:
+            for slot in bars:
+                shapes.hide(slot)
+            for label in (self.hp_label, self.heat_label, self.time_label, self.super_label):
+                set_label(label, "")
+            return
+
+        bar_width, bar_height = 150, 15
+        bar_y = self.ui_y - 25
+
+        # 1. HP игрока
+        hp_percent = player.hp / player.max_hp
+        set_label(self.hp_label, f"HP: {player.hp}/{player.max_hp}")
+        shapes.set_rect(self.hp_bar, self.hp_x, bar_y, bar_width, bar_height, (50, 50, 50))
+        shapes.set_rect(self.hp_fill,
+                        self.hp_x - bar_width // 2 + (bar_width * hp_percent) // 2, bar_y,
+                        bar_width * hp_percent, bar_height,
+                        (int(255 * (1 - hp_percent)), int(255 * hp_percent), 50))
+
+        # 2. Уровень перегрева
+        heat = player.heat / 100
+        set_label(self.heat_label, f"Перегрев: {int(player.heat)}%")
+        shapes.set_rect(self.heat_bar, self.heat_x, bar_y, bar_width, bar_height, (50, 50, 50))
+        shapes.set_rect(self.heat_fill,
+                        self.heat_x - bar_width // 2 + (bar_width * heat) // 2, bar_y,
+                        bar_width * heat, bar_height,
+                        (255, int(255 * (1 - heat)), 50))
+
+        # 4. Заряд супер-выстрела с круговой шкалой
+        if player.super_shot_ready:
+            set_label(self.super_label, "СУПЕР ГОТОВ!", arcade.color.GREEN)
+            shapes.hide(self.super_ring)
+            shapes.hide(self.super_fill)
+        else:
+            set_label(self.super_label, f"Супер: {int(player.super_shot_charge)}%", arcade.color.YELLOW)
+            radius = 15
+            shapes.set_ring(self.super_ring, self.super_x, bar_y, radius, 2, arcade.color.YELLOW)
+            shapes.set_arc(self.super_fill, self.super_x, bar_y, radius,
+                           0, 360 * (player.super_shot_charge / 100), (100, 200, 255))
@@ -0,0 +1,225 @@
+"""
+Система частиц для взрывов и эффектов попаданий
+Все частицы хранятся в заранее выделенных массивах NumPy, обновляются
+несколькими векторными операциями и рисуются одним вызовом на GPU
+"""
+
+import numpy as np
+from arcade.gl import BufferDescription
+
+from src.constants import PARTICLE_CAPACITY
+
+
+# Шейдеры: частица - круглая точка, прозрачность падает к концу жизни
+VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+uniform float u_scale;
+
+in vec4 in_state;  // x, y, доля оставшейся жизни, размер
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = proj.matrix * vec4(in_state.xy, 0.0, 1.0);
+    // Мертвые частицы имеют нулевой размер и не растеризуются
+    gl_PointSize = in_state.z > 0.0 ? in_state.w * u_scale : 0.0;
+    v_color = vec4(in_color.rgb, in_color.a * in_state.z);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+out vec4 out_color;
+
+void main() {
+    vec2 d = gl_PointCoord - vec2(0.5);
+    if (dot(d, d) > 0.25) {
+        discard;
+    }
+    out_color = v_color;
+}
+"""
+
+# Пресеты излучателей: количество, цвет, скорость, время жизни, размер
+EMITTERS = {
+    "enemy_kill": {
+        "count": 60, "color": (255, 80, 170, 255),
+        "speed": (60, 260), "life": (0.4, 0.9), "size": (2.0, 5.0),
+    },
+    "asteroid_hit": {
+        "count": 12, "color": (190, 190, 190, 255),
+        "speed": (30, 120), "life": (0.2, 0.5), "size": (2.0, 3.0),
+    },
+    "asteroid_destroyed": {
+        "count": 120, "color": (170, 160, 150, 255),
+        "speed": (40, 200), "life": (0.6, 1.4), "size": (2.0, 6.0),
+    },
+    "player_hit": {
+        "count": 80, "color": (255, 60, 60, 255),
+        "speed": (80, 300), "life": (0.3, 0.7), "size": (2.0, 4.0),
+    },
+    "super_shot": {
+        "count": 50, "color": (255, 255, 120, 255),
+        "speed": (40, 180), "life": (0.2, 0.5), "size": (2.0, 4.0),
+    },
+}
+
+# Затухание скорости частиц (доля скорости, остающаяся через секунду)
+PARTICLE_DRAG = 0.25
+
+
+class ParticleSystem:
+    """
+    Пул частиц фиксированной емкости.
+    Живые частицы лежат плотно в начале массивов от старых к новым:
+    мертвые удаляются сдвигом, при переполнении вытесняются самые старые.
+    """
+
+    def __init__(self, ctx, capacity=PARTICLE_CAPACITY):
+        self.ctx = ctx
+        self.capacity = capacity
+        self.emission_scale = 1.0  # Множитель количества частиц (для снижения качества)
+
+        # Состояние для GPU: x, y, доля оставшейся жизни, размер
+        self.state = np.zeros((capacity, 4), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+
+        self.count = 0  # Живых частиц в начале массивов
+        self._color_dirty = False
+        self._color_copy = None  # Копия цветов для снимков, обновляется после вспышек
+        self._uploaded_color = None  # Какая копия цветов сейчас лежит на GPU
+        self._rng = np.random.default_rng()
+
+        # Буферы и геометрия на GPU
+        self.state_buffer = ctx.buffer(data=self.state, usage="stream")
+        self.color_buffer = ctx.buffer(data=self.color, usage="dynamic")
+        self.geometry = ctx.geometry([
+            BufferDescription(self.state_buffer, "4f", ["in_state"]),
+            BufferDescription(self.color_buffer, "4f1", ["in_color"], normalized=["in_color"]),
+        ])
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["u_scale"] = 1.0
+
+    @property
+    def live_count(self):
+        """Количество живых частиц"""
+        return self.count
+
+    def clear(self):
+        """Удаляет все частицы"""
+        self.count = 0
+        self._color_dirty = True
+
+    def emit(self, name, x, y):
+        """Запускает излучатель из пресета EMITTERS в точке (x, y)"""
+        preset = EMITTERS[name]
+        count = int(preset["count"] * self.emission_scale)
+        if count > 0:
+            self.emit_burst(x, y, count, preset["color"], preset["speed"],
+                            preset["life"], preset["size"])
+
+    def emit_burst(self, x, y, count, color, speed, life, size):
+        """
+        Выпускает count частиц во все стороны из точки (x, y)
+
+        Args:
+            color: Цвет RGBA
+            speed, life, size: Диапазоны (min, max) для случайных значений
+        """
+        count = min(count, self.capacity)
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            self._compact(slice(overflow, self.count))
+        index = slice(self.count, self.count + count)
+        self.count += count
+
+        angle = self._rng.uniform(0.0, 2.0 * np.pi, count)
+        velocity = self._rng.uniform(speed[0], speed[1], count)
+        lifetime = self._rng.uniform(life[0], life[1], count).astype(np.float32)
+
+        self.velocity[index, 0] = np.cos(angle) * velocity
+        self.velocity[index, 1] = np.sin(angle) * velocity
+        self.life[index] = lifetime
+        self.max_life[index] = lifetime
+        self.state[index, 0] = x
+        self.state[index, 1] = y
+        self.state[index, 2] = 1.0
+        self.state[index, 3] = self._rng.uniform(size[0], size[1], count)
+        self.color[index] = color
+        self._color_dirty = True
+
+    def update(self, delta_time):
+        """Двигает живые частицы, уменьшает их время жизни и удаляет погасшие"""
+        n = self.count
+        if not n:
+            return
+        self.state[:n, 0:2] += self.velocity[:n] * delta_time
+        self.velocity[:n] *= PARTICLE_DRAG ** delta_time
+        self.life[:n] -= delta_time
+        np.maximum(self.life[:n], 0.0, out=self.life[:n])
+        np.divide(self.life[:n], self.max_life[:n], out=self.state[:n, 2])
+
+        alive = self.life[:n] > 0
+        if not alive.all():
+            self._compact(alive)
+
+    def _compact(self, keep):
+        """Оставляет частицы keep (маска или срез по живым) в начале массивов"""
+        n = self.count
+        for array in (self.state, self.velocity, self.life, self.max_life, self.color):
+            kept = array[:n][keep]
+            array[:len(kept)] = kept
+        self.count = len(kept)
+        self._color_dirty = True
+
+    def snapshot(self, copy=True):
+        """
+        Данные живых частиц для отрисовки
+
+        Args:
+            copy: Копировать состояние (для отрисовки из другого потока);
+                False - представление массива, действительное до следующего тика
+
+        Returns:
+            (состояние, цвета); цвета копируются только после вспышек и удалений
+        """
+        n = self.count
+        if self._color_dirty or self._color_copy is None:
+            self._color_copy = self.color[:n].copy()
+            self._color_dirty = False
+        state = self.state[:n]
+        return (state.copy() if copy else state), self._color_copy
+
+    def draw(self, scale=1.0, snapshot=None):
+        """
+        Рисует все частицы одним вызовом
+
+        Args:
+            scale: Масштаб внутреннего разрешения для размера частиц
+            snapshot: Данные из snapshot(); по умолчанию текущее состояние
+        """
+        state, color = snapshot if snapshot is not None else self.snapshot(copy=False)
+        if not len(state):
+            return
+        self.state_buffer.write(state)
+        if color is not self._uploaded_color:
+            self.color_buffer.write(color)
+            self._uploaded_color = color
+
+        self.program["u_scale"] = scale
+        with self.ctx.enabled(self.ctx.PROGRAM_POINT_SIZE):
+            # Аддитивное смешивание (SRC_ALPHA, ONE) - вспышки светятся при наложении
+            self.ctx.blend_func = self.ctx.BLEND_PREMULTIPLIED_ALPHA
+            self.geometry.render(self.program, mode=self.ctx.POINTS, vertices=len(state))
+            self.ctx.blend_func = self.ctx.BLEND_DEFAULT
@@ -2,33 +2,68 @@
 Класс игрока (космического корабля)
 """
 
+import math
+from collections import namedtuple
+
 import arcade
-import time
 
 from src.bullet import Bullet
-from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SPEED
+from src.log import get_logger
+from src.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SPEED, BASE_FPS,
+                           HOMING_SUPER_SHOT, AIM_ASSIST, AIM_ASSIST_ANGLE)
+
+logger = get_logger("player")
+
+
+# Состояние игрока, нужное для отрисовки (снимок для потока отрисовки)
+PlayerState = namedtuple("PlayerState", [
+    "center_x", "center_y", "hp", "max_hp", "heat", "overheated",
+    "super_shot_ready", "super_shot_charge", "hit_flash_timer",
+    "slot", "score",
+])
 
 
 class Player(arcade.Sprite):
     """Класс космического корабля игрока"""
 
-    def __init__(self):
+    def __init__(self, clock, assets, targets=None, slot=0, start_x=None):
+        """
+        Args:
+            clock: Игровые часы (GameClock) для перезарядки выстрелов
+            assets: Менеджер ресурсов (AssetManager) с текстурами
+            targets: Сетка целей (TargetIndex) для наведения; None - без наведения
+            slot: Номер игрока (0 - первый)
+            start_x: Начальная позиция по X (None - центр экрана)
+        """
         # Вызываем конструктор родительского класса
         super().__init__()
+        self.clock = clock
+        self.assets = assets
+        self.targets = targets
+        self.homing_super_shot = HOMING_SUPER_SHOT
+        self.aim_assist = AIM_ASSIST
 
         # Основные характеристики
-        self.center_x = SCREEN_WIDTH // 2  # Начальная позиция по X
+        self.slot = slot
+        self.start_x = start_x if start_x is not None else SCREEN_WIDTH // 2
+        self.center_x = self.start_x  # Начальная позиция по X
         self.center_y = 50  # Начальная позиция по Y (внизу)
         self.scale = 0.5  # Масштаб спрайта
-        self.speed = PLAYER_SPEED  # Скорость движения
+        self.speed = PLAYER_SPEED  # Скорость движения (пикс/кадр при BASE_FPS)
 
         # Здоровье
         self.max_hp = 5
         self.hp = self.max_hp
         self.is_alive = True
 
+        # Личная статистика (в совместной игре)
+        self.score = 0
+        self.enemies_killed = 0
+        self.asteroids_destroyed = 0
+
         # Стрельба
         self.bullets = []  # Список активных пуль
+        self.unaimed = []  # Выстрелы этого тика, ждущие наведения по свежей сетке целей
         self.can_shoot = True  # Может ли стрелять сейчас
         self.shoot_cooldown = 0.3  # КД между выстрелами (сек)
         self.last_shot_time = 0  # Время последнего выстрела
@@ -56,182 +91,47 @@ class Player(arcade.Sprite):
         self.load_textures()
 
     def load_textures(self):
-        """Загружает или создает текстуры корабля"""
-        try:
-            # Пробуем загрузить изображение
-            self.texture = arcade.load_texture("assets/images/player.png")
-            print("✓ Текстура игрока загружена")
-        except FileNotFoundError:
-            # Создаем временную текстуру (треугольник)
-            print("⚠ Текстура игрока не найдена, создается временная")
-            self.create_temp_texture()
-
-    def create_temp_texture(self):
-        """Создает временную текстуру треугольника"""
-        # Создаем изображение для треугольника
-        width = 50
-        height = 60
-
-        texture = arcade.Texture.create_empty(f"player_temp", (width, height))
-        self.texture = texture
-
-        # Примечание: Временная графика будет нарисована в методе draw()
-
-    def draw(self):
-        """Отрисовка игрока с дополнительными эффектами"""
-        # Отрисовка базового спрайта
-        super().draw()
-
-        # Если нет текстуры, рисуем треугольник
-        if self.texture.size == (1, 1):  # Проверка на пустую текстуру
-            self.draw_triangle()
-
-        # Эффект мигания при получении урона
-        if self.hit_flash_timer > 0:
-            self.draw_hit_effect()
-
-        # Индикатор перегрева
-        if self.heat > 0:
-            self.draw_heat_indicator()
-
-        # Индикатор супер-выстрела
-        self.draw_super_shot_indicator()
-
-        # Индикатор здоровья
-        self.draw_health_bar()
-
-        for bullet in self.bullets:
-            bullet.draw()
-
-    def draw_triangle(self):
-        """Рисует треугольный корабль"""
-        # Треугольник направленный вверх
-        point_list = (
-            (self.center_x, self.center_y + 30),  # Верхняя точка (нос)
-            (self.center_x - 25, self.center_y - 20),  # Левая нижняя
-            (self.center_x + 25, self.center_y - 20)  # Правая нижняя
-        )
-
-        # Цвет зависит от перегрева
-        if self.overheated:
-            color = (255, 100, 100)  # Красный при перегреве
-        elif self.heat > 50:
-            color = (255, 200, 100)  # Оранжевый при нагреве
-        else:
-            color = (100, 150, 255)  # Синий в нормальном состоянии
-
-        arcade.draw_polygon_filled(point_list, color)
-
-        # Контур
-        arcade.draw_polygon_outline(point_list, (255, 255, 255), 2)
-
-    def draw_hit_effect(self):
-        """Рисует эффект получения урона"""
-        alpha = int(150 * (self.hit_flash_timer / 0.3))
-        arcade.draw_circle_filled(
-            self.center_x, self.center_y,
-            40, (255, 50, 50, alpha)
-        )
-
-    def draw_heat_indicator(self):
-        """Рисует индикатор перегрева"""
-        # Фон индикатора
-        bar_width = 60
-        bar_height = 6
-        x = self.center_x - bar_width // 2
-        y = self.center_y - 40
-
-        arcade.draw_rectangle_filled(
-            x + bar_width // 2, y,
-            bar_width, bar_height,
-            (50, 50, 50)
-        )
-
-        # Заполненная часть
-        fill_width = bar_width * (self.heat / 100)
-        color = (
-            255,  # R увеличивается с нагревом
-            int(255 * (1 - self.heat / 100)),  # G уменьшается
-            50  # B постоянный
-        )
-
-        arcade.draw_rectangle_filled(
-            x + fill_width // 2, y,
-            fill_width, bar_height,
-            color
-        )
-
-        # Текст перегрева
-        if self.overheated:
-            arcade.draw_text(
-                "ПЕРЕГРЕВ!",
-                self.center_x, y - 15,
-                (255, 50, 50), 10,
-                anchor_x="center"
-            )
-
-    def draw_super_shot_indicator(self):
-        """Рисует индикатор супер-выстрела"""
-        # Круговая шкала заряда
-        radius = 20
-        x = self.center_x
-        y = self.center_y - 60
-
-        # Фон
-        arcade.draw_circle_outline(x, y, radius, (100, 100, 100), 2)
-
-        if self.super_shot_ready:
-            # Готов - зеленый заполненный круг
-            arcade.draw_circle_filled(x, y, radius - 2, (50, 255, 100))
-            arcade.draw_text("S", x, y, (0, 0, 0), 12, anchor_x="center", anchor_y="center")
-        else:
-            # Заряжается - частично заполненный круг
-            angle = 360 * (self.super_shot_charge / 100)
-            arcade.draw_arc_filled(
-                x, y, radius - 2,
-                (50, 200, 255), 0, angle
-            )
-            # Процент заряда
-            arcade.draw_text(
-                f"{int(self.super_shot_charge)}%",
-                x, y, (255, 255, 255), 10,
-                anchor_x="center", anchor_y="center"
+        """Берет текстуру корабля из кэша ресурсов (без обращения к диску)"""
+        self.texture = self.assets.acquire("player")
+        # Вместо отсутствующего файла выдается пустая заглушка нужного размера,
+        # а корабль рисуется треугольником в методе draw()
+        self.has_texture = not self.assets.is_missing("player")
+
+    def release_textures(self):
+        """Возвращает текстуры в кэш ресурсов (игрок больше не нужен)"""
+        self.assets.release("player")
+
+    def draw(self, overlay, overlays=True, state=None):
+        """
+        Отрисовка игрока с дополнительными эффектами
+
+        Args:
+            overlay: Пакет геометрии индикаторов (PlayerOverlay); хранится
+                     в окне по номеру игрока и переживает перезапуск игры
+            overlays: Рисовать ли индикаторы над кораблем (при низком
+                      качестве остается только корабль и эффект попадания)
+            state: Снимок состояния (PlayerState); по умолчанию текущее
+        """
+        if state is None:
+            state = self.get_render_state()
+
+        # Отрисовка базового спрайта в позиции из снимка
+        if self.has_texture:
+            arcade.draw_texture_rectangle(
+                state.center_x, state.center_y,
+                self.width, self.height, self.texture
             )
 
-    def draw_health_bar(self):
-        """Рисует полоску здоровья"""
-        bar_width = 60
-        bar_height = 8
-        x = self.center_x - bar_width // 2
-        y = self.center_y + 45
-
-        # Фон
-        arcade.draw_rectangle_filled(
-            x + bar_width // 2, y,
-            bar_width, bar_height,
-            (50, 50, 50)
-        )
-
-        # Здоровье
-        health_width = bar_width * (self.hp / self.max_hp)
-        health_color = (
-            int(255 * (1 - self.hp / self.max_hp)),  # R увеличивается при малом HP
-            int(255 * (self.hp / self.max_hp)),  # G уменьшается
-            50
-        )
-
-        arcade.draw_rectangle_filled(
-            x + health_width // 2, y,
-            health_width, bar_height,
-            health_color
-        )
+        # Треугольник (если нет текстуры), вспышка урона и индикаторы -
+        # один постоянный пакет геометрии
+        overlay.draw(state, body=not self.has_texture, overlays=overlays)
 
-        # Текст здоровья
-        arcade.draw_text(
-            f"HP: {self.hp}/{self.max_hp}",
-            x + bar_width // 2, y + 10,
-            (255, 255, 255), 10,
-            anchor_x="center"
+    def get_render_state(self):
+        """Снимок состояния для отрисовки"""
+        return PlayerState(
+            self.center_x, self.center_y, self.hp, self.max_hp, self.heat, self.overheated,
+            self.super_shot_ready, self.super_shot_charge, self.hit_flash_timer,
+            self.slot, self.score
         )
 
     def update(self, delta_time):
@@ -240,7 +140,7 @@ class Player(arcade.Sprite):
             return
 
         # Обновляем таймеры
-        current_time = time.time()
+        current_time = self.clock.time
 
         # Обработка перезарядки выстрела
         if not self.can_shoot and current_time - self.last_shot_time > self.shoot_cooldown:
@@ -278,15 +178,28 @@ class Player(arcade.Sprite):
             if not bullet.active:
                 self.bullets.remove(bullet)
 
-    def move_left(self):
+    def move(self, direction, delta_time):
+        """
+        Двигает корабль по горизонтали пропорционально времени кадра
+
+        Args:
+            direction: -1 влево, 1 вправо
+            delta_time: Время тика (сек)
+        """
+        if not self.is_alive:
+            return
+
+        self.center_x += direction * self.speed * BASE_FPS * delta_time
+        # Не выходим за границы экрана
+        self.center_x = min(max(self.center_x, 30), SCREEN_WIDTH - 30)
+
+    def move_left(self, delta_time=1 / BASE_FPS):
         """Двигает корабль влево"""
-        if self.is_alive and self.center_x > 30:  # Не выходим за левую границу
-            self.center_x -= self.speed
+        self.move(-1, delta_time)
 
-    def move_right(self):
+    def move_right(self, delta_time=1 / BASE_FPS):
         """Двигает корабль вправо"""
-        if self.is_alive and self.center_x < SCREEN_WIDTH - 30:  # Не выходим за правую границу
-            self.center_x += self.speed
+        self.move(1, delta_time)
 
     def shoot(self):
         """Совершает обычный выстрел"""
@@ -299,12 +212,14 @@ class Player(arcade.Sprite):
             self.overheat_flash_timer = 0.5
             return None
 
-        # Создаем обычную пулю
+        # Создаем обычную пулю; направление - после перестройки сетки целей в этом тике
         bullet = Bullet(self.center_x, self.center_y + 30, is_super=False)
         self.bullets.append(bullet)
+        if self.aim_assist and self.targets is not None:
+            self.unaimed.append(bullet)
 
         # Обновляем таймеры и перегрев
-        self.last_shot_time = time.time()
+        self.last_shot_time = self.clock.time
         self.can_shoot = False
         self.heat += self.heat_per_shot
         self.heat = min(self.heat, self.max_heat)
@@ -322,7 +237,8 @@ class Player(arcade.Sprite):
             return None
 
         # Создаем супер-пулю
-        bullet = Bullet(self.center_x, self.center_y + 30, is_super=True)
+        bullet = Bullet(self.center_x, self.center_y + 30, is_super=True,
+                        homing=self.homing_super_shot and self.targets is not None)
         self.bullets.append(bullet)
 
         # Сбрасываем заряд
@@ -332,6 +248,30 @@ class Player(arcade.Sprite):
 
         return bullet
 
+    def aim_angle(self, x, y):
+        """Направление выстрела: вверх или на ближайшую цель в узком секторе"""
+        if not self.aim_assist or self.targets is None:
+            return 90.0
+        found = self.targets.cone(x, y, 90.0, AIM_ASSIST_ANGLE, SCREEN_HEIGHT, kind="enemy")
+        if not found:
+            return 90.0
+        target = found[0][0]
+        return math.degrees(math.atan2(target.center_y - y, target.center_x - x))
+
+    def steer_bullets(self, delta_time):
+        """
+        Наводит выстрелы этого тика и доворачивает самонаводящиеся пули
+        (вызывается после перестройки сетки целей)
+        """
+        if self.targets is None:
+            return
+        for bullet in self.unaimed:
+            bullet.angle = self.aim_angle(bullet.center_x, bullet.center_y)
+        self.unaimed.clear()
+        for bullet in self.bullets:
+            if bullet.homing:
+                bullet.steer(self.targets, delta_time)
+
     def take_damage(self, damage=1):
         """Наносит урон игроку"""
         if not self.is_alive:
@@ -349,11 +289,12 @@ class Player(arcade.Sprite):
         """Обрабатывает смерть игрока"""
         self.is_alive = False
         self.hp = 0
-        print("💀 Игрок уничтожен!")
+        self.bullets.clear()
+        logger.info("Игрок %d уничтожен", self.slot + 1)
 
     def reset(self):
         """Сбрасывает состояние игрока к начальному"""
-        self.center_x = SCREEN_WIDTH // 2
+        self.center_x = self.start_x
         self.center_y = 50
         self.hp = self.max_hp
         self.is_alive = True
@@ -364,6 +305,9 @@ class Player(arcade.Sprite):
         self.super_shot_charge = 100
         self.bullets.clear()
         self.can_shoot = True
+        self.score = 0
+        self.enemies_killed = 0
+        self.asteroids_destroyed = 0
 
     def get_shoot_info(self):
         """Возвращает информацию о состоянии стрельбы для UI"""
@@ -0,0 +1,121 @@
+"""
+Выборочный профайлер
+Фоновый поток на время окна записи периодически снимает стеки игровых
+потоков через sys._current_frames() и считает одинаковые стеки. Итог -
+файл в формате collapsed stacks ("main;run;on_update;... 42" - строка на
+стек), который читают flamegraph.pl, speedscope и inferno. Пока запись
+не идет, профайлер не держит ни потока, ни хуков трассировки.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from src.constants import (PROFILER_DURATION, PROFILER_INTERVAL_MS, PROFILER_DIR,
+                           PROFILER_COOLDOWN)
+from src.log import get_logger, SESSION_ID
+
+logger = get_logger("profiler")
+
+
+class SamplingProfiler:
+    """Запись стеков игровых потоков за окно фиксированной длины"""
+
+    def __init__(self, duration=PROFILER_DURATION, interval=PROFILER_INTERVAL_MS / 1000,
+                 directory=PROFILER_DIR, cooldown=PROFILER_COOLDOWN):
+        """
+        Args:
+            duration: Длина окна записи (сек)
+            interval: Период снятия стеков (сек)
+            directory: Папка для файлов профилей
+            cooldown: Пауза после записи до следующего автозапуска (сек)
+        """
+        self.duration = duration
+        self.interval = interval
+        self.directory = directory
+        self.cooldown = cooldown
+
+        self.samples = 0  # Снято стеков в текущей или последней записи
+        self.last_path = None  # Последний записанный файл
+        self._finished = -cooldown  # Время конца последней записи (perf_counter)
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def ready(self):
+        """Можно ли запустить запись автоматически (не идет и прошла пауза)"""
+        return not self.running and time.perf_counter() - self._finished >= self.cooldown
+
+    def start(self, threads, tick, reason):
+        """
+        Начинает запись
+
+        Args:
+            threads: Словарь {идентификатор потока: имя} профилируемых потоков
+            tick: Номер тика для имени файла
+            reason: Причина запуска ("hotkey", "frame", "config")
+
+        Returns:
+            True, если запись началась
+        """
+        if self.running:
+            return False
+        self._stop_event.clear()
+        self.samples = 0
+        name = f"profile_{SESSION_ID}_tick{tick}_{reason}.folded"
+        self._thread = threading.Thread(target=self._run, args=(dict(threads), name),
+                                        name="profiler", daemon=True)
+        self._thread.start()
+        logger.info("Профайлер: запись %.1f сек (%s, тик %d)", self.duration, reason, tick)
+        return True
+
+    def stop(self):
+        """Досрочно завершает запись (записанное сохраняется)"""
+        if self.running:
+            self._stop_event.set()
+            self._thread.join()
+
+    def _run(self, threads, name):
+        stacks = Counter()
+        deadline = time.perf_counter() + self.duration
+        while time.perf_counter() < deadline and not self._stop_event.is_set():
+            frames = sys._current_frames()
+            for ident, thread_name in threads.items():
+                if ident in frames:
+                    stacks[collapse(frames[ident], thread_name)] += 1
+            del frames  # Не держим кадры игровых потоков между снятиями
+            self.samples += 1
+            self._stop_event.wait(self.interval)
+
+        self._finished = time.perf_counter()
+        self.write(stacks, name)
+
+    def write(self, stacks, name):
+        """Сохраняет стеки в файл collapsed stacks"""
+        path = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            self.last_path = path
+            logger.info("Профайлер: %d снятий, %d разных стеков - %s",
+                        self.samples, len(stacks), path)
+        except OSError as e:
+            logger.error("Ошибка сохранения профиля %s: %s", path, e)
+
+
+def collapse(frame, thread_name):
+    """Стек от корня к вершине в одну строку через ';'"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
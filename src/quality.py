@@ -0,0 +1,105 @@
+"""
+Автоматическое управление качеством графики
+Следит за временем кадров и при нехватке бюджета понижает уровень
+качества, а при запасе - повышает (с гистерезисом)
+"""
+
+from collections import deque
+
+from src.constants import TARGET_FPS
+
+
+# Уровни качества от лучшего к худшему
+QUALITY_LEVELS = (
+    {"name": "Высокое", "bullet_glow": True, "player_overlays": True,
+     "particle_scale": 1.0, "render_scale": 1.0},
+    {"name": "Среднее", "bullet_glow": False, "player_overlays": True,
+     "particle_scale": 0.5, "render_scale": 1.0},
+    {"name": "Низкое", "bullet_glow": False, "player_overlays": False,
+     "particle_scale": 0.25, "render_scale": 0.75},
+    {"name": "Минимальное", "bullet_glow": False, "player_overlays": False,
+     "particle_scale": 0.1, "render_scale": 0.5},
+)
+
+
+class QualityGovernor:
+    """
+    Регулятор качества по среднему времени кадра.
+    Понижение - когда среднее превышает бюджет больше чем на downgrade_margin,
+    повышение - когда долго держится ниже upgrade_margin от бюджета.
+    """
+
+    def __init__(self, target_fps=TARGET_FPS, sample_count=60,
+                 downgrade_margin=1.15, upgrade_margin=0.7, upgrade_delay=3.0):
+        """
+        Args:
+            target_fps: Целевая частота кадров
+            sample_count: Сколько последних кадров усреднять
+            downgrade_margin: Во сколько раз среднее должно превысить бюджет
+            upgrade_margin: Доля бюджета, ниже которой можно повышать качество
+            upgrade_delay: Сколько секунд нужен запас перед повышением
+        """
+        self.budget = 1.0 / target_fps
+        self.downgrade_margin = downgrade_margin
+        self.upgrade_margin = upgrade_margin
+        self.upgrade_delay = upgrade_delay
+
+        self.level = 0
+        self.frame_times = deque(maxlen=sample_count)
+        self.headroom_time = 0.0  # Сколько секунд подряд есть запас
+
+    @property
+    def settings(self):
+        """Настройки текущего уровня"""
+        return QUALITY_LEVELS[self.level]
+
+    def average_frame_time(self):
+        """Среднее время кадра по последним замерам"""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def record(self, frame_time, interval=None):
+        """
+        Учитывает время очередного кадра
+
+        Args:
+            frame_time: Стоимость кадра (сек), сравнивается с бюджетом
+            interval: Реальное время с прошлого кадра (сек) для отсчета
+                upgrade_delay; по умолчанию равно frame_time
+
+        Returns:
+            True, если уровень качества изменился
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = self.average_frame_time()
+
+        if average > self.budget * self.downgrade_margin:
+            self.headroom_time = 0.0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                return self.set_level(self.level + 1)
+            return False
+
+        if average < self.budget * self.upgrade_margin:
+            self.headroom_time += frame_time if interval is None else interval
+            if self.headroom_time >= self.upgrade_delay and self.level > 0:
+                return self.set_level(self.level - 1)
+        else:
+            self.headroom_time = 0.0
+
+        return False
+
+    def set_level(self, level):
+        """Устанавливает уровень и начинает замеры заново"""
+        level = min(max(level, 0), len(QUALITY_LEVELS) - 1)
+        if level == self.level:
+            return False
+
+        self.level = level
+        # После смены уровня старые замеры не отражают новую нагрузку
+        self.frame_times.clear()
+        self.headroom_time = 0.0
+        return True
@@ -0,0 +1,73 @@
+"""
+Внеэкранный буфер отрисовки
+Сцена рисуется в текстуру заданного размера, затем растягивается на окно
+одним полноэкранным прямоугольником
+"""
+
+from arcade.gl import geometry
+
+
+VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+in vec2 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D u_texture;
+
+in vec2 v_uv;
+out vec4 out_color;
+
+void main() {
+    out_color = texture(u_texture, v_uv);
+}
+"""
+
+
+class RenderTarget:
+    """Текстура с фреймбуфером и вывод ее на весь экран"""
+
+    def __init__(self, ctx, size, filter="linear"):
+        """
+        Args:
+            ctx: OpenGL контекст окна
+            size: Размер текстуры (ширина, высота) в пикселях
+            filter: Фильтр при растяжении: "linear" или "nearest"
+        """
+        self.ctx = ctx
+        self.size = size
+
+        self.texture = ctx.texture(size, components=4)
+        gl_filter = ctx.NEAREST if filter == "nearest" else ctx.LINEAR
+        self.texture.filter = (gl_filter, gl_filter)
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+
+        self.quad = geometry.quad_2d_fs()
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["u_texture"] = 0
+
+    def activate(self):
+        """Контекстный менеджер: все рисование идет в текстуру"""
+        return self.framebuffer.activate()
+
+    def clear(self, color=(0, 0, 0, 255)):
+        """Очищает текстуру непрозрачным цветом"""
+        self.framebuffer.clear(color)
+
+    def draw(self):
+        """Растягивает текстуру на текущий фреймбуфер"""
+        self.texture.use(0)
+        # Без смешивания: альфа внутри текстуры не должна просвечивать
+        with self.ctx.enabled_only():
+            self.quad.render(self.program)
@@ -0,0 +1,112 @@
+"""
+Игровая симуляция в отдельном потоке
+Поток тикает с фиксированной частотой и после каждого тика публикует
+неизменяемый снимок отрисовываемого состояния. Отрисовка берет последний
+опубликованный снимок и не блокирует симуляцию.
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+
+from src.constants import UPDATE_RATE
+
+
+# Все, что нужно для отрисовки игрового кадра.
+# Когда снимок читает другой поток (симуляция в потоке, зрители), объекты
+# внутри - копии; иначе - сами живые объекты, действительные до следующего тика.
+RenderSnapshot = namedtuple("RenderSnapshot", [
+    "tick",                 # Номер тика симуляции
+    "game_time",            # Игровое время (сек)
+    "paused",
+    "score",
+    "enemies_killed",
+    "asteroids_destroyed",
+    "players",              # PlayerState всех игроков (и выбывших)
+    "enemies",              # Кортежи копий объектов
+    "asteroids",
+    "bullets",
+    "projectiles",          # (состояние, цвета) из EnemyFire.snapshot()
+    "particles",            # (состояние, цвета) из ParticleSystem.snapshot()
+    "debug",                # Строки отладки о состоянии симуляции или None
+])
+
+
+class SnapshotBuffer:
+    """
+    Двойной буфер снимков.
+    Писатель кладет новый снимок в задний слот и переключает индекс;
+    читатель всегда видит целиком собранный снимок из переднего слота.
+    """
+
+    def __init__(self):
+        self._slots = [None, None]
+        self._front = 0
+
+    @property
+    def front(self):
+        """Последний опубликованный снимок"""
+        return self._slots[self._front]
+
+    def publish(self, snapshot):
+        """Публикует снимок (присваивание индекса атомарно под GIL)"""
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        self._front = back
+
+    def clear(self):
+        """Удаляет снимки (новая игра)"""
+        self._slots = [None, None]
+        self._front = 0
+
+
+class SimulationThread(threading.Thread):
+    """
+    Поток с фиксированным шагом симуляции.
+    step(delta_time) вызывается rate раз в секунду; при отставании
+    пропущенные тики не догоняются, чтобы не уйти в спираль задержек.
+    """
+
+    def __init__(self, step, rate=UPDATE_RATE):
+        """
+        Args:
+            step: Функция одного тика, принимает шаг реального времени (сек)
+            rate: Частота тиков (Гц)
+        """
+        super().__init__(name="simulation", daemon=True)
+        self.step = step
+        self.interval = 1.0 / rate
+
+        self.game_over = False  # Игра закончилась внутри тика
+        self.tick_times = deque(maxlen=120)  # Длительности последних тиков (сек)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            tick_start = time.perf_counter()
+            self.step(self.interval)
+            self.tick_times.append(time.perf_counter() - tick_start)
+
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def stop(self, game_over=False):
+        """
+        Просит поток остановиться после текущего тика
+
+        Args:
+            game_over: Остановка из-за конца игры (завершит главный поток)
+        """
+        self.game_over = game_over
+        self._stop_event.set()
+
+    def average_tick_time(self):
+        """Среднее время тика по последним замерам (сек)"""
+        if not self.tick_times:
+            return 0.0
+        return sum(self.tick_times) / len(self.tick_times)
@@ -0,0 +1,247 @@
+"""
+Планировщик появления врагов и астероидов
+Очередь событий по времени (heapq): постоянный поток, залпы, формации,
+сценарные волны из JSON файла или записи скомпилированного уровня (src.levels)
+"""
+
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+
+from src.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SPAWN_RATE,
+                           ASTEROID_SPAWN_RATE, WAVES_FILE, LEVEL_LOOKAHEAD)
+from src.lifecycle import ENTITY_CLASSES
+from src.log import get_logger
+
+logger = get_logger("spawner")
+
+# Отступ от края экрана при случайной позиции
+SPAWN_MARGIN = 50
+
+# Расстановки групп, которые умеет formation_positions
+FORMATIONS = ("random", "line", "v", "column", "grid", "point")
+
+
+class SpawnEvent:
+    """Событие появления группы объектов в заданный момент игрового времени"""
+
+    __slots__ = ("time", "kind", "count", "formation", "x", "y", "spacing", "interval", "repeat",
+                 "path")
+
+    def __init__(self, time, kind, count=1, formation="random", x=None,
+                 spacing=40, interval=0.0, repeat=0, path="straight", y=None):
+        """
+        Args:
+            time: Игровое время появления (сек)
+            kind: Тип объекта ("enemy" или "asteroid")
+            count: Количество объектов в группе
+            formation: Расстановка группы ("random", "line", "v", "column", "grid", "point")
+            x: Центр формации по X (если None - случайный)
+            y: Высота для формации "point" (если None - стандартная)
+            spacing: Расстояние между объектами формации
+            interval: Период повторения события (сек)
+            repeat: Сколько раз повторить (-1 - бесконечно)
+            path: Траектория врагов группы ("random" - случайная для каждого)
+        """
+        self.time = time
+        self.kind = kind
+        self.count = count
+        self.formation = formation
+        self.x = x
+        self.y = y
+        self.spacing = spacing
+        self.interval = interval
+        self.repeat = repeat
+        self.path = path
+
+
+class SpawnScheduler:
+    """
+    Очередь событий появления, упорядоченная по времени.
+    За один тик выдает ровно столько объектов, сколько событий наступило,
+    и передает их менеджеру объектов пачкой.
+    """
+
+    def __init__(self, enemy_rate=ENEMY_SPAWN_RATE, asteroid_rate=ASTEROID_SPAWN_RATE,
+                 waves_path=WAVES_FILE, level=None):
+        """
+        Args:
+            level: Скомпилированный уровень (LevelStream); если задан, все
+                появления берутся из него, случайные потоки и волны отключены
+        """
+        self.level = level
+        if level is not None:
+            enemy_rate = asteroid_rate = 0
+            waves_path = None
+
+        self.enemy_rate = enemy_rate
+        self.asteroid_rate = asteroid_rate
+        self.waves = load_waves(waves_path) if waves_path else []
+
+        self._queue = []
+        self._counter = itertools.count()  # Порядок для событий с одинаковым временем
+        self.spawned_total = 0
+
+        self.reset()
+
+    def reset(self, start_time=0.0):
+        """Очищает очередь и заново планирует потоки и волны"""
+        self._queue.clear()
+        self.spawned_total = 0
+        self.level_start = start_time
+        if self.level is not None:
+            self.level.rewind()
+
+        # Бесконечные потоки случайных объектов
+        if self.enemy_rate > 0:
+            interval = 1.0 / self.enemy_rate
+            self.schedule(SpawnEvent(start_time + interval, "enemy",
+                                     interval=interval, repeat=-1, path="random"))
+        if self.asteroid_rate > 0:
+            interval = 1.0 / self.asteroid_rate
+            self.schedule(SpawnEvent(start_time + interval, "asteroid",
+                                     interval=interval, repeat=-1))
+
+        # Сценарные волны
+        for wave in self.waves:
+            self.schedule(SpawnEvent(
+                start_time + wave.get("time", 0.0),
+                wave.get("kind", "enemy"),
+                count=wave.get("count", 1),
+                formation=wave.get("formation", "random"),
+                x=wave.get("x"),
+                spacing=wave.get("spacing", 40),
+                interval=wave.get("interval", 0.0),
+                repeat=wave.get("repeat", 0),
+                path=wave.get("path", "straight")
+            ))
+
+    def schedule(self, event):
+        """Добавляет событие в очередь"""
+        heapq.heappush(self._queue, (event.time, next(self._counter), event))
+
+    def next_time(self):
+        """Время ближайшего события или None"""
+        return self._queue[0][0] if self._queue else None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def update(self, now, entities):
+        """
+        Выдает все события, время которых наступило к моменту now
+
+        Args:
+            now: Текущее игровое время (сек)
+            entities: Менеджер объектов (EntityManager), создающий их пачкой
+
+        Returns:
+            Количество созданных объектов
+        """
+        # Из уровня в очередь попадает только ближайшее окно времени
+        if self.level is not None:
+            self.level.feed(self, now - self.level_start + LEVEL_LOOKAHEAD, self.level_start)
+
+        batches = {}
+
+        while self._queue and self._queue[0][0] <= now:
+            _, _, event = heapq.heappop(self._queue)
+
+            # Одна пачка на тип и траекторию
+            batch = batches.setdefault((event.kind, event.path), [])
+            batch.extend(formation_positions(event.formation, event.count,
+                                             event.x, event.spacing, event.y))
+
+            # Повторяющееся событие возвращается в очередь
+            if event.repeat != 0 and event.interval > 0:
+                event.time += event.interval
+                if event.repeat > 0:
+                    event.repeat -= 1
+                self.schedule(event)
+
+        spawned = 0
+        for (kind, path), batch in batches.items():
+            spawned += entities.create(kind, batch, now, path)
+
+        self.spawned_total += spawned
+        return spawned
+
+
+def formation_positions(formation, count, x=None, spacing=40, y=None):
+    """
+    Вычисляет позиции объектов формации
+
+    Returns:
+        Список пар (x, y); y=None означает стандартную высоту появления
+    """
+    # Готовая точка из записи уровня
+    if formation == "point":
+        return [(x, y)] * count
+
+    if formation == "random":
+        return [(random.randint(SPAWN_MARGIN, SCREEN_WIDTH - SPAWN_MARGIN), None)
+                for _ in range(count)]
+
+    # Сетка: почти квадратный блок рядами над экраном
+    columns = math.ceil(math.sqrt(count)) if formation == "grid" else count
+
+    # Центр формации с учетом ширины, чтобы не выйти за экран
+    half_width = spacing * (columns - 1) / 2 if formation != "column" else 0
+    low = SPAWN_MARGIN + half_width
+    high = max(low, SCREEN_WIDTH - SPAWN_MARGIN - half_width)
+    if x is None:
+        x = random.uniform(low, high)
+    x = min(max(x, low), high)
+
+    if formation == "line":
+        return [(x - half_width + i * spacing, None) for i in range(count)]
+
+    # Формации выше стандартной высоты появления
+    base_y = SCREEN_HEIGHT + SPAWN_MARGIN
+
+    if formation == "v":
+        positions = []
+        for i in range(count):
+            offset = i - (count - 1) / 2
+            positions.append((x + offset * spacing, base_y + abs(offset) * spacing))
+        return positions
+
+    if formation == "column":
+        return [(x, base_y + i * spacing) for i in range(count)]
+
+    if formation == "grid":
+        return [(x - half_width + (i % columns) * spacing, base_y + (i // columns) * spacing)
+                for i in range(count)]
+
+    raise ValueError(f"Неизвестная формация: {formation}")
+
+
+def load_waves(path):
+    """Загружает сценарные волны из JSON файла"""
+    if not os.path.exists(path):
+        return []
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        waves = []
+        for wave in data.get("waves", []):
+            # Одна ошибка в файле не должна ронять игру посреди тика
+            kind = wave.get("kind", "enemy")
+            if kind not in ENTITY_CLASSES:
+                logger.warning("Волна пропущена: неизвестный тип объекта %r (%s)", kind, path)
+                continue
+            formation = wave.get("formation", "random")
+            if formation not in FORMATIONS:
+                logger.warning("Волна пропущена: неизвестная формация %r (%s)", formation, path)
+                continue
+            waves.append(wave)
+        waves.sort(key=lambda wave: wave.get("time", 0.0))
+        logger.info("Волны загружены из: %s (%d)", path, len(waves))
+        return waves
+    except Exception as e:
+        logger.error("Ошибка загрузки волн %s: %s", path, e)
+        return []
@@ -0,0 +1,426 @@
+"""
+Сервер зрителей
+Снимки игры раз в тик рассылаются по TCP любому числу зрителей. Позиции
+квантуются до четверти пикселя; раз в секунду уходит ключевой кадр с полным
+состоянием, остальные кадры - разница с последним ключевым кадром, получение
+которого зритель подтвердил. Кадр кодируется один раз на каждый ключевой кадр,
+а не на каждого зрителя, поэтому время сервера почти не зависит от их числа.
+Сервер живет в отдельном потоке со своим циклом asyncio.
+"""
+
+import asyncio
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque, namedtuple
+
+import numpy as np
+
+from src.constants import (SPECTATOR_HOST, SPECTATOR_PORT, SPECTATOR_KEYFRAME_INTERVAL)
+from src.log import get_logger
+
+logger = get_logger("spectator")
+
+
+# Квантование: x_q = (x - QUANT_ORIGIN) * QUANT_SCALE в uint16
+QUANT_SCALE = 4
+QUANT_ORIGIN = -1024
+
+# Типы объектов в кадре; старшие биты идентификатора - группа объекта
+KIND_ENEMY, KIND_ASTEROID, KIND_BULLET, KIND_SUPER_BULLET = range(4)
+ID_GROUP_SHIFT = 28
+ID_MASK = (1 << ID_GROUP_SHIFT) - 1
+
+FRAME_KEY, FRAME_DELTA = 0, 1
+
+# Заголовок кадра (без сжатия): тип, номер кадра, базовый ключевой кадр,
+# счет, убито врагов, разрушено астероидов, время игры, пауза, число игроков
+HEADER = struct.Struct("<BIIiiif?B")
+PLAYER = struct.Struct("<ffbbB")  # После заголовка по игроку: x, y, hp, max_hp, номер
+LENGTH = struct.Struct("<I")  # Префикс длины сообщения
+ACK = struct.Struct("<I")  # Подтверждение ключевого кадра от зрителя
+
+KEYFRAMES_KEPT = 4  # Сколько ключевых кадров сервер помнит для разностей
+SEND_BUFFER_LIMIT = 256 * 1024  # Медленному зрителю кадры пропускаются
+
+# Состояние мира в квантованном виде, объекты упорядочены по идентификатору
+WorldState = namedtuple("WorldState", ["ids", "kinds", "sizes", "qx", "qy"])
+
+# Кадр глазами зрителя
+SpectatorView = namedtuple("SpectatorView", [
+    "frame", "score", "enemies_killed", "asteroids_destroyed", "game_time", "paused",
+    "players",      # Кортежи (x, y, hp, max_hp, номер)
+    "kinds", "sizes", "x", "y",
+    "projectiles",  # (x, y, радиус)
+])
+
+
+def quantize(values):
+    """Координаты в uint16 с шагом 1 / QUANT_SCALE пикселя"""
+    q = np.rint((np.asarray(values, dtype=np.float64) - QUANT_ORIGIN) * QUANT_SCALE)
+    return np.clip(q, 0, 65535).astype(np.uint16)
+
+
+def dequantize(q):
+    return q.astype(np.float32) / QUANT_SCALE + QUANT_ORIGIN
+
+
+def world_state(snapshot):
+    """Квантованное состояние объектов снимка (RenderSnapshot)"""
+    groups = (
+        (snapshot.enemies, KIND_ENEMY),
+        (snapshot.asteroids, KIND_ASTEROID),
+        (snapshot.bullets, KIND_BULLET),
+    )
+    entities = [(entity, kind) for container, kind in groups for entity in container]
+    n = len(entities)
+
+    ids = np.fromiter(((kind << ID_GROUP_SHIFT) | (entity.uid & ID_MASK) for entity, kind in entities),
+                      dtype=np.uint32, count=n)
+    kinds = np.fromiter((KIND_SUPER_BULLET if kind == KIND_BULLET and entity.is_super else kind
+                         for entity, kind in entities), dtype=np.uint8, count=n)
+    sizes = np.fromiter((min(int(entity.width), 255) for entity, _ in entities), dtype=np.uint8, count=n)
+    qx = quantize(np.fromiter((entity.center_x for entity, _ in entities), dtype=float, count=n))
+    qy = quantize(np.fromiter((entity.center_y for entity, _ in entities), dtype=float, count=n))
+
+    order = np.argsort(ids, kind="stable")
+    return WorldState(ids[order], kinds[order], sizes[order], qx[order], qy[order])
+
+
+def encode_header(frame_type, frame, base, snapshot):
+    return HEADER.pack(
+        frame_type, frame, base,
+        snapshot.score, snapshot.enemies_killed, snapshot.asteroids_destroyed,
+        snapshot.game_time, snapshot.paused, len(snapshot.players),
+    ) + b"".join(PLAYER.pack(player.center_x, player.center_y, player.hp, player.max_hp, player.slot)
+                 for player in snapshot.players)
+
+
+def encode_projectiles(snapshot):
+    """Снаряды врагов без идентификаторов: каждый кадр целиком"""
+    state, _ = snapshot.projectiles
+    n = len(state)
+    return b"".join((
+        struct.pack("<I", n),
+        quantize(state[:, 0]).tobytes(),
+        quantize(state[:, 1]).tobytes(),
+        np.clip(state[:, 2], 0, 255).astype(np.uint8).tobytes(),
+    ))
+
+
+def encode_keyframe(frame, state, snapshot):
+    """Ключевой кадр: все объекты полностью"""
+    body = b"".join((
+        struct.pack("<I", len(state.ids)),
+        state.ids.tobytes(), state.kinds.tobytes(), state.sizes.tobytes(),
+        state.qx.tobytes(), state.qy.tobytes(),
+        encode_projectiles(snapshot),
+    ))
+    return encode_header(FRAME_KEY, frame, frame, snapshot) + zlib.compress(body, 1)
+
+
+def encode_delta(frame, base_frame, base, state, snapshot):
+    """
+    Разностный кадр относительно ключевого кадра base
+
+    Объекты, которые есть в base, передаются индексом в base и смещением;
+    новые - полностью; исчезнувшие - отсутствием в списке. Колонки лежат
+    подряд, поэтому одинаковые смещения (строй, общая скорость) хорошо сжимаются.
+    """
+    index = np.searchsorted(base.ids, state.ids)
+    index = np.minimum(index, max(len(base.ids) - 1, 0))
+    known = (base.ids[index] == state.ids) if len(base.ids) else np.zeros(len(state.ids), dtype=bool)
+
+    kept = index[known].astype(np.uint32)
+    dx = (state.qx[known].astype(np.int32) - base.qx[kept]).astype(np.int16)
+    dy = (state.qy[known].astype(np.int32) - base.qy[kept]).astype(np.int16)
+    new = ~known
+
+    body = b"".join((
+        struct.pack("<II", len(kept), int(new.sum())),
+        kept.tobytes(), dx.tobytes(), dy.tobytes(),
+        state.ids[new].tobytes(), state.kinds[new].tobytes(), state.sizes[new].tobytes(),
+        state.qx[new].tobytes(), state.qy[new].tobytes(),
+        encode_projectiles(snapshot),
+    ))
+    return encode_header(FRAME_DELTA, frame, base_frame, snapshot) + zlib.compress(body, 1)
+
+
+class SpectatorDecoder:
+    """Восстановление кадров на стороне зрителя"""
+
+    def __init__(self):
+        self.keyframes = OrderedDict()  # Номер кадра -> WorldState
+
+    def decode(self, message):
+        """
+        Returns:
+            (SpectatorView, номер ключевого кадра для подтверждения или None)
+        """
+        (frame_type, frame, base, score, killed, destroyed, game_time, paused,
+         player_count) = HEADER.unpack_from(message)
+        players = tuple(PLAYER.unpack_from(message, HEADER.size + i * PLAYER.size)
+                        for i in range(player_count))
+        body = zlib.decompress(message[HEADER.size + player_count * PLAYER.size:])
+        reader = _Reader(body)
+
+        if frame_type == FRAME_KEY:
+            n = reader.count()
+            state = WorldState(reader.array(np.uint32, n), reader.array(np.uint8, n),
+                               reader.array(np.uint8, n), reader.array(np.uint16, n),
+                               reader.array(np.uint16, n))
+            self.keyframes[frame] = state
+            while len(self.keyframes) > KEYFRAMES_KEPT:
+                self.keyframes.popitem(last=False)
+            ack = frame
+        else:
+            key = self.keyframes.get(base)
+            if key is None:
+                return None, None  # Ключевой кадр еще не получен
+            kept_count, new_count = reader.count(), reader.count()
+            kept = reader.array(np.uint32, kept_count)
+            dx = reader.array(np.int16, kept_count)
+            dy = reader.array(np.int16, kept_count)
+            state = WorldState(
+                np.concatenate((key.ids[kept], reader.array(np.uint32, new_count))),
+                np.concatenate((key.kinds[kept], reader.array(np.uint8, new_count))),
+                np.concatenate((key.sizes[kept], reader.array(np.uint8, new_count))),
+                np.concatenate(((key.qx[kept] + dx).astype(np.uint16), reader.array(np.uint16, new_count))),
+                np.concatenate(((key.qy[kept] + dy).astype(np.uint16), reader.array(np.uint16, new_count))),
+            )
+            ack = None
+
+        m = reader.count()
+        projectiles = (dequantize(reader.array(np.uint16, m)), dequantize(reader.array(np.uint16, m)),
+                       reader.array(np.uint8, m))
+
+        view = SpectatorView(
+            frame, score, killed, destroyed, game_time, paused,
+            players,
+            state.kinds, state.sizes, dequantize(state.qx), dequantize(state.qy),
+            projectiles,
+        )
+        return view, ack
+
+
+class _Reader:
+    """Последовательное чтение колонок из тела кадра"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def count(self):
+        value, = struct.unpack_from("<I", self.data, self.offset)
+        self.offset += 4
+        return value
+
+    def array(self, dtype, n):
+        result = np.frombuffer(self.data, dtype=dtype, count=n, offset=self.offset)
+        self.offset += result.nbytes
+        return result
+
+
+class Spectator:
+    """Подключенный зритель"""
+
+    __slots__ = ("writer", "address", "acked", "pending", "bytes_sent", "frames_sent",
+                 "skipped", "connected_at")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.address = writer.get_extra_info("peername")
+        self.acked = None  # Последний подтвержденный ключевой кадр
+        self.pending = None  # Отправленный, но еще не подтвержденный ключевой кадр
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.skipped = 0
+        self.connected_at = time.perf_counter()
+
+
+class SpectatorServer:
+    """TCP сервер зрителей в отдельном потоке"""
+
+    def __init__(self, host=SPECTATOR_HOST, port=SPECTATOR_PORT,
+                 keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL):
+        """
+        Args:
+            host, port: Адрес для подключения зрителей (0 - свободный порт)
+            keyframe_interval: Кадров между ключевыми кадрами
+        """
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+
+        self.spectators = []
+        self.frame = 0
+        self.keyframes = OrderedDict()  # Номер кадра -> WorldState
+        self.keyframe_message = None  # Последний ключевой кадр, готовый к отправке
+        self._latest = None  # Снимок, ожидающий рассылки
+
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+
+        # Замеры рассылки: время тика сервера и объем на зрителя
+        self.tick_times = deque(maxlen=120)
+        self.encode_times = deque(maxlen=120)
+        self.frame_bytes = deque(maxlen=120)
+
+    def start(self):
+        """Запускает поток сервера и ждет, пока порт будет открыт"""
+        self._thread = threading.Thread(target=self._run, name="spectators", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+            logger.info("Сервер зрителей: %s:%d", self.host, self.port)
+        except OSError as e:
+            logger.error("Сервер зрителей не запущен: %s", e)
+            self._server = None
+        self._started.set()
+        if self._server is not None:
+            loop.run_forever()
+            # Обработчики зрителей завершаются до закрытия цикла
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.close()
+
+    def stop(self):
+        """Отключает зрителей и останавливает поток"""
+        if self._loop is None or self._thread is None:
+            return
+        if self._server is not None:
+            # Сначала отключаем publish(): цикл после остановки будет закрыт
+            self._server, server = None, self._server
+            self._loop.call_soon_threadsafe(self._shutdown, self._loop, server)
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self._loop = None
+        self.log_report()
+
+    def _shutdown(self, loop, server):
+        server.close()
+        for spectator in self.spectators:
+            spectator.writer.close()
+        loop.stop()
+
+    async def _handle(self, reader, writer):
+        """Зритель: читаем только подтверждения ключевых кадров"""
+        spectator = Spectator(writer)
+        self.spectators.append(spectator)
+        logger.info("Зритель подключен: %s (всего %d)", spectator.address, len(self.spectators))
+        try:
+            while True:
+                data = await reader.readexactly(ACK.size)
+                frame, = ACK.unpack(data)
+                if frame == spectator.pending:
+                    spectator.acked = frame
+                    spectator.pending = None
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.spectators.remove(spectator)
+            writer.close()
+            logger.warning("Зритель отключился: %s (осталось %d)",
+                           spectator.address, len(self.spectators))
+
+    def publish(self, snapshot):
+        """
+        Передает снимок на рассылку (не блокирует, можно из потока симуляции).
+        Если сервер не успел разослать прошлый снимок, тот заменяется новым.
+        """
+        loop = self._loop
+        if self._server is None or loop is None or loop.is_closed():
+            return
+        self._latest = snapshot
+        try:
+            loop.call_soon_threadsafe(self._broadcast)
+        except RuntimeError:
+            pass  # Цикл закрылся между проверкой и вызовом: сервер уже остановлен
+
+    def _broadcast(self):
+        snapshot, self._latest = self._latest, None
+        if snapshot is None or not self.spectators:
+            return
+
+        tick_start = time.perf_counter()
+        self.frame += 1
+        frame = self.frame
+        state = world_state(snapshot)
+
+        is_keyframe = not self.keyframes or frame - next(reversed(self.keyframes)) >= self.keyframe_interval
+        if is_keyframe:
+            self.keyframes[frame] = state
+            while len(self.keyframes) > KEYFRAMES_KEPT:
+                self.keyframes.popitem(last=False)
+            self.keyframe_message = encode_keyframe(frame, state, snapshot)
+        latest_keyframe = next(reversed(self.keyframes))
+
+        # Разность кодируется один раз на базовый кадр и переиспользуется
+        deltas = {}
+        encode_time = time.perf_counter() - tick_start
+        sent = []
+
+        for spectator in self.spectators:
+            transport = spectator.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+                spectator.skipped += 1
+                continue
+
+            if is_keyframe or (spectator.acked not in self.keyframes and
+                               spectator.pending not in self.keyframes):
+                message = self.keyframe_message
+                spectator.pending = latest_keyframe
+            elif spectator.acked in self.keyframes:
+                base = spectator.acked
+                message = deltas.get(base)
+                if message is None:
+                    encode_start = time.perf_counter()
+                    message = encode_delta(frame, base, self.keyframes[base], state, snapshot)
+                    deltas[base] = message
+                    encode_time += time.perf_counter() - encode_start
+            else:
+                continue  # Ждем подтверждения первого ключевого кадра
+
+            spectator.writer.write(LENGTH.pack(len(message)) + message)
+            spectator.bytes_sent += LENGTH.size + len(message)
+            spectator.frames_sent += 1
+            sent.append(len(message))
+
+        self.encode_times.append(encode_time)
+        self.tick_times.append(time.perf_counter() - tick_start)
+        if sent:
+            self.frame_bytes.append(sum(sent) / len(sent))
+
+    def stats(self):
+        """Средние по последним кадрам: зрители, байт на зрителя за кадр, мс сервера за кадр"""
+        def mean(values):
+            return sum(values) / len(values) if values else 0.0
+
+        return {
+            "spectators": len(self.spectators),
+            "bytes_per_spectator": mean(self.frame_bytes),
+            "tick_ms": mean(self.tick_times) * 1000,
+            "encode_ms": mean(self.encode_times) * 1000,
+            "skipped": sum(spectator.skipped for spectator in self.spectators),
+        }
+
+    def log_report(self):
+        """Записывает в журнал итог работы сервера"""
+        stats = self.stats()
+        logger.info("Сервер зрителей остановлен: кадров %d, %.0f Б на зрителя за кадр, "
+                    "%.2f мс на кадр (кодирование %.2f мс)", self.frame,
+                    stats['bytes_per_spectator'], stats['tick_ms'], stats['encode_ms'])
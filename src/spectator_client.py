@@ -0,0 +1,139 @@
+"""
+Клиент зрителя
+Подключается к серверу зрителей, восстанавливает кадры и рисует их.
+Запуск: python -m src.spectator_client [--host 127.0.0.1] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import threading
+
+import arcade
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, SPECTATOR_HOST, SPECTATOR_PORT
+from src.overlays import PLAYER_COLORS
+from src.spectator import (SpectatorDecoder, LENGTH, ACK,
+                           KIND_ENEMY, KIND_ASTEROID, KIND_BULLET, KIND_SUPER_BULLET)
+from src.log import get_logger
+
+logger = get_logger("spectator_client")
+
+
+# Цвета объектов как в игре
+KIND_COLORS = {
+    KIND_ENEMY: (255, 50, 150),
+    KIND_ASTEROID: (150, 150, 150),
+    KIND_BULLET: (255, 50, 50),
+    KIND_SUPER_BULLET: (255, 255, 0),
+}
+
+
+class SpectatorClient:
+    """Прием кадров в фоновом потоке; последний кадр - в view"""
+
+    def __init__(self, host=SPECTATOR_HOST, port=SPECTATOR_PORT):
+        self.host = host
+        self.port = port
+        self.decoder = SpectatorDecoder()
+        self.view = None  # Последний восстановленный кадр (SpectatorView)
+        self.connected = False
+        self.bytes_received = 0
+        self.frames_received = 0
+        self._thread = None
+
+    def start(self):
+        """Подключается в фоновом потоке"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                        name="spectator-client", daemon=True)
+        self._thread.start()
+
+    async def run(self):
+        """Читает кадры, пока сервер не закроет соединение"""
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            logger.error("Не удалось подключиться к %s:%d: %s", self.host, self.port, e)
+            return
+
+        self.connected = True
+        logger.info("Подключено к серверу зрителей %s:%d", self.host, self.port)
+        try:
+            while True:
+                length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                message = await reader.readexactly(length)
+                self.bytes_received += LENGTH.size + length
+                self.frames_received += 1
+
+                view, ack = self.decoder.decode(message)
+                if ack is not None:
+                    writer.write(ACK.pack(ack))
+                if view is not None:
+                    self.view = view
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.warning("Сервер зрителей закрыл соединение")
+        finally:
+            self.connected = False
+            writer.close()
+
+
+class SpectatorWindow(arcade.Window):
+    """Окно зрителя: рисует последний принятый кадр"""
+
+    def __init__(self, client):
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, "Galactic Defender - зритель")
+        arcade.set_background_color(arcade.color.BLACK)
+        self.client = client
+
+    def on_draw(self):
+        self.clear()
+        view = self.client.view
+        if view is None:
+            arcade.draw_text("Ожидание трансляции...", SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
+                             arcade.color.WHITE, 20, anchor_x="center")
+            return
+
+        for kind, size, x, y in zip(view.kinds.tolist(), view.sizes.tolist(),
+                                    view.x.tolist(), view.y.tolist()):
+            color = KIND_COLORS.get(kind, arcade.color.WHITE)
+            if kind == KIND_ASTEROID:
+                arcade.draw_circle_filled(x, y, size // 2, color)
+            elif kind == KIND_ENEMY:
+                arcade.draw_rectangle_filled(x, y, size, size, color)
+            else:
+                arcade.draw_rectangle_filled(x, y, size, 15, color)
+
+        px, py, _ = view.projectiles
+        if len(px):
+            arcade.draw_points(list(zip(px.tolist(), py.tolist())), (255, 140, 60), 6)
+
+        hp_text = ""
+        for x, y, hp, max_hp, slot in view.players:
+            if hp > 0:
+                arcade.draw_rectangle_filled(x, y, 50, 60, PLAYER_COLORS[slot % len(PLAYER_COLORS)])
+            hp_text += f"P{slot + 1} HP: {hp}/{max_hp}   "
+
+        arcade.draw_text(
+            f"{hp_text}Счет: {view.score}   Врагов: {view.enemies_killed}   "
+            f"Время: {view.game_time:.1f}   "
+            f"{self.client.bytes_received / max(self.client.frames_received, 1):.0f} Б/кадр",
+            10, SCREEN_HEIGHT - 25, arcade.color.WHITE, 14
+        )
+        if view.paused:
+            arcade.draw_text("ПАУЗА", SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
+                             arcade.color.YELLOW, 30, anchor_x="center")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Зритель Galactic Defender")
+    parser.add_argument("--host", default=SPECTATOR_HOST)
+    parser.add_argument("--port", type=int, default=SPECTATOR_PORT)
+    args = parser.parse_args()
+
+    client = SpectatorClient(args.host, args.port)
+    client.start()
+    SpectatorWindow(client)
+    arcade.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Звездный фон с параллаксом
+Звезды всех слоев лежат в одном вершинном буфере; прокрутка выполняется
+в шейдере по uniform-времени, процессор звезды не обновляет
+"""
+
+import numpy as np
+from arcade.gl import BufferDescription
+
+from src.constants import STAR_DENSITY
+
+
+VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+uniform float u_time;
+uniform vec2 u_size;
+uniform float u_scale;
+
+in vec4 in_star;   // x, y, скорость слоя (пикс/сек), размер
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    // Звезда уходит вниз и появляется сверху
+    float y = mod(in_star.y - u_time * in_star.z, u_size.y);
+    gl_Position = proj.matrix * vec4(in_star.x, y, 0.0, 1.0);
+    gl_PointSize = max(1.0, in_star.w * u_scale);
+
+    // Легкое мерцание, фаза зависит от позиции звезды
+    float twinkle = 0.75 + 0.25 * sin(u_time * 3.0 + in_star.x * 0.37 + in_star.y);
+    v_color = vec4(in_color.rgb, in_color.a * twinkle);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+out vec4 out_color;
+
+void main() {
+    out_color = v_color;
+}
+"""
+
+# Слои параллакса: доля звезд, скорость (пикс/сек), размер, яркость
+STAR_LAYERS = (
+    (0.6, 12.0, 1.0, 0.45),
+    (0.3, 30.0, 1.5, 0.7),
+    (0.1, 70.0, 2.5, 1.0),
+)
+
+
+class Starfield:
+    """Многослойное звездное небо, прокручиваемое шейдером"""
+
+    def __init__(self, ctx, width, height, density=STAR_DENSITY):
+        """
+        Args:
+            ctx: OpenGL контекст окна
+            width, height: Размер игрового поля
+            density: Количество звезд на мегапиксель
+        """
+        self.ctx = ctx
+        self.width = width
+        self.height = height
+        self.star_count = max(1, int(width * height / 1_000_000 * density))
+
+        stars = self.generate(self.star_count)
+
+        self.buffer = ctx.buffer(data=stars)
+        self.geometry = ctx.geometry([
+            BufferDescription(self.buffer, "4f 4f", ["in_star", "in_color"]),
+        ])
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["u_size"] = (width, height)
+
+    def generate(self, count):
+        """Создает данные звезд: x, y, скорость, размер, цвет RGBA"""
+        rng = np.random.default_rng()
+        stars = np.zeros((count, 8), dtype=np.float32)
+
+        start = 0
+        for i, (share, speed, size, brightness) in enumerate(STAR_LAYERS):
+            # Последний слой забирает остаток после округления
+            end = count if i == len(STAR_LAYERS) - 1 else start + int(count * share)
+            layer = stars[start:end]
+            layer[:, 0] = rng.uniform(0, self.width, len(layer))
+            layer[:, 1] = rng.uniform(0, self.height, len(layer))
+            layer[:, 2] = speed
+            layer[:, 3] = size
+            # Слегка голубоватые и желтоватые звезды
+            layer[:, 4:7] = rng.uniform(0.8, 1.0, (len(layer), 3)) * brightness
+            layer[:, 7] = 1.0
+            start = end
+
+        return stars
+
+    def draw(self, time, scale=1.0):
+        """
+        Рисует все звезды одним вызовом
+
+        Args:
+            time: Время прокрутки (сек)
+            scale: Масштаб внутреннего разрешения для размера звезд
+        """
+        self.program["u_time"] = time
+        self.program["u_scale"] = scale
+        with self.ctx.enabled(self.ctx.PROGRAM_POINT_SIZE):
+            self.geometry.render(self.program, mode=self.ctx.POINTS)
@@ -0,0 +1,171 @@
+"""
+Поиск целей для самонаводящихся выстрелов и помощи в прицеливании
+Враги и астероиды раз в тик раскладываются по равномерной сетке (сортировка
+по номеру ячейки). Запрос просматривает только ячейки рядом с точкой, поэтому
+его стоимость зависит от плотности объектов вокруг, а не от их общего числа.
+"""
+
+import math
+
+import numpy as np
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, TARGET_CELL_SIZE
+from src.collision import entity_boxes
+
+# Запас сетки за краями экрана (как у границ мира объектов)
+GRID_MARGIN = 100
+
+# Типы целей в порядке rebuild(enemies, asteroids)
+KINDS = np.array(["enemy", "asteroid"])
+
+
+class TargetIndex:
+    """Сетка целей, перестраиваемая один раз за тик"""
+
+    def __init__(self, cell_size=TARGET_CELL_SIZE):
+        """
+        Args:
+            cell_size: Сторона ячейки сетки (пикс)
+        """
+        self.cell_size = cell_size
+        self.left = -GRID_MARGIN
+        self.bottom = -GRID_MARGIN
+        self.columns = math.ceil((SCREEN_WIDTH + GRID_MARGIN * 2) / cell_size)
+        self.rows = math.ceil((SCREEN_HEIGHT * 2 + GRID_MARGIN * 2) / cell_size)
+
+        # Цели, отсортированные по ячейкам; ячейка c - индексы [starts[c], starts[c + 1])
+        self.entities = []
+        self.kinds = np.zeros(0, dtype=KINDS.dtype)  # Тип каждой цели ("enemy", "asteroid")
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.starts = np.zeros(self.columns * self.rows + 1, dtype=np.intp)
+
+        self.queries = 0  # Запросов за последний тик (для отладки)
+        self.candidates = 0  # Просмотрено целей этими запросами
+
+    def __len__(self):
+        return len(self.entities)
+
+    def rebuild(self, enemies, asteroids):
+        """Раскладывает живые цели по ячейкам (вызывать раз в тик после движения)"""
+        entities = list(enemies) + list(asteroids)
+        kinds = np.repeat(KINDS, (len(enemies), len(asteroids)))
+        self.queries = 0
+        self.candidates = 0
+
+        if not entities:
+            self.entities, self.kinds = [], kinds
+            self.x = self.y = np.zeros(0)
+            self.starts[:] = 0
+            return
+
+        x, y, _, _ = entity_boxes(entities)
+        cell = self._row(y) * self.columns + self._column(x)
+        order = np.argsort(cell, kind="stable")
+
+        self.entities = [entities[i] for i in order]
+        self.kinds = kinds[order]
+        self.x = x[order]
+        self.y = y[order]
+        counts = np.bincount(cell, minlength=self.columns * self.rows)
+        self.starts[0] = 0
+        np.cumsum(counts, out=self.starts[1:])
+
+    def _column(self, x):
+        return np.clip(((x - self.left) // self.cell_size).astype(np.intp), 0, self.columns - 1)
+
+    def _row(self, y):
+        return np.clip(((y - self.bottom) // self.cell_size).astype(np.intp), 0, self.rows - 1)
+
+    def _candidates(self, x, y, radius):
+        """Индексы целей из ячеек, покрывающих квадрат вокруг точки"""
+        c0, c1 = (int(c) for c in self._column(np.array([x - radius, x + radius])))
+        r0, r1 = (int(r) for r in self._row(np.array([y - radius, y + radius])))
+
+        # Ячейки одной строки сетки лежат подряд - по одному срезу на строку
+        slices = [np.arange(self.starts[r * self.columns + c0],
+                            self.starts[r * self.columns + c1 + 1])
+                  for r in range(r0, r1 + 1)]
+        indices = np.concatenate(slices) if slices else np.zeros(0, dtype=np.intp)
+
+        self.queries += 1
+        self.candidates += len(indices)
+        return indices
+
+    def _within(self, x, y, radius, kind=None):
+        """Индексы и расстояния целей в круге, по возрастанию расстояния"""
+        indices = self._candidates(x, y, radius)
+        if kind is not None:
+            indices = indices[self.kinds[indices] == kind]
+        distance = np.hypot(self.x[indices] - x, self.y[indices] - y)
+        inside = distance <= radius
+        indices, distance = indices[inside], distance[inside]
+        order = np.argsort(distance)
+        return indices[order], distance[order]
+
+    def _result(self, indices, distance):
+        return [(self.entities[i], float(d)) for i, d in zip(indices, distance)]
+
+    def radius(self, x, y, radius, kind=None):
+        """
+        Цели не дальше radius от точки
+
+        Returns:
+            Список (объект, расстояние) по возрастанию расстояния
+        """
+        if not self.entities:
+            return []
+        return self._result(*self._within(x, y, radius, kind))
+
+    def nearest(self, x, y, k=1, max_distance=math.inf, kind=None):
+        """
+        k ближайших целей к точке
+
+        Радиус поиска удваивается, начиная с одной ячейки, пока в круг
+        не попадут k целей - дальние ячейки просматриваются только при
+        редких целях вокруг точки.
+
+        Returns:
+            Список (объект, расстояние) по возрастанию расстояния
+        """
+        if not self.entities:
+            return []
+
+        limit = min(max_distance, self.cell_size * max(self.columns, self.rows) * 2)
+        radius = min(self.cell_size, limit)
+        while True:
+            indices, distance = self._within(x, y, radius, kind)
+            if len(indices) >= k or radius >= limit:
+                return self._result(indices[:k], distance[:k])
+            radius = min(radius * 2, limit)
+
+    def cone(self, x, y, angle, half_angle, max_distance, k=1, kind=None):
+        """
+        Ближайшие цели в секторе
+
+        Args:
+            x, y: Вершина сектора
+            angle: Направление оси сектора (градусы, 90 - вверх)
+            half_angle: Половина раствора (градусы)
+            max_distance: Дальность
+
+        Returns:
+            Список (объект, расстояние) по возрастанию расстояния
+        """
+        if not self.entities:
+            return []
+
+        axis = math.radians(angle)
+        cos_axis, sin_axis = math.cos(axis), math.sin(axis)
+        cos_half = math.cos(math.radians(half_angle))
+
+        # Как и в nearest, радиус растет, пока в секторе не наберется k целей
+        radius = min(self.cell_size, max_distance)
+        while True:
+            indices, distance = self._within(x, y, radius, kind)
+            # Угол между осью и направлением на цель через скалярное произведение
+            along = (self.x[indices] - x) * cos_axis + (self.y[indices] - y) * sin_axis
+            inside = along >= distance * cos_half
+            if inside.sum() >= k or radius >= max_distance:
+                return self._result(indices[inside][:k], distance[inside][:k])
+            radius = min(radius * 2, max_distance)
@@ -0,0 +1,24 @@
+"""
+Тест проверки утечек: несколько коротких игр без окна
+"""
+
+import os
+
+from src.constants import STATS_DB
+from src.leaks import run_games
+
+
+def read_stats():
+    if not os.path.exists(STATS_DB):
+        return None
+    with open(STATS_DB, "rb") as f:
+        return f.read()
+
+
+def test_run_games_passes_and_keeps_stats():
+    before = read_stats()
+
+    assert run_games(games=3, ticks=60, warmup=1, threshold=512 * 1024)
+
+    # Игры проверки пишутся во временную базу, а не в статистику игрока
+    assert read_stats() == before
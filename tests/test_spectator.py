@@ -0,0 +1,162 @@
+"""
+Тесты трансляции зрителям: кодирование кадров и подключение по сети
+"""
+
+import socket
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.simulation import RenderSnapshot
+from src.spectator import (ACK, LENGTH, KIND_ENEMY, KIND_ASTEROID, KIND_SUPER_BULLET,
+                           QUANT_SCALE, SpectatorDecoder, SpectatorServer,
+                           encode_delta, encode_keyframe, world_state)
+
+TOLERANCE = 0.5 / QUANT_SCALE  # Ошибка квантования координат
+
+
+def entity(uid, x, y, width=30, is_super=False):
+    return SimpleNamespace(uid=uid, center_x=x, center_y=y, width=width, is_super=is_super)
+
+
+def make_snapshot(enemies=(), asteroids=(), bullets=(), projectiles=((100.0, 200.0, 6.0),),
+                  score=0):
+    state = np.zeros((len(projectiles), 4), dtype=np.float32)
+    if projectiles:
+        state[:, :3] = projectiles
+    player = SimpleNamespace(center_x=400.0, center_y=60.0, hp=3, max_hp=5, slot=0)
+    return RenderSnapshot(
+        tick=1, game_time=1.5, paused=False, score=score, enemies_killed=2,
+        asteroids_destroyed=1, players=(player,), enemies=tuple(enemies),
+        asteroids=tuple(asteroids), bullets=tuple(bullets),
+        projectiles=(state, np.zeros((len(projectiles), 4), dtype=np.uint8)),
+        particles=None, debug=None,
+    )
+
+
+def positions(view):
+    return sorted(zip(view.x.tolist(), view.y.tolist()))
+
+
+def expected(snapshot):
+    return sorted((e.center_x, e.center_y)
+                  for group in (snapshot.enemies, snapshot.asteroids, snapshot.bullets)
+                  for e in group)
+
+
+def assert_positions(view, snapshot):
+    actual = positions(view)
+    wanted = expected(snapshot)
+    assert len(actual) == len(wanted)
+    assert np.allclose(actual, wanted, atol=TOLERANCE)
+
+
+def test_keyframe_round_trip():
+    snapshot = make_snapshot(
+        enemies=[entity(1, 120.3, 500.7), entity(2, 300.0, 650.2)],
+        asteroids=[entity(3, 50.25, 400.0, width=40)],
+        bullets=[entity(4, 410.0, 90.0, width=4, is_super=True)],
+        score=120,
+    )
+    message = encode_keyframe(1, world_state(snapshot), snapshot)
+
+    view, ack = SpectatorDecoder().decode(message)
+
+    assert ack == 1
+    assert view.frame == 1
+    assert (view.score, view.enemies_killed, view.asteroids_destroyed) == (120, 2, 1)
+    assert view.players == ((400.0, 60.0, 3, 5, 0),)
+    assert sorted(view.kinds.tolist()) == [KIND_ENEMY, KIND_ENEMY, KIND_ASTEROID, KIND_SUPER_BULLET]
+    assert_positions(view, snapshot)
+    x, y, radius = view.projectiles
+    assert np.allclose((x[0], y[0]), (100.0, 200.0), atol=TOLERANCE)
+    assert radius.tolist() == [6]
+
+
+def test_delta_round_trip():
+    first = make_snapshot(enemies=[entity(1, 100.0, 500.0), entity(2, 200.0, 500.0)],
+                          asteroids=[entity(3, 300.0, 400.0, width=40)])
+    base = world_state(first)
+    decoder = SpectatorDecoder()
+    decoder.decode(encode_keyframe(1, base, first))
+
+    # Враг 2 уничтожен, остальные сдвинулись, появился враг 5
+    second = make_snapshot(enemies=[entity(1, 101.5, 495.25), entity(5, 600.0, 650.0)],
+                           asteroids=[entity(3, 300.0, 397.0, width=40)], projectiles=())
+    message = encode_delta(2, 1, base, world_state(second), second)
+
+    view, ack = decoder.decode(message)
+
+    assert ack is None
+    assert view.frame == 2
+    assert_positions(view, second)
+    assert len(view.projectiles[0]) == 0
+
+
+def test_delta_without_keyframe_is_skipped():
+    snapshot = make_snapshot(enemies=[entity(1, 100.0, 500.0)])
+    state = world_state(snapshot)
+    message = encode_delta(2, 1, state, state, snapshot)
+
+    assert SpectatorDecoder().decode(message) == (None, None)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Условие не выполнилось за отведенное время")
+        time.sleep(0.01)
+
+
+def receive(sock):
+    def read(size):
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            assert chunk, "Сервер закрыл соединение"
+            data += chunk
+        return data
+
+    length, = LENGTH.unpack(read(LENGTH.size))
+    return read(length)
+
+
+def test_server_loopback_connect_and_ack():
+    server = SpectatorServer("127.0.0.1", 0, keyframe_interval=60)
+    server.start()
+    try:
+        assert server.port != 0
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5.0) as sock:
+            wait_for(lambda: len(server.spectators) == 1)
+            decoder = SpectatorDecoder()
+
+            # Первый кадр - ключевой; зритель подтверждает его
+            snapshot = make_snapshot(enemies=[entity(1, 100.0, 500.0)])
+            server.publish(snapshot)
+            view, ack = decoder.decode(receive(sock))
+            assert ack == view.frame
+            assert_positions(view, snapshot)
+            sock.sendall(ACK.pack(ack))
+            wait_for(lambda: server.spectators[0].acked == ack)
+
+            # После подтверждения сервер шлет разность с этим кадром
+            moved = make_snapshot(enemies=[entity(1, 104.0, 490.0)])
+            server.publish(moved)
+            view, ack = decoder.decode(receive(sock))
+            assert ack is None
+            assert_positions(view, moved)
+    finally:
+        server.stop()
+
+
+def test_publish_after_stop_is_ignored():
+    server = SpectatorServer("127.0.0.1", 0, keyframe_interval=60)
+    server.start()
+    server.stop()
+
+    # Цикл сервера уже закрыт: публикация не должна бросать исключение
+    server.publish(make_snapshot(enemies=[entity(1, 100.0, 500.0)]))
+    server.stop()